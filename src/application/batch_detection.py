@@ -0,0 +1,178 @@
+import glob
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from src.config import (
+    DETECTION_BATCH_SIZE,
+    DETECTION_DECODE_WORKERS,
+    INFERENCE_CONF,
+    INFERENCE_IMGSZ,
+)
+from src.domain.detection import DetectionRecord
+from src.domain.services.detection_sink import DetectionSink
+from src.domain.services.detector import Detector
+from src.infrastructure.image_converter_impl import (
+    apply_exif_orientation,
+    bounded_map,
+    read_image,
+)
+
+DETECTION_IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".webp", ".bmp"}
+PROGRESS_EVERY = 1000  # Images between progress log lines
+
+ImageJob = Tuple[str, Path]  # (image id, path)
+
+
+@dataclass
+class BatchDetectionReport:
+    processed: int = 0
+    skipped: int = 0  # Already in the output from an earlier run
+    failed: int = 0
+    detections: int = 0
+    elapsed_s: float = 0.0
+
+    @property
+    def images_per_s(self) -> float:
+        return self.processed / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+
+def discover_images(source: str) -> List[ImageJob]:
+    """
+    Resolve a folder (searched recursively) or a glob pattern into image jobs. Ids are the
+    paths relative to the folder (or to the fixed prefix of the glob) so they stay stable
+    when the tree is moved.
+    :param source: Folder or glob pattern
+    :return: Sorted (image id, path) pairs
+    """
+    if glob.has_magic(source):
+        root = Path(source.split("*")[0].split("?")[0].split("[")[0])
+        root = root if root.is_dir() else root.parent
+        paths = (Path(p) for p in glob.iglob(source, recursive=True))
+    else:
+        root = Path(source)
+        if not root.is_dir():
+            raise NotADirectoryError(f"No such folder: {root}")
+        paths = root.rglob("*")
+    images = [
+        p for p in paths if p.suffix.lower() in DETECTION_IMAGE_SUFFIXES and p.is_file()
+    ]
+    return sorted((p.relative_to(root).as_posix(), p) for p in images)
+
+
+def decode_rgb(path: Path) -> Tuple[Optional[np.ndarray], Optional[str]]:
+    try:
+        image = apply_exif_orientation(read_image(path)).convert("RGB")
+        return np.asarray(image), None
+    except Exception as e:
+        return None, str(e)
+
+
+class BatchDetectionService:
+    """
+    Offline detection over large image collections. Images are decoded in a thread pool
+    ahead of the model, run through the detector in fixed-size batches, and every batch
+    is written to the sink before the next one starts, so an interrupted run resumes
+    from the images the sink has not seen yet.
+    """
+
+    def __init__(
+        self,
+        detector: Detector,
+        sink: DetectionSink,
+        batch_size: int = DETECTION_BATCH_SIZE,
+        decode_workers: int = DETECTION_DECODE_WORKERS,
+        conf: float = INFERENCE_CONF,
+        imgsz: int = INFERENCE_IMGSZ,
+    ):
+        """
+        :param detector: The detector the batches are run on.
+        :param sink: Where the records are written and read back from on resume.
+        :param batch_size: Images per predict call.
+        :param decode_workers: Threads decoding images ahead of the model.
+        :param conf: Confidence threshold of the detections.
+        :param imgsz: Inference image size.
+        """
+        self.detector = detector
+        self.sink = sink
+        self.batch_size = batch_size
+        self.decode_workers = decode_workers
+        self.conf = conf
+        self.imgsz = imgsz
+
+    def run(self, jobs: Iterable[ImageJob]) -> BatchDetectionReport:
+        """
+        Detect objects in every image not yet present in the sink.
+        :param jobs: (image id, path) pairs, e.g. from discover_images
+        :return: Counts and throughput of the run
+        """
+        report = BatchDetectionReport()
+        done = self.sink.completed()
+        pending = []
+        for job in jobs:
+            if job[0] in done:
+                report.skipped += 1
+            else:
+                pending.append(job)
+        logger.info(f"{len(pending)} images to process, {report.skipped} already done")
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(self.decode_workers) as pool:
+            # Keep a couple of batches decoded ahead so the model never waits on I/O
+            decoded = bounded_map(
+                pool,
+                decode_rgb,
+                ((path,) for _, path in pending),
+                window=2 * self.batch_size,
+            )
+            next_progress = PROGRESS_EVERY
+            for batch in self._batches(pending, decoded):
+                self._process(batch, report)
+                if report.processed >= next_progress:
+                    next_progress += PROGRESS_EVERY
+                    logger.info(
+                        f"{report.processed}/{len(pending)} images, "
+                        f"{report.processed / (time.perf_counter() - start):.1f} img/s"
+                    )
+        report.elapsed_s = time.perf_counter() - start
+        logger.info(
+            f"Processed {report.processed} images ({report.failed} failed, "
+            f"{report.detections} detections) at {report.images_per_s:.1f} img/s"
+        )
+        return report
+
+    def _batches(self, pending: List[ImageJob], decoded: Iterator) -> Iterator[List]:
+        batch = []
+        for (image_id, _), (_, (image, error)) in zip(pending, decoded):
+            batch.append((image_id, image, error))
+            if len(batch) == self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _process(self, batch: List, report: BatchDetectionReport) -> None:
+        valid = [(image_id, image) for image_id, image, _ in batch if image is not None]
+        detections = iter(
+            self.detector.predict([image for _, image in valid], self.conf, self.imgsz)
+            if valid
+            else []
+        )
+        records = []
+        for image_id, image, error in batch:
+            if image is None:
+                logger.warning(f"Could not decode {image_id}: {error}")
+                records.append(DetectionRecord(image_id, error=error))
+                report.failed += 1
+                continue
+            result = next(detections)
+            height, width = image.shape[:2]
+            records.append(DetectionRecord(image_id, width, height, result))
+            report.detections += len(result)
+        self.sink.write(records)
+        report.processed += len(batch)
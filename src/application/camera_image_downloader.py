@@ -1,22 +1,58 @@
 from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Union
 
 from loguru import logger
 
+from src.domain.capture import ScrapeSummary
+from src.infrastructure.capture_manifest import CaptureManifest
 from src.infrastructure.data_loaders import CameraDataLoader
-from src.infrastructure.image_scraper import ImageScraper
+from src.infrastructure.image_deduplicator import ImageDeduplicator
+
+if TYPE_CHECKING:  # Both import the browser driver
+    from src.infrastructure.concurrent_image_scraper import ConcurrentImageScraper
+    from src.infrastructure.image_scraper import ImageScraper
 
 
 class CameraImageDownloader:
-    def __init__(self, data_loader: CameraDataLoader, image_scraper: ImageScraper):
+    def __init__(
+        self,
+        data_loader: CameraDataLoader,
+        image_scraper: Union["ImageScraper", "ConcurrentImageScraper"],
+        manifest: Optional[CaptureManifest] = None,
+        deduplicator: Optional[ImageDeduplicator] = None,
+    ):
+        """
+        :param data_loader: Loader of the camera registry csv.
+        :param image_scraper: Scraper taking the screenshots.
+        :param manifest: Optional capture manifest; when given only new, stale or failed-and-due cameras are scraped.
+        :param deduplicator: Optional near-duplicate filter run over the screenshots after scraping.
+        """
         self.data_loader = data_loader
         self.image_scraper = image_scraper
+        self.manifest = manifest
+        self.deduplicator = deduplicator
 
-    def download_images(self, csv_path: Path) -> None:
+    def download_images(self, csv_path: Path) -> ScrapeSummary:
         """
         Loads camera data from a csv, visits links, takes screenshots and persists in dedicated folder.
         :param csv_path: The Path object to csv file.
-        :return:
+        :return: Summary of the scraping run.
         """
         cameras = self.data_loader.load_camera_data(csv_path)
         logger.info(f"Urls found: {len(cameras)}")
-        self.image_scraper.scrape_images(cameras)
+        if self.manifest is None:
+            summary = self.image_scraper.scrape_images(cameras)
+        else:
+            cameras = self.manifest.pending(cameras)
+            summary = self.image_scraper.scrape_images(
+                cameras, on_result=self.manifest.record
+            )
+
+        if self.deduplicator is not None:
+            output_dir = self.image_scraper.output_dir
+            self.deduplicator.deduplicate(
+                output_dir,
+                report_path=output_dir.parent / "dedup_report.csv",
+                clean_dir=output_dir.parent / f"{output_dir.name}_dedup",
+            )
+        return summary
@@ -1,17 +1,30 @@
 from pathlib import Path
 
-from src.domain.services.image_converter import ImageConverter
+from src.domain.services.image_converter import ConversionReport, ImageConverter
 
 
 class DatasetPreparation:
     def __init__(self, image_converter: ImageConverter):
         self.image_converter = image_converter
 
-    def prepare_dateset(self, input_folder: Path, output_folder: Path) -> None:
+    def prepare_dateset(
+        self, input_folder: Path, output_folder: Path
+    ) -> ConversionReport:
         """
         Prepare the dataset by converting all HEIC images to JPG format.
         :param input_folder: The Path object representing input folder
         :param output_folder: The Path object representing output folder
-        :return:
+        :return: Report of converted, skipped and failed files
         """
-        self.image_converter.convert_heic_to_jpg(input_folder, output_folder)
+        return self.image_converter.convert_heic_to_jpg(input_folder, output_folder)
+
+    def normalize_dataset(
+        self, input_folder: Path, output_folder: Path
+    ) -> ConversionReport:
+        """
+        Prepare the dataset by normalizing images of any supported format into the training format.
+        :param input_folder: The Path object representing input folder
+        :param output_folder: The Path object representing output folder
+        :return: Report of converted, skipped and failed files with per-stage timings
+        """
+        return self.image_converter.normalize_images(input_folder, output_folder)
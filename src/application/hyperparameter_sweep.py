@@ -0,0 +1,240 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from loguru import logger
+
+from src.application.model_evaluation import evaluate_detector, split_images
+from src.config import (
+    EVAL_CONF,
+    SPLIT_SEED,
+    SWEEP_DEVICE,
+    SWEEP_DIR,
+    SWEEP_ETA,
+    SWEEP_EVAL_IMAGES,
+    SWEEP_MAX_EPOCHS,
+    SWEEP_MIN_EPOCHS,
+    SWEEP_THREADS_PER_TRIAL,
+    SWEEP_TRIALS,
+)
+from src.domain.services.hyperparameter_search import (
+    Dimension,
+    asha_continues,
+    asha_rungs,
+    pareto_front,
+    sample_configuration,
+)
+from src.domain.sweep_trial import TrialResult
+from src.infrastructure.sweep_store import SweepStore
+
+# Val mAP the Ultralytics trainer reports after every epoch
+VAL_MAP_KEY = "metrics/mAP50-95(B)"
+
+
+@dataclass(frozen=True)
+class SweepConfig:
+    trials: int = SWEEP_TRIALS
+    min_epochs: int = SWEEP_MIN_EPOCHS  # Epochs before the first rung
+    max_epochs: int = SWEEP_MAX_EPOCHS  # Epochs of a trial that is never stopped
+    eta: int = SWEEP_ETA  # Only the best 1/eta of the trials at a rung continue
+    threads_per_trial: int = SWEEP_THREADS_PER_TRIAL  # torch threads of a trial
+    workers: Optional[int] = None  # Trials in parallel, None: cores // threads
+    device: str = SWEEP_DEVICE
+    output_dir: Path = SWEEP_DIR  # Ultralytics runs, one folder per trial
+    eval_images: Optional[int] = SWEEP_EVAL_IMAGES  # Val images measured, None = all
+    seed: int = SPLIT_SEED
+
+    @property
+    def num_workers(self) -> int:
+        if self.workers is not None:
+            return self.workers
+        return max(1, (os.cpu_count() or 1) // self.threads_per_trial)
+
+
+def run_trial(
+    trial_id: int,
+    params: Dict[str, object],
+    data_config: Path,
+    db_path: Path,
+    config: SweepConfig,
+) -> str:
+    """
+    Train one configuration in a worker process. After every epoch the val mAP goes to
+    the store, and at a rung the trial stops unless it is among the best 1/eta of all
+    trials that reached that rung. A module-level function, so it pickles into workers.
+    :param trial_id: Id of the trial in the store
+    :param params: Sampled configuration: model, imgsz and Ultralytics hyperparameters
+    :param data_config: data.yaml of the dataset
+    :param db_path: The store, opened again in this process
+    :param config: Sweep settings
+    :return: Final status of the trial
+    """
+    import torch
+
+    from src.infrastructure.trainers import YoloUltralyticsTrainer
+
+    # Each trial gets its share of the cores instead of every trial using all of them
+    torch.set_num_threads(config.threads_per_trial)
+    store = SweepStore(db_path)
+    store.update(trial_id, status="running")
+    rungs = set(asha_rungs(config.min_epochs, config.max_epochs, config.eta))
+    hyperparameters = dict(params)
+    model, imgsz = hyperparameters.pop("model"), hyperparameters.pop("imgsz")
+    pruned = False
+
+    def on_fit_epoch_end(yolo_trainer) -> None:
+        nonlocal pruned
+        epoch = yolo_trainer.epoch + 1
+        score = float(yolo_trainer.metrics.get(VAL_MAP_KEY, 0.0))
+        rung_scores = store.report_epoch(trial_id, epoch, score)
+        if epoch in rungs and not asha_continues(score, rung_scores, config.eta):
+            logger.info(
+                f"Trial {trial_id} stopped at epoch {epoch}: mAP {score:.3f} is not in "
+                f"the top 1/{config.eta} of {len(rung_scores)} trials"
+            )
+            pruned = True
+            yolo_trainer.stop = True  # Ultralytics ends the run after this epoch
+
+    try:
+        trainer = YoloUltralyticsTrainer(
+            model,
+            data_config,
+            config.max_epochs,
+            imgsz,
+            hyperparameters,
+            train_args=dict(
+                project=str(config.output_dir),
+                name=f"trial_{trial_id}",
+                exist_ok=True,
+                device=config.device,
+                workers=min(config.threads_per_trial, 2),
+                plots=False,
+                verbose=False,
+            ),
+        )
+        trainer.add_callback("on_fit_epoch_end", on_fit_epoch_end)
+        trainer.train(None, None, config.device)
+        status = "pruned" if pruned else "completed"
+        store.update(trial_id, status=status, weights=str(trainer.best_weights))
+    except Exception as e:
+        logger.exception(f"Trial {trial_id} failed")
+        status = "failed"
+        store.update(trial_id, status=status, error=str(e))
+    finally:
+        store.close()
+    return status
+
+
+class HyperparameterSweep:
+    """
+    Random search over a YOLO search space with asynchronous successive halving (ASHA):
+    trials train in a process pool, and each trial is stopped at the first rung where
+    it falls out of the best 1/eta, so most of the compute goes to promising
+    configurations. Completed trials are then measured one at a time, for mAP and CPU
+    latency on the val split, and the Pareto front of the two is reported.
+    """
+
+    def __init__(
+        self,
+        store: SweepStore,
+        space: Dict[str, Dimension],
+        data_config: Path,
+        config: Optional[SweepConfig] = None,
+    ):
+        """
+        :param store: Results table of the sweep.
+        :param space: Search space; 'model' and 'imgsz' are required dimensions, the
+        others are passed to the Ultralytics trainer.
+        :param data_config: data.yaml of the dataset.
+        :param config: Sweep settings, defaults from config.py.
+        """
+        self.store = store
+        self.space = space
+        self.data_config = data_config
+        self.config = config or SweepConfig()
+
+    def run(self) -> List[TrialResult]:
+        """
+        Sample and train config.trials new trials.
+        :return: All trials of the store
+        """
+        config = self.config
+        # Trials of earlier sweeps in the same store shift the seed, so a rerun samples
+        # new configurations instead of repeating the old ones
+        rng = np.random.default_rng([config.seed, len(self.store.trials())])
+        trials = {}
+        for _ in range(config.trials):
+            params = sample_configuration(self.space, rng)
+            trials[self.store.add_trial(params)] = params
+
+        rungs = asha_rungs(config.min_epochs, config.max_epochs, config.eta)
+        logger.info(
+            f"Sweeping {len(trials)} trials on {config.num_workers} processes of "
+            f"{config.threads_per_trial} threads, rungs at epochs {rungs}"
+        )
+        # Spawned workers start without the threads and CUDA state of this process
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(config.num_workers, mp_context=context) as pool:
+            futures = {
+                pool.submit(
+                    run_trial,
+                    trial_id,
+                    params,
+                    self.data_config,
+                    self.store.db_path,
+                    config,
+                ): trial_id
+                for trial_id, params in trials.items()
+            }
+            for future in as_completed(futures):
+                logger.info(f"Trial {futures[future]}: {future.result()}")
+        return self.store.trials()
+
+    def measure(self, images_dir: Path, labels_dir: Path) -> None:
+        """
+        mAP and mean CPU latency of the best weights of every completed trial that was
+        not measured yet. Trials are measured one after another, so the latency is not
+        skewed by other trials training at the same time.
+        :param images_dir: Val images
+        :param labels_dir: Val YOLO labels
+        """
+        from src.infrastructure.detectors import UltralyticsDetector
+
+        images = split_images(images_dir, self.config.eval_images)
+        for trial in self.store.trials("completed"):
+            if trial.latency_ms is not None:
+                continue
+            detector = UltralyticsDetector(trial.weights, device="cpu")
+            imgsz = trial.params["imgsz"]
+            # The first call fuses the model and allocates buffers, keep it out of the mean
+            detector.predict(
+                [np.zeros((imgsz, imgsz, 3), dtype=np.uint8)], EVAL_CONF, imgsz
+            )
+            result = evaluate_detector(detector, images, labels_dir, imgsz)
+            self.store.update(
+                trial.trial_id,
+                map50=result.metrics.map50,
+                map50_95=result.metrics.map50_95,
+                latency_ms=result.latency_mean_ms,
+            )
+            logger.info(
+                f"Trial {trial.trial_id}: mAP@0.5:0.95 {result.metrics.map50_95:.3f}, "
+                f"{result.latency_mean_ms:.1f} ms per image"
+            )
+
+    def pareto_front(self) -> List[TrialResult]:
+        """
+        :return: Measured trials no other trial beats on both mAP@0.5:0.95 and latency,
+        from fastest to most accurate
+        """
+        measured = [
+            trial
+            for trial in self.store.trials("completed")
+            if trial.latency_ms is not None
+        ]
+        front = pareto_front([(t.map50_95, t.latency_ms) for t in measured])
+        return [measured[i] for i in front]
@@ -0,0 +1,165 @@
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Deque, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from src.config import (
+    INFERENCE_CONF,
+    INFERENCE_IMGSZ,
+    INFERENCE_MAX_BATCH,
+    INFERENCE_MAX_WAIT_MS,
+)
+from src.domain.detection import Detections
+from src.domain.services.detector import Detector
+
+LATENCY_WINDOW = 1000  # Latest requests the percentiles are computed over
+
+
+@dataclass(frozen=True)
+class InferenceStats:
+    requests: int
+    batches: int
+    mean_batch_size: float
+    p50_latency_ms: float
+    p95_latency_ms: float
+    throughput_per_s: float
+
+
+class BatchingInferenceService:
+    """
+    Dynamic micro-batching in front of a Detector. Requests from concurrent callers are
+    queued; a single worker thread collects them until max_batch_size is reached or
+    max_wait_ms has passed since the first one arrived, then runs one batched predict.
+    """
+
+    def __init__(
+        self,
+        detector: Detector,
+        max_batch_size: int = INFERENCE_MAX_BATCH,
+        max_wait_ms: float = INFERENCE_MAX_WAIT_MS,
+        conf: float = INFERENCE_CONF,
+        imgsz: int = INFERENCE_IMGSZ,
+    ):
+        """
+        :param detector: The detector the batches are run on.
+        :param max_batch_size: Max number of images per predict call.
+        :param max_wait_ms: Max time the first request of a batch waits for company.
+        :param conf: Confidence threshold of the detections.
+        :param imgsz: Inference image size.
+        """
+        self.detector = detector
+        self.max_batch_size = max_batch_size
+        self.max_wait_s = max_wait_ms / 1000
+        self.conf = conf
+        self.imgsz = imgsz
+
+        self._queue: "queue.Queue[Optional[Tuple[np.ndarray, Future, float]]]" = (
+            queue.Queue()
+        )
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._requests = 0
+        self._batches = 0
+        self._started_at = 0.0
+
+    def start(self) -> "BatchingInferenceService":
+        if self._worker is None:
+            self._started_at = time.perf_counter()
+            self._worker = threading.Thread(
+                target=self._run, name="inference-batcher", daemon=True
+            )
+            self._worker.start()
+        return self
+
+    def stop(self) -> None:
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join()
+            self._worker = None
+
+    def __enter__(self) -> "BatchingInferenceService":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def submit(self, image: np.ndarray) -> "Future[Detections]":
+        """
+        Queue an image for detection.
+        :param image: RGB image as HxWx3 uint8 array
+        :return: Future resolving to the detections of the image
+        """
+        future: "Future[Detections]" = Future()
+        self._queue.put((image, future, time.perf_counter()))
+        return future
+
+    def detect(self, image: np.ndarray, timeout: Optional[float] = None) -> Detections:
+        """
+        Blocking convenience wrapper around submit.
+        :param image: RGB image as HxWx3 uint8 array
+        :param timeout: Optional max seconds to wait for the result
+        :return: The detections of the image
+        """
+        return self.submit(image).result(timeout)
+
+    def stats(self) -> InferenceStats:
+        with self._lock:
+            latencies = np.array(self._latencies, dtype=np.float64) * 1000
+            requests, batches = self._requests, self._batches
+        elapsed = time.perf_counter() - self._started_at if self._started_at else 0.0
+        has_latencies = latencies.size > 0
+        return InferenceStats(
+            requests=requests,
+            batches=batches,
+            mean_batch_size=requests / batches if batches else 0.0,
+            p50_latency_ms=float(np.percentile(latencies, 50)) if has_latencies else 0,
+            p95_latency_ms=float(np.percentile(latencies, 95)) if has_latencies else 0,
+            throughput_per_s=requests / elapsed if elapsed > 0 else 0.0,
+        )
+
+    def _collect_batch(self, first) -> Tuple[List, bool]:
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait_s
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch, stopping = self._collect_batch(first)
+            images = [image for image, _, _ in batch]
+            try:
+                detections = self.detector.predict(images, self.conf, self.imgsz)
+            except Exception as e:
+                logger.error(f"Batch of {len(batch)} failed: {e}")
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            done = time.perf_counter()
+            for (_, future, submitted), result in zip(batch, detections):
+                future.set_result(result)
+            with self._lock:
+                self._latencies.extend(done - submitted for _, _, submitted in batch)
+                self._requests += len(batch)
+                self._batches += 1
@@ -0,0 +1,66 @@
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+from PIL import Image
+
+from src.config import EVAL_CONF, INFERENCE_IMGSZ
+from src.domain.services.detection_metrics import (
+    DetectionEvaluator,
+    MeanAveragePrecision,
+)
+from src.domain.services.detector import Detector
+from src.infrastructure.yolo_labels import read_yolo_labels, yolo_to_xyxy
+
+EVAL_IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png"}
+
+
+@dataclass(frozen=True)
+class EvaluationResult:
+    metrics: MeanAveragePrecision
+    latency_mean_ms: float  # Per image
+    latency_p95_ms: float
+
+
+def split_images(images_dir: Path, limit: Optional[int] = None) -> List[Path]:
+    images = sorted(
+        p for p in images_dir.iterdir() if p.suffix.lower() in EVAL_IMAGE_SUFFIXES
+    )
+    return images[:limit]
+
+
+def evaluate_detector(
+    detector: Detector,
+    images: List[Path],
+    labels_dir: Path,
+    imgsz: int = INFERENCE_IMGSZ,
+    conf: float = EVAL_CONF,
+) -> EvaluationResult:
+    """
+    mAP of a detector against YOLO label files, with per-image latency. Images are run
+    one at a time so the latency is that of a single request.
+    :param detector: The detector to evaluate
+    :param images: Image files, labels are looked up by stem in labels_dir
+    :param labels_dir: Folder of YOLO label files
+    :param imgsz: Inference image size
+    :param conf: Confidence threshold, kept low so the whole precision-recall curve counts
+    :return: mAP and latency
+    """
+    evaluator = DetectionEvaluator()
+    latencies = []
+    for image_path in images:
+        image = np.array(Image.open(image_path).convert("RGB"))
+        labels = read_yolo_labels(labels_dir / f"{image_path.stem}.txt")
+        start = time.perf_counter()
+        detections = detector.predict([image], conf, imgsz)[0]
+        latencies.append(time.perf_counter() - start)
+        height, width = image.shape[:2]
+        evaluator.add(yolo_to_xyxy(labels, width, height), labels[:, 0], detections)
+    latencies = np.array(latencies) * 1000
+    return EvaluationResult(
+        metrics=evaluator.compute(),
+        latency_mean_ms=float(latencies.mean()) if latencies.size else 0.0,
+        latency_p95_ms=float(np.percentile(latencies, 95)) if latencies.size else 0.0,
+    )
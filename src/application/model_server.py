@@ -0,0 +1,165 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from src.config import INFERENCE_CONF, INFERENCE_IMGSZ, MODEL_WATCH_INTERVAL_S
+from src.domain.detection import Detections
+from src.domain.model_version import ModelVersion
+from src.domain.services.detector import Detector
+from src.infrastructure.detection_cache import CachedDetector, DetectionCache
+from src.infrastructure.detector_factory import build_detector
+from src.infrastructure.model_registry import ModelRegistry
+
+
+@dataclass(frozen=True)
+class ModelStatus:
+    name: str
+    version: Optional[int]
+    backend: Optional[str]
+    weights: Optional[str]
+    ready: bool
+    load_s: float
+    warmup_s: float
+
+
+class ModelServer(Detector):
+    """
+    Serves the active registry version of a model behind the Detector interface. The
+    model is loaded on first use, or ahead of it by a background warm-up. A swap loads
+    and warms the new version next to the old one and then replaces the reference in
+    one assignment, so requests keep being served during the load and calls already
+    running finish on the model they started with.
+    """
+
+    def __init__(
+        self,
+        registry: ModelRegistry,
+        name: str,
+        cache: Optional[DetectionCache] = None,
+        loader: Optional[Callable[[ModelVersion], Detector]] = None,
+        warmup_imgsz: int = INFERENCE_IMGSZ,
+    ):
+        """
+        :param registry: Registry the versions are resolved in.
+        :param name: Name of the served model.
+        :param cache: Optional detection cache used by the loaded detectors.
+        :param loader: Builds a detector for a version, defaults to build_detector.
+        :param warmup_imgsz: Image size of the warm-up inference.
+        """
+        self.registry = registry
+        self.name = name
+        self.loader = loader or (
+            lambda version: build_detector(
+                version.backend, version.weights, cache=cache
+            )
+        )
+        self.warmup_imgsz = warmup_imgsz
+        self._current: Optional[Tuple[ModelVersion, Detector]] = None
+        self._load_lock = threading.Lock()  # One load at a time
+        self._stop = threading.Event()
+        self._load_s = self._warmup_s = 0.0
+
+    def _load(self, version: ModelVersion) -> Detector:
+        start = time.perf_counter()
+        detector = self.loader(version)
+        loaded = time.perf_counter()
+        # The first inference pays lazy initialisation (graph optimisation, allocations).
+        # It goes past the cache, where a hit from an earlier start would skip it.
+        backend = (
+            detector.detector if isinstance(detector, CachedDetector) else detector
+        )
+        dummy = np.zeros((self.warmup_imgsz, self.warmup_imgsz, 3), dtype=np.uint8)
+        backend.predict([dummy], INFERENCE_CONF, self.warmup_imgsz)
+        self._load_s = loaded - start
+        self._warmup_s = time.perf_counter() - loaded
+        logger.info(
+            f"Loaded {version.name} v{version.version} in {self._load_s:.2f}s, "
+            f"warm-up {self._warmup_s:.2f}s"
+        )
+        return detector
+
+    def _detector(self) -> Detector:
+        current = self._current
+        if current is None:
+            with self._load_lock:
+                if self._current is None:
+                    version = self.registry.resolve(self.name)
+                    self._current = (version, self._load(version))
+            current = self._current
+        return current[1]
+
+    def predict(
+        self, images: List[np.ndarray], conf: float, imgsz: int
+    ) -> List[Detections]:
+        return self._detector().predict(images, conf, imgsz)
+
+    def warm_up_async(self) -> threading.Thread:
+        """
+        Load and warm up the active version in the background; requests arriving before
+        it finishes wait for it instead of loading a second copy.
+        :return: The loading thread
+        """
+        thread = threading.Thread(
+            target=self._detector, name="model-warmup", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def swap(self, version: Optional[int] = None) -> ModelVersion:
+        """
+        Switch to another version without interrupting requests.
+        :param version: Version to serve, defaults to the active one of the registry
+        :return: The version now served
+        """
+        with self._load_lock:
+            target = self.registry.resolve(self.name, version)
+            if self._current is not None and self._current[0] == target:
+                return target
+            self._current = (target, self._load(target))
+        logger.info(f"Now serving {target.name} v{target.version}")
+        return target
+
+    def watch(self, interval_s: float = MODEL_WATCH_INTERVAL_S) -> threading.Thread:
+        """
+        Poll the registry and swap whenever another version becomes active, e.g. after
+        the training pipeline registered a new best.pt.
+        :param interval_s: Seconds between checks
+        :return: The watcher thread, stopped by stop()
+        """
+        seen = self.registry.modified_at
+
+        def run():
+            nonlocal seen
+            while not self._stop.wait(interval_s):
+                modified = self.registry.modified_at
+                if modified == seen:
+                    continue
+                seen = modified
+                try:
+                    self.swap()
+                except Exception as e:
+                    logger.error(f"Keeping the current model, swap failed: {e}")
+
+        thread = threading.Thread(target=run, name="model-watch", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def status(self) -> ModelStatus:
+        current = self._current
+        version = current[0] if current else None
+        return ModelStatus(
+            name=self.name,
+            version=version.version if version else None,
+            backend=version.backend if version else None,
+            weights=version.weights if version else None,
+            ready=current is not None,
+            load_s=self._load_s,
+            warmup_s=self._warmup_s,
+        )
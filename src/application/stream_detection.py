@@ -0,0 +1,157 @@
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional
+
+from loguru import logger
+
+from src.config import INFERENCE_IMGSZ, STREAM_LOW_CONF, STREAM_MAX_STRIDE
+from src.domain.services.detector import Detector
+from src.domain.services.iou_tracker import IouTracker, Track
+from src.domain.video import VideoFrame
+
+FPS_LOG_INTERVAL_S = 5.0
+LATENCY_SMOOTHING = 0.2  # Weight of the newest measurement in the latency average
+
+
+class AdaptiveFrameSkipper:
+    """
+    Chooses how many source frames to advance between detections. The stride follows a
+    moving average of the detector latency so that detection keeps pace with the source
+    frame rate, and never falls below what an optional target rate asks for.
+    """
+
+    def __init__(
+        self,
+        source_fps: float,
+        target_fps: Optional[float] = None,
+        max_stride: int = STREAM_MAX_STRIDE,
+    ):
+        """
+        :param source_fps: Frame rate of the video source.
+        :param target_fps: Optional cap on the detections per second of source time.
+        :param max_stride: Upper bound of the stride.
+        """
+        self.source_fps = source_fps
+        self.min_stride = (
+            max(1, math.ceil(source_fps / target_fps)) if target_fps else 1
+        )
+        self.max_stride = max(max_stride, self.min_stride)
+        self.stride = self.min_stride
+        self._latency_s: Optional[float] = None
+        self._next_index = 0
+
+    def should_process(self, frame_index: int) -> bool:
+        return frame_index >= self._next_index
+
+    def record(self, frame_index: int, latency_s: float) -> None:
+        """
+        Feed back the latency of a processed frame and schedule the next one.
+        :param frame_index: Index of the processed frame
+        :param latency_s: Seconds the detection of the frame took
+        """
+        if self._latency_s is None:
+            self._latency_s = latency_s
+        else:
+            self._latency_s += LATENCY_SMOOTHING * (latency_s - self._latency_s)
+        needed = math.ceil(self._latency_s * self.source_fps)
+        self.stride = min(self.max_stride, max(self.min_stride, needed))
+        self._next_index = frame_index + self.stride
+
+
+@dataclass
+class StreamReport:
+    frames_seen: int = 0  # Delivered by the reader
+    frames_processed: int = 0
+    elapsed_s: float = 0.0
+    objects: List[Track] = field(default_factory=list)  # Confirmed tracks
+
+    @property
+    def processed_fps(self) -> float:
+        return self.frames_processed / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    @property
+    def input_fps(self) -> float:
+        return self.frames_seen / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    def objects_per_class(self) -> Dict[int, int]:
+        counts: Dict[int, int] = {}
+        for track in self.objects:
+            counts[track.cls] = counts.get(track.cls, 0) + 1
+        return counts
+
+
+class StreamDetectionService:
+    """
+    Runs a detector over a stream of frames, skipping frames adaptively, and feeds the
+    detections to a tracker so each physical object is reported once, when its track is
+    confirmed, instead of once per frame.
+    """
+
+    def __init__(
+        self,
+        detector: Detector,
+        tracker: IouTracker,
+        conf: float = STREAM_LOW_CONF,
+        imgsz: int = INFERENCE_IMGSZ,
+    ):
+        """
+        :param detector: The detector run on the sampled frames.
+        :param tracker: Tracker associating detections across frames.
+        :param conf: Detector threshold; keep it below the tracker's high score so weak
+            detections can still extend tracks.
+        :param imgsz: Inference image size.
+        """
+        self.detector = detector
+        self.tracker = tracker
+        self.conf = conf
+        self.imgsz = imgsz
+
+    def run(
+        self,
+        frames: Iterable[VideoFrame],
+        skipper: AdaptiveFrameSkipper,
+        on_object: Optional[Callable[[Track, VideoFrame], None]] = None,
+        max_frames: Optional[int] = None,
+    ) -> StreamReport:
+        """
+        Process frames until the source ends or max_frames have been seen.
+        :param frames: Frames, e.g. from a ThreadedVideoReader
+        :param skipper: Decides which frames are run through the detector
+        :param on_object: Called with every newly confirmed track and the frame confirming it
+        :param max_frames: Optional number of delivered frames after which to stop
+        :return: Frame counts, sustained FPS and the confirmed objects
+        """
+        report = StreamReport()
+        start = last_log = time.perf_counter()
+        for frame in frames:
+            report.frames_seen += 1
+            if skipper.should_process(frame.index):
+                began = time.perf_counter()
+                detections = self.detector.predict(
+                    [frame.image], self.conf, self.imgsz
+                )[0]
+                for track in self.tracker.update(detections, frame.index):
+                    report.objects.append(track)
+                    if on_object is not None:
+                        on_object(track, frame)
+                skipper.record(frame.index, time.perf_counter() - began)
+                report.frames_processed += 1
+
+            now = time.perf_counter()
+            if now - last_log >= FPS_LOG_INTERVAL_S:
+                report.elapsed_s = now - start
+                logger.info(
+                    f"{report.processed_fps:.1f} detections/s over "
+                    f"{report.input_fps:.1f} frames/s, stride {skipper.stride}, "
+                    f"{len(report.objects)} objects"
+                )
+                last_log = now
+            if max_frames is not None and report.frames_seen >= max_frames:
+                break
+        report.elapsed_s = time.perf_counter() - start
+        logger.info(
+            f"Processed {report.frames_processed}/{report.frames_seen} frames at "
+            f"{report.processed_fps:.1f} FPS, {len(report.objects)} objects found"
+        )
+        return report
@@ -1,36 +1,66 @@
-import torch.backends.mps
-from torch.utils.data import DataLoader
+import time
+from typing import TYPE_CHECKING, Optional
 
 from src.config import TRAIN_RATIO, VAL_RATIO, BATCH_SIZE
 from src.domain.services.data_splitter import DatasetSplitter
 from src.domain.services.model_trainer import ModelTrainer
 
+if TYPE_CHECKING:
+    from src.domain.services.detection_metrics import MeanAveragePrecision
+    from src.infrastructure.training_loaders import LoaderConfig
+    from src.infrastructure.training_telemetry import TrainingTelemetry
+
 
 class TrainingService:
     def __init__(
-        self, dataset, model_trainer: ModelTrainer, dataset_splitter: DatasetSplitter
+        self,
+        dataset,
+        model_trainer: ModelTrainer,
+        dataset_splitter: DatasetSplitter,
+        telemetry: Optional["TrainingTelemetry"] = None,
     ):
+        """
+        :param dataset: Detection dataset with a `samples` list
+        :param model_trainer: Trains and evaluates the model
+        :param dataset_splitter: Splits the samples into train, val and test
+        :param telemetry: Receives the test evaluation, defaults to the trainer's
+        """
         self.dataset = dataset
         self.model_trainer = model_trainer
         self.dataset_splitter = dataset_splitter
+        self.telemetry = telemetry or getattr(model_trainer, "telemetry", None)
 
     def run_training(
         self,
         train_ratio: float = TRAIN_RATIO,
         val_ratio: float = VAL_RATIO,
         batch_size: int = BATCH_SIZE,
-    ):
-        train_data, val_data, test_data = self.dataset_splitter.split(
-            self.dataset, train_ratio, val_ratio
-        )
-        train_loader = DataLoader(
-            train_data, batch_size, shuffle=True, collate_fn=lambda x: tuple(zip(*x))
-        )
-        val_loader = DataLoader(
-            val_data, batch_size, shuffle=True, collate_fn=lambda x: tuple(zip(*x))
+        loader_config: Optional["LoaderConfig"] = None,
+    ) -> Optional["MeanAveragePrecision"]:
+        """
+        :param train_ratio: The ratio of the training dataset
+        :param val_ratio: The ratio of the validation dataset
+        :param batch_size: Images per batch, unless loader_config is given
+        :param loader_config: Workers, prefetching and batching of the data loaders
+        :return: mAP on the test split, None if the trainer does not evaluate loaders
+        """
+        import torch
+        from torch.utils.data import Subset
+
+        from src.infrastructure.training_loaders import (
+            LoaderConfig,
+            build_detection_loader,
         )
 
-        # TODO: Use test data for evaluation
+        # Split the (image, label) pairs instead of the dataset, which would decode
+        # every image, and select the samples of each split by position
+        positions = {sample: i for i, sample in enumerate(self.dataset.samples)}
+        train_data, val_data, test_data = (
+            Subset(self.dataset, [positions[sample] for sample in split])
+            for split in self.dataset_splitter.split(
+                self.dataset.samples, train_ratio, val_ratio
+            )
+        )
 
         if torch.backends.mps.is_available():
             device = torch.device("mps")
@@ -39,4 +69,29 @@ class TrainingService:
         else:
             device = torch.device("cpu")
 
+        loader_config = loader_config or LoaderConfig(batch_size=batch_size)
+        train_loader = build_detection_loader(
+            train_data, loader_config, shuffle=True, device=device
+        )
+        val_loader = build_detection_loader(
+            val_data, loader_config, shuffle=False, device=device
+        )
         self.model_trainer.train(train_loader, val_loader, device)
+        if len(test_data) == 0:
+            return None
+
+        # Held out until now, the test split gives the unbiased final numbers
+        test_loader = build_detection_loader(
+            test_data, loader_config, shuffle=False, device=device
+        )
+        start = time.perf_counter()
+        metrics = self.model_trainer.evaluate(test_loader, device, split="test")
+        if self.telemetry:
+            self.telemetry.evaluated(
+                "test",
+                getattr(self.model_trainer, "epochs", 0),
+                len(test_data),
+                time.perf_counter() - start,
+                metrics,
+            )
+        return metrics
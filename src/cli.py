@@ -0,0 +1,63 @@
+import argparse
+import importlib
+import sys
+from typing import Dict, List, NamedTuple, Optional
+
+
+class Command(NamedTuple):
+    module: str  # Imported only when the command runs, must define main(argv)
+    help: str
+
+
+COMMANDS: Dict[str, Command] = {
+    "prepare": Command(
+        "src.presentation.prepare_dataset",
+        "Split the labelled dataset into train/val/test for Ultralytics",
+    ),
+    "split": Command(
+        "src.split_data", "Split the labelled images into train/val and write data.yaml"
+    ),
+    "scrape": Command(
+        "src.presentation.scrape_cameras", "Take screenshots of registry cameras"
+    ),
+    "convert": Command(
+        "src.presentation.convert_images", "Convert raw photos into training JPGs"
+    ),
+    "train": Command(
+        "src.presentation.trainers_orchestration",
+        "Train, export and register a YOLO model",
+    ),
+    "sweep": Command(
+        "src.presentation.sweep_yolo",
+        "Search YOLO hyperparameters, report the mAP/latency Pareto front",
+    ),
+    "detect": Command(
+        "src.presentation.batch_detect", "Detect CCTV in a folder or glob of images"
+    ),
+    "serve": Command("src.presentation.main_ui", "Serve the detector web UI"),
+}
+
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Entry point of `python -m src <command>`. Each command lives in its own module that
+    is imported only when the command runs, so e.g. splitting the dataset never pays
+    for importing torch or gradio.
+    :param argv: Command line arguments, defaults to sys.argv[1:]
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m src",
+        description="CCTV detection tools.",
+        epilog="Run 'python -m src <command> --help' for the options of a command.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    subparsers = parser.add_subparsers(dest="command", metavar="command", required=True)
+    for name, command in COMMANDS.items():
+        # Options are parsed by the command itself, after its module is imported
+        subparsers.add_parser(name, help=command.help, add_help=False)
+    args, rest = parser.parse_known_args(argv)
+
+    module = importlib.import_module(COMMANDS[args.command].module)
+    # Usage messages of the command read their program name from argv[0]
+    sys.argv[0] = f"{parser.prog} {args.command}"
+    module.main(rest)
@@ -1,18 +1,130 @@
 from pathlib import Path
+from typing import Dict, List, Optional, Union
 
 # ------------------- Training config -------------------#
 PROJECT_ROOT: Path = Path(__file__).resolve().parent
 DATASETS: Path = PROJECT_ROOT / "datasets"
 IMAGES_DIR: Path = DATASETS / "images"
 LABELS_DIR: Path = DATASETS / "labels"
+DATASET_INDEX: Path = DATASETS / "dataset_index.npz"
+DATASET_CACHE_DIR: Path = DATASETS / "cache"  # Decoded image shards for Faster R-CNN
 TRAIN_RATIO: float = 0.7
 VAL_RATIO: float = 0.3
 BATCH_SIZE: int = 4
+LOADER_WORKERS: Optional[int] = None  # DataLoader processes, None = cores - 1, max 8
+LOADER_PREFETCH_FACTOR: int = 2  # Batches each loader worker prepares ahead
+LOADER_PIN_MEMORY: bool = True  # Page-locked batches for async copies to CUDA
+ASPECT_RATIO_GROUP_FACTOR: int = 3  # Aspect ratio bins per side of square, 0 = off
+TRAIN_AMP: bool = True  # Mixed precision: float16 on CUDA, bfloat16 on CPU
+TRAIN_ACCUMULATE_STEPS: int = (
+    1  # Batches per optimizer step, raises the effective batch
+)
+CHECKPOINT_DIR: Path = PROJECT_ROOT / "checkpoints" / "faster_rcnn"
+CHECKPOINT_EVERY: int = 1  # Epochs between checkpoints of Faster R-CNN training
+TELEMETRY_DIR: Path = PROJECT_ROOT / "telemetry"
+# Per-epoch training telemetry, the sink follows the suffix: .jsonl, .csv or .prom
+TELEMETRY_OUTPUTS: List[Path] = [TELEMETRY_DIR / "training.jsonl"]
+TELEMETRY_DATA_BOUND_FRACTION: float = 0.2  # Data wait share of an input bound run
+PROFILE_DIR: Path = TELEMETRY_DIR / "profiles"  # torch.profiler traces
+CLASS_NAMES: List[str] = ["CCTV", "CCTV-SIGNS"]
+NUM_CLASSES: int = len(CLASS_NAMES)
+SPLIT_SEED: int = 42
+TRAINING_MAX_SIDE: int = 1280  # Longest image side worth keeping for training
+JPEG_QUALITY: int = 90
+CONVERT_WORKERS: Optional[int] = None  # Image conversion processes, None = all cores
+
+# ------------------- Sweep config -------------------#
+# YOLO search space: a list is a set of choices, (low, high) is sampled uniformly and
+# (low, high, "log") log-uniformly
+SWEEP_SPACE: Dict[str, Union[list, tuple]] = {
+    "model": ["yolov8n.pt", "yolov8s.pt"],
+    "imgsz": [480, 640],
+    "lr0": (1e-4, 1e-2, "log"),
+    "weight_decay": (1e-4, 1e-2, "log"),
+    "mosaic": (0.5, 1.0),
+    "mixup": (0.0, 0.2),
+    "freeze": [0, 4, 10],  # Number of leading layers kept frozen
+}
+SWEEP_DIR: Path = PROJECT_ROOT / "sweeps"
+SWEEP_DB: Path = SWEEP_DIR / "yolo_sweep.sqlite"  # Results table of all trials
+SWEEP_TRIALS: int = 16
+SWEEP_MIN_EPOCHS: int = 2  # Epochs every trial trains before its first comparison
+SWEEP_MAX_EPOCHS: int = 20
+SWEEP_ETA: int = 3  # Successive halving keeps the best 1/eta of each rung
+SWEEP_THREADS_PER_TRIAL: int = 4  # Trials in parallel = cores // this
+SWEEP_DEVICE: str = "cpu"
+SWEEP_EVAL_IMAGES: Optional[int] = None  # Val images for mAP and latency, None = all
+
+# ------------------- Inference config -------------------#
+MODEL_WEIGHTS: Path = PROJECT_ROOT.parent / "samples" / "best.pt"
+MODEL_REGISTRY: Path = MODEL_WEIGHTS.parent / "registry.json"
+MODEL_NAME: str = "cctv"  # Registry entry served by the UI
+MODEL_WATCH_INTERVAL_S: float = 30.0  # How often the UI checks for a new active model
+ONNX_WEIGHTS: Path = MODEL_WEIGHTS.with_suffix(".onnx")
+ONNX_INT8_WEIGHTS: Path = MODEL_WEIGHTS.parent / f"{MODEL_WEIGHTS.stem}_int8.onnx"
+OPENVINO_WEIGHTS: Path = MODEL_WEIGHTS.parent / f"{MODEL_WEIGHTS.stem}_openvino_model"
+EXPORT_FORMATS: List[str] = ["onnx"]  # Exported after training: onnx, openvino
+INFERENCE_BACKEND: str = "ultralytics"  # ultralytics, onnx or openvino
+INFERENCE_THREADS: Optional[int] = None  # CPU threads of onnx/openvino, None = all
+INFERENCE_DEVICE: str = "cpu"
+INFERENCE_CONF: float = 0.25
+INFERENCE_IMGSZ: int = 640
+INFERENCE_MAX_BATCH: int = 8  # Max images per batched predict call
+INFERENCE_MAX_WAIT_MS: float = 10.0  # Max time a request waits for a batch to fill
+NMS_IOU: float = 0.5  # IoU above which detections are considered the same object
+DETECTOR_NMS_IOU: float = 0.7  # NMS inside the detector, the Ultralytics default
+MAX_DETECTIONS: int = 300  # Per image, the Ultralytics default
+DETECTION_CACHE_ENABLED: bool = True  # Serve repeated images from the cache
+DETECTION_CACHE_PATH: Path = PROJECT_ROOT / "cache" / "detections.sqlite"
+DETECTION_CACHE_MEMORY_ITEMS: int = 1024  # Entries of the in-memory LRU
+DETECTION_CACHE_MAX_MB: float = 512.0  # Size bound of the on-disk store
+EVAL_CONF: float = 0.001  # Low threshold for mAP, the Ultralytics validation default
+CALIBRATION_IMAGES: int = 200  # Val images used to calibrate INT8 quantization
+QUANT_MAX_MAP50_DROP: float = 0.01  # Max mAP@0.5 an INT8 model may lose vs FP32
+TILE_SIZE: int = 640  # Side of a tile in sliced inference
+TILE_OVERLAP: float = 0.2  # Fraction of a tile shared with its neighbour
+DETECTION_BATCH_SIZE: int = 16  # Images per predict call in bulk detection
+DETECTION_DECODE_WORKERS: int = 4  # Threads decoding images ahead of the model
+STREAM_QUEUE_SIZE: int = 8  # Decoded frames buffered between reader and detector
+STREAM_MAX_STRIDE: int = 30  # Upper bound of adaptive frame skipping
+STREAM_LOW_CONF: float = 0.1  # Low-score detections still used to extend tracks
+TRACK_IOU: float = 0.3  # Min IoU between a track and a detection of the next frame
+TRACK_MAX_MISSED: int = 10  # Processed frames a track survives without a match
+TRACK_MIN_HITS: int = 3  # Matches before a track is reported as an object
 
 # ------------------- Scraper config -------------------#
 CSV_FILE: Path = Path("../../datasets/cctv-aware-jyvaskyla.csv")
 OUTPUT_DIR: Path = Path(
     "../../datasets/screenshots"
 )  # Folder to save screenshots of images
+CSV_CHUNKSIZE: int = 100_000  # Rows read per chunk from camera registries
 REJECT_ALL: str = "Reject all"
 REJECT_ALL_GR: str = "Απόρριψη όλων"
+SCRAPER_NAVIGATION_TIMEOUT_MS: int = 20000
+SCRAPER_CONCURRENCY: int = 4  # Pages capturing in parallel in concurrent mode
+SCRAPER_PER_HOST_LIMIT: int = 2  # Max simultaneous navigations to the same host
+SCRAPER_PER_HOST_DELAY_MS: int = 500  # Min spacing between navigations to a host
+SCRAPER_READY_TIMEOUT_MS: int = 5000  # Upper bound of the wait before each screenshot
+CAPTURE_MANIFEST: Path = OUTPUT_DIR.parent / "capture_manifest.sqlite"
+CAPTURE_MAX_AGE_H: float = 24.0  # Captures younger than this are not refreshed
+CAPTURE_RETRY_BASE_S: float = 300.0  # First retry backoff, doubled on each failure
+CAPTURE_RETRY_MAX_S: float = 86400.0
+CAPTURE_MAX_ATTEMPTS: int = 5
+DEDUP_HASH: str = (
+    "phash"  # Perceptual hash used to find near-duplicates: phash or dhash
+)
+DEDUP_MAX_DISTANCE: int = 6  # Max Hamming distance between near-duplicate hashes
+
+# ------------------- Startup config -------------------#
+# Import time budget per CLI command, checked by benchmark_startup
+STARTUP_BUDGETS_MS: Dict[str, float] = {
+    "cli": 50.0,
+    "prepare": 2500.0,  # sklearn (with scipy) dominates the dataset commands
+    "split": 2500.0,
+    "scrape": 1000.0,
+    "convert": 500.0,
+    "train": 3000.0,  # torch and ultralytics load when training starts, not here
+    "detect": 600.0,  # The detector backend loads when the model is built
+    "serve": 6000.0,  # gradio
+    "sweep": 1000.0,
+}
@@ -0,0 +1,55 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+from src.domain.camera import CameraDataFromCsv
+
+
+@dataclass(frozen=True)
+class CaptureResult:
+    camera: CameraDataFromCsv
+    path: Optional[Path]
+    error: Optional[str] = None
+    time_to_ready_s: Optional[float] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class ScrapeSummary:
+    results: List[CaptureResult] = field(default_factory=list)
+    elapsed_s: float = 0.0
+
+    @property
+    def succeeded(self) -> List[CaptureResult]:
+        return [r for r in self.results if r.ok]
+
+    @property
+    def failed(self) -> List[CaptureResult]:
+        return [r for r in self.results if not r.ok]
+
+    @property
+    def screenshots_per_min(self) -> float:
+        """
+        Throughput of successful captures over the wall-clock duration of the run.
+        :return: Screenshots per minute, 0 if nothing was timed.
+        """
+        if self.elapsed_s <= 0:
+            return 0.0
+        return len(self.succeeded) * 60.0 / self.elapsed_s
+
+    def time_to_ready_percentile(self, q: float) -> float:
+        """
+        Percentile of the per-camera time-to-ready, used to tune readiness timeouts.
+        :param q: Percentile in [0, 100]
+        :return: Seconds, 0 if no camera reported a time-to-ready.
+        """
+        times = sorted(
+            r.time_to_ready_s for r in self.results if r.time_to_ready_s is not None
+        )
+        if not times:
+            return 0.0
+        index = min(len(times) - 1, int(round(q / 100 * (len(times) - 1))))
+        return times[index]
@@ -0,0 +1,31 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+
+
+def _empty_boxes() -> np.ndarray:
+    return np.zeros((0, 4), dtype=np.float32)
+
+
+@dataclass
+class Detections:
+    """Detections of one image: xyxy pixel boxes with their scores and class ids."""
+
+    boxes: np.ndarray = field(default_factory=_empty_boxes)  # (n, 4) float32
+    scores: np.ndarray = field(default_factory=lambda: np.zeros(0, np.float32))
+    classes: np.ndarray = field(default_factory=lambda: np.zeros(0, np.int64))
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+
+@dataclass
+class DetectionRecord:
+    """Detections of one image of a bulk run, keyed by a stable image id."""
+
+    image_id: str
+    width: int = 0
+    height: int = 0
+    detections: Detections = field(default_factory=Detections)
+    error: Optional[str] = None  # Set when the image could not be decoded
@@ -0,0 +1,10 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ModelVersion:
+    name: str
+    version: int
+    weights: str  # Model file or folder
+    backend: str  # ultralytics, onnx or openvino
+    registered_at: float
@@ -0,0 +1,54 @@
+from dataclasses import dataclass
+from typing import Union
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+@dataclass(frozen=True)
+class BoundingBox:
+    min_latitude: float
+    min_longitude: float
+    max_latitude: float
+    max_longitude: float
+
+    def mask(self, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+        """
+        Vectorized containment test.
+        :param latitudes: Latitudes in degrees
+        :param longitudes: Longitudes in degrees
+        :return: Boolean array, True where the coordinate lies inside the box
+        """
+        return (
+            (latitudes >= self.min_latitude)
+            & (latitudes <= self.max_latitude)
+            & (longitudes >= self.min_longitude)
+            & (longitudes <= self.max_longitude)
+        )
+
+
+@dataclass(frozen=True)
+class RadiusRegion:
+    latitude: float
+    longitude: float
+    radius_km: float
+
+    def mask(self, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+        """
+        Vectorized haversine distance test against the centre.
+        :param latitudes: Latitudes in degrees
+        :param longitudes: Longitudes in degrees
+        :return: Boolean array, True where the coordinate lies within the radius
+        """
+        lat1, lon1 = np.radians(self.latitude), np.radians(self.longitude)
+        lat2, lon2 = np.radians(latitudes), np.radians(longitudes)
+        a = (
+            np.sin((lat2 - lat1) / 2) ** 2
+            + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+        )
+        distance_km = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+        return distance_km <= self.radius_km
+
+
+Region = Union[BoundingBox, RadiusRegion]
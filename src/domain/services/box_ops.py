@@ -0,0 +1,133 @@
+import numpy as np
+
+
+def box_area(boxes: np.ndarray) -> np.ndarray:
+    return np.clip(boxes[:, 2] - boxes[:, 0], 0, None) * np.clip(
+        boxes[:, 3] - boxes[:, 1], 0, None
+    )
+
+
+def box_iou(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """
+    Pairwise IoU of two sets of xyxy boxes, fully vectorized.
+    :param boxes_a: Array of shape (n, 4)
+    :param boxes_b: Array of shape (m, 4)
+    :return: IoU matrix of shape (n, m)
+    """
+    top_left = np.maximum(boxes_a[:, None, :2], boxes_b[None, :, :2])
+    bottom_right = np.minimum(boxes_a[:, None, 2:], boxes_b[None, :, 2:])
+    intersection = np.prod(np.clip(bottom_right - top_left, 0, None), axis=2)
+    union = box_area(boxes_a)[:, None] + box_area(boxes_b)[None, :] - intersection
+    return intersection / np.maximum(union, 1e-9)
+
+
+def box_ios(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """
+    Pairwise intersection over the smaller box. A box cut off at a tile border lies almost
+    entirely inside the full box, so its IoS is high while its IoU can be low.
+    :param boxes_a: Array of shape (n, 4)
+    :param boxes_b: Array of shape (m, 4)
+    :return: IoS matrix of shape (n, m)
+    """
+    top_left = np.maximum(boxes_a[:, None, :2], boxes_b[None, :, :2])
+    bottom_right = np.minimum(boxes_a[:, None, 2:], boxes_b[None, :, 2:])
+    intersection = np.prod(np.clip(bottom_right - top_left, 0, None), axis=2)
+    smaller = np.minimum(box_area(boxes_a)[:, None], box_area(boxes_b)[None, :])
+    return intersection / np.maximum(smaller, 1e-9)
+
+
+OVERLAP_METRICS = {"iou": box_iou, "ios": box_ios}
+
+
+def nms(
+    boxes: np.ndarray, scores: np.ndarray, iou_threshold: float, metric: str = "iou"
+) -> np.ndarray:
+    """
+    Greedy non-maximum suppression. Each step suppresses all remaining boxes overlapping
+    the best one in a single vectorized overlap row.
+    :param boxes: Array of shape (n, 4) in xyxy
+    :param scores: Array of shape (n,)
+    :param iou_threshold: Boxes overlapping a kept box by more than this are dropped
+    :param metric: Overlap measure, 'iou' or 'ios'
+    :return: Indices of the kept boxes, highest score first
+    """
+    overlap = OVERLAP_METRICS[metric]
+    order = np.argsort(-scores, kind="stable")
+    keep = []
+    while order.size:
+        best = order[0]
+        keep.append(best)
+        if order.size == 1:
+            break
+        overlaps = overlap(boxes[best : best + 1], boxes[order[1:]])[0]
+        order = order[1:][overlaps <= iou_threshold]
+    return np.array(keep, dtype=np.int64)
+
+
+def batched_nms(
+    boxes: np.ndarray,
+    scores: np.ndarray,
+    classes: np.ndarray,
+    iou_threshold: float,
+    metric: str = "iou",
+) -> np.ndarray:
+    """
+    Class-aware NMS: boxes of different classes never suppress each other. Offsetting each
+    class into its own coordinate range lets a single NMS pass handle all classes.
+    :param boxes: Array of shape (n, 4) in xyxy
+    :param scores: Array of shape (n,)
+    :param classes: Array of shape (n,) of class ids
+    :param iou_threshold: Overlap threshold
+    :param metric: Overlap measure, 'iou' or 'ios'
+    :return: Indices of the kept boxes
+    """
+    if boxes.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    offsets = classes.astype(boxes.dtype)[:, None] * (boxes.max() + 1)
+    return nms(boxes + offsets, scores, iou_threshold, metric)
+
+
+def weighted_boxes_fusion(
+    boxes: np.ndarray,
+    scores: np.ndarray,
+    classes: np.ndarray,
+    iou_threshold: float,
+    metric: str = "iou",
+) -> tuple:
+    """
+    Weighted boxes fusion: instead of discarding overlapping boxes of the same class, fuse
+    each cluster into one box whose coordinates are the score-weighted mean of its members.
+    :param boxes: Array of shape (n, 4) in xyxy
+    :param scores: Array of shape (n,)
+    :param classes: Array of shape (n,) of class ids
+    :param iou_threshold: Boxes overlapping a cluster by more than this join it
+    :param metric: Overlap measure, 'iou' or 'ios'
+    :return: Fused boxes, scores (cluster mean) and classes
+    """
+    fused_boxes, fused_scores, fused_classes = [], [], []
+    for cls in np.unique(classes):
+        mask = classes == cls
+        cls_boxes, cls_scores = boxes[mask], scores[mask]
+        order = np.argsort(-cls_scores, kind="stable")
+        cls_boxes, cls_scores = cls_boxes[order], cls_scores[order]
+        # Every box joins the cluster of the highest scoring box it overlaps enough
+        overlaps = OVERLAP_METRICS[metric](cls_boxes, cls_boxes) > iou_threshold
+        cluster = np.full(len(cls_boxes), -1)
+        for index in range(len(cls_boxes)):
+            if cluster[index] < 0:
+                cluster[(cluster < 0) & overlaps[index]] = index
+        for head in np.unique(cluster):
+            members = cluster == head
+            weights = cls_scores[members]
+            fused_boxes.append(
+                (cls_boxes[members] * weights[:, None]).sum(0) / weights.sum()
+            )
+            fused_scores.append(weights.mean())
+            fused_classes.append(cls)
+    if not fused_boxes:
+        return boxes[:0], scores[:0], classes[:0]
+    return (
+        np.array(fused_boxes, dtype=boxes.dtype),
+        np.array(fused_scores, dtype=scores.dtype),
+        np.array(fused_classes, dtype=classes.dtype),
+    )
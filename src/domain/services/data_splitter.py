@@ -3,12 +3,14 @@ from abc import ABC, abstractmethod
 
 class DatasetSplitter(ABC):
     @abstractmethod
-    def split(self, dataset, train_ratio: float, val_ratio: float):
+    def split(self, dataset, train_ratio: float, val_ratio: float, class_counts=None):
         """
         Split the dataset into train, validation, and test subsets.
         :param dataset: The provided dataset
         :param train_ratio: The ratio of the training dataset
         :param val_ratio: The ratio of the validation dataset
+        :param class_counts: Optional boxes per item and class, e.g. from a dataset
+        index, which stratifying splitters use instead of reading the labels
         :return: Training data, validation data and test data
         """
         pass
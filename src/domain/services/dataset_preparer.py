@@ -1,5 +1,14 @@
 from abc import ABC, abstractmethod
+from enum import Enum
 from pathlib import Path
+from typing import Optional
+
+
+class TransferMode(Enum):
+    MOVE = "move"  # Move files into the split folders (destroys the source layout)
+    COPY = "copy"  # Copy files into the split folders
+    LINK = "link"  # Hardlink (or symlink) files into the split folders
+    LIST = "list"  # Only write train.txt/val.txt/test.txt lists of source images
 
 
 class DatasetPreparer(ABC):
@@ -13,6 +22,7 @@ class DatasetPreparer(ABC):
         train_ratio: float,
         val_ratio: float,
         move_files: bool = True,
+        transfer_mode: Optional[TransferMode] = None,
     ) -> None:
         """
         Prepare and split the dataset for Ultralytics training.
@@ -24,5 +34,6 @@ class DatasetPreparer(ABC):
         :param train_ratio: Fraction of data for training.
         :param val_ratio: Fraction of data for validation.
         :param move_files: If True, move files; if False, copy files.
+        :param transfer_mode: How files end up in the splits; overrides move_files when given.
         """
         pass
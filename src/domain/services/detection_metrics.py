@@ -0,0 +1,141 @@
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import numpy as np
+
+from src.domain.detection import Detections
+from src.domain.services.box_ops import box_iou
+
+COCO_IOU_THRESHOLDS = np.linspace(0.5, 0.95, 10)
+RECALL_POINTS = np.linspace(0, 1, 101)  # COCO style interpolation
+
+
+@dataclass(frozen=True)
+class MeanAveragePrecision:
+    map50: float
+    map50_95: float
+    ap50_per_class: Dict[int, float] = field(default_factory=dict)
+    images: int = 0
+    instances: int = 0
+
+
+def match_detections(
+    gt_boxes: np.ndarray,
+    gt_classes: np.ndarray,
+    detections: Detections,
+    iou_thresholds: np.ndarray = COCO_IOU_THRESHOLDS,
+) -> np.ndarray:
+    """
+    Mark every detection as true or false positive at each IoU threshold. Candidate pairs
+    of the same class are taken by descending IoU, each ground truth box and each
+    detection at most once.
+    :param gt_boxes: Ground truth xyxy boxes of shape (g, 4)
+    :param gt_classes: Ground truth class ids of shape (g,)
+    :param detections: Detections of the same image
+    :param iou_thresholds: IoU thresholds of shape (t,)
+    :return: Boolean array of shape (n_detections, t)
+    """
+    correct = np.zeros((len(detections), len(iou_thresholds)), dtype=bool)
+    if len(detections) == 0 or len(gt_boxes) == 0:
+        return correct
+    ious = box_iou(detections.boxes, gt_boxes)
+    ious[detections.classes[:, None] != gt_classes[None, :]] = 0
+    for column, threshold in enumerate(iou_thresholds):
+        det_index, gt_index = np.nonzero(ious >= threshold)
+        if det_index.size == 0:
+            continue
+        order = np.argsort(-ious[det_index, gt_index], kind="stable")
+        det_index, gt_index = det_index[order], gt_index[order]
+        _, first = np.unique(det_index, return_index=True)
+        det_index, gt_index = det_index[first], gt_index[first]
+        _, first = np.unique(gt_index, return_index=True)
+        correct[det_index[first], column] = True
+    return correct
+
+
+def average_precision(recall: np.ndarray, precision: np.ndarray) -> float:
+    """
+    Area under the interpolated precision-recall curve, sampled at 101 recall points.
+    :param recall: Cumulative recall, increasing
+    :param precision: Precision at each recall value
+    :return: Average precision, 0 without any detection
+    """
+    if len(recall) == 0:
+        return 0.0  # The sentinels alone would interpolate to an AP of 0.5
+    recall = np.concatenate([[0.0], recall, [1.0]])
+    precision = np.concatenate([[1.0], precision, [0.0]])
+    # Precision envelope: best precision at this recall or higher
+    precision = np.flip(np.maximum.accumulate(np.flip(precision)))
+    curve = np.interp(RECALL_POINTS, recall, precision)
+    return float(np.sum(np.diff(RECALL_POINTS) * (curve[1:] + curve[:-1]) / 2))
+
+
+class DetectionEvaluator:
+    """
+    Accumulates matches image by image and computes mAP@0.5 and mAP@0.5:0.95 over all
+    of them, like the COCO/Ultralytics evaluation. Only per-detection match flags, scores
+    and classes are kept, so evaluating large splits needs little memory.
+    """
+
+    def __init__(self, iou_thresholds: np.ndarray = COCO_IOU_THRESHOLDS):
+        """
+        :param iou_thresholds: IoU thresholds, the first one is reported as AP50.
+        """
+        self.iou_thresholds = iou_thresholds
+        self._correct: List[np.ndarray] = []
+        self._scores: List[np.ndarray] = []
+        self._classes: List[np.ndarray] = []
+        self._gt_classes: List[np.ndarray] = []
+
+    def add(
+        self, gt_boxes: np.ndarray, gt_classes: np.ndarray, detections: Detections
+    ) -> None:
+        """
+        :param gt_boxes: Ground truth xyxy boxes of one image, shape (g, 4)
+        :param gt_classes: Ground truth class ids, shape (g,)
+        :param detections: Detections of the image
+        """
+        gt_classes = np.asarray(gt_classes, dtype=np.int64)
+        self._correct.append(
+            match_detections(gt_boxes, gt_classes, detections, self.iou_thresholds)
+        )
+        self._scores.append(detections.scores)
+        self._classes.append(detections.classes)
+        self._gt_classes.append(gt_classes)
+
+    def compute(self) -> MeanAveragePrecision:
+        if not self._gt_classes:
+            return MeanAveragePrecision(0.0, 0.0)
+        correct = np.concatenate(self._correct).reshape(-1, len(self.iou_thresholds))
+        scores = np.concatenate(self._scores)
+        classes = np.concatenate(self._classes)
+        gt_classes = np.concatenate(self._gt_classes)
+        if gt_classes.size == 0:
+            # Background-only images: there is nothing to recall
+            return MeanAveragePrecision(0.0, 0.0, images=len(self._gt_classes))
+
+        order = np.argsort(-scores, kind="stable")
+        correct, classes = correct[order], classes[order]
+        ap = {}
+        for cls in np.unique(gt_classes).tolist():
+            hits = correct[classes == cls]
+            if len(hits) == 0:
+                # Missed class, as Ultralytics scores a class without predictions
+                ap[cls] = [0.0] * len(self.iou_thresholds)
+                continue
+            true_positives = np.cumsum(hits, axis=0)
+            false_positives = np.cumsum(~hits, axis=0)
+            recall = true_positives / (gt_classes == cls).sum()
+            precision = true_positives / np.maximum(true_positives + false_positives, 1)
+            ap[cls] = [
+                average_precision(recall[:, t], precision[:, t])
+                for t in range(len(self.iou_thresholds))
+            ]
+        per_class = np.array(list(ap.values()))
+        return MeanAveragePrecision(
+            map50=float(per_class[:, 0].mean()),
+            map50_95=float(per_class.mean()),
+            ap50_per_class={cls: values[0] for cls, values in ap.items()},
+            images=len(self._gt_classes),
+            instances=len(gt_classes),
+        )
@@ -0,0 +1,33 @@
+from abc import ABC, abstractmethod
+from typing import List, Set
+
+from src.domain.detection import DetectionRecord
+
+
+class DetectionSink(ABC):
+    @abstractmethod
+    def completed(self) -> Set[str]:
+        """
+        Ids of the images already written by earlier (possibly interrupted) runs.
+        Images whose last record has an error are left out, so a rerun retries them
+        and appends a new record; readers of the output keep the last record per image.
+        :return: Set of image ids
+        """
+        pass
+
+    @abstractmethod
+    def write(self, records: List[DetectionRecord]) -> None:
+        """
+        Durably append a batch of records, so they survive an interruption of the run.
+        :param records: Records to append
+        """
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "DetectionSink":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
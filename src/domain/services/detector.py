@@ -0,0 +1,21 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+import numpy as np
+
+from src.domain.detection import Detections
+
+
+class Detector(ABC):
+    @abstractmethod
+    def predict(
+        self, images: List[np.ndarray], conf: float, imgsz: int
+    ) -> List[Detections]:
+        """
+        Run object detection on a batch of images in one call.
+        :param images: RGB images as HxWx3 uint8 arrays
+        :param conf: Minimum confidence of the returned detections
+        :param imgsz: Inference image size
+        :return: One Detections per image, in input order
+        """
+        pass
@@ -0,0 +1,79 @@
+import math
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+# A dimension is a list of choices, (low, high) sampled uniformly or
+# (low, high, "log") sampled log-uniformly
+Dimension = Union[list, tuple]
+
+
+def sample_configuration(
+    space: Dict[str, Dimension], rng: np.random.Generator
+) -> Dict[str, object]:
+    """
+    Draw one configuration from a search space.
+    :param space: Dimension per hyperparameter
+    :param rng: Random generator
+    :return: Value per hyperparameter, as plain Python types
+    """
+    configuration = {}
+    for name, dimension in space.items():
+        if isinstance(dimension, list):
+            value = dimension[rng.integers(len(dimension))]
+        elif len(dimension) == 3 and dimension[2] == "log":
+            low, high = math.log(dimension[0]), math.log(dimension[1])
+            value = math.exp(rng.uniform(low, high))
+        else:
+            value = rng.uniform(dimension[0], dimension[1])
+        configuration[name] = value.item() if isinstance(value, np.generic) else value
+    return configuration
+
+
+def asha_rungs(min_epochs: int, max_epochs: int, eta: int) -> List[int]:
+    """
+    Epochs at which successive halving compares trials: min_epochs, then every eta
+    times more, below max_epochs.
+    :param min_epochs: Epochs every trial gets
+    :param max_epochs: Epochs of a trial that is never stopped
+    :param eta: Reduction factor, only the best 1/eta of a rung continues
+    :return: Rung epochs
+    """
+    rungs = []
+    epochs = min_epochs
+    while epochs < max_epochs:
+        rungs.append(epochs)
+        epochs *= eta
+    return rungs
+
+
+def asha_continues(score: float, rung_scores: Sequence[float], eta: int) -> bool:
+    """
+    Asynchronous successive halving: a trial reaching a rung continues if its score is
+    among the best 1/eta of all scores recorded at that rung so far, its own included.
+    With fewer than eta scores, it has to be the best so far. Trials decide as soon
+    as they arrive, so no worker waits for a rung to fill up.
+    :param score: Score of the trial at the rung, higher is better
+    :param rung_scores: Scores of all trials at the rung, including this one
+    :param eta: Reduction factor
+    :return: True if the trial keeps training
+    """
+    ranked = sorted(rung_scores, reverse=True)
+    keep = max(len(ranked) // eta, 1)
+    return score >= ranked[keep - 1]
+
+
+def pareto_front(points: Sequence[Tuple[float, float]]) -> List[int]:
+    """
+    Points not dominated by another point with at least the accuracy at no more latency.
+    :param points: (accuracy, latency) pairs, higher accuracy and lower latency are better
+    :return: Indices of the front, from fastest to most accurate
+    """
+    order = sorted(range(len(points)), key=lambda i: (points[i][1], -points[i][0]))
+    front = []
+    best = -math.inf
+    for index in order:
+        if points[index][0] > best:
+            front.append(index)
+            best = points[index][0]
+    return front
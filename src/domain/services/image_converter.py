@@ -1,14 +1,39 @@
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+@dataclass
+class ConversionReport:
+    converted: List[Path] = field(default_factory=list)
+    skipped: List[Path] = field(default_factory=list)  # Already up to date
+    failed: List[Tuple[Path, str]] = field(default_factory=list)  # (file, error)
+    stage_seconds: Dict[str, float] = field(default_factory=dict)  # Summed per stage
 
 
 class ImageConverter(ABC):
     @abstractmethod
-    def convert_heic_to_jpg(self, input_folder: Path, output_folder: Path) -> None:
+    def convert_heic_to_jpg(
+        self, input_folder: Path, output_folder: Path
+    ) -> ConversionReport:
         """
         Convert all HEIC images in the input_folder to JPG format, saving them into the output_folder.
         :param input_folder: The Path object representing the input folder
         :param output_folder: The Path object representing the output folder
-        :return:
+        :return: Report of converted, skipped and failed files
+        """
+        pass
+
+    @abstractmethod
+    def normalize_images(
+        self, input_folder: Path, output_folder: Path
+    ) -> ConversionReport:
+        """
+        Normalize every supported image in the input_folder (any format, orientation, colour space
+        and size) into one canonical training format, saving them into the output_folder.
+        :param input_folder: The Path object representing the input folder
+        :param output_folder: The Path object representing the output folder
+        :return: Report of converted, skipped and failed files with per-stage timings
         """
         pass
@@ -0,0 +1,135 @@
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+
+from src.domain.detection import Detections
+from src.domain.services.box_ops import box_iou
+
+
+@dataclass
+class Track:
+    track_id: int
+    box: np.ndarray  # Latest xyxy box
+    cls: int
+    score: float  # Best score seen
+    first_frame: int
+    last_frame: int
+    hits: int = 1
+    missed: int = 0  # Consecutive updates without a match
+    confirmed: bool = False
+
+
+def greedy_match(
+    ious: np.ndarray, threshold: float
+) -> Tuple[List[Tuple[int, int]], np.ndarray, np.ndarray]:
+    """
+    Match rows to columns by descending IoU, each row and column at most once.
+    :param ious: IoU matrix of shape (rows, cols)
+    :param threshold: Minimum IoU of a match
+    :return: Matched (row, col) pairs and boolean masks of the unmatched rows and cols
+    """
+    free_rows = np.ones(ious.shape[0], dtype=bool)
+    free_cols = np.ones(ious.shape[1], dtype=bool)
+    pairs = []
+    rows, cols = np.unravel_index(np.argsort(-ious, axis=None), ious.shape)
+    for row, col in zip(rows.tolist(), cols.tolist()):
+        if ious[row, col] < threshold:
+            break
+        if free_rows[row] and free_cols[col]:
+            pairs.append((row, col))
+            free_rows[row] = free_cols[col] = False
+    return pairs, free_rows, free_cols
+
+
+class IouTracker:
+    """
+    Lightweight ByteTrack-style tracker: confident detections are associated with the
+    live tracks by IoU first, then the low-score detections get a second chance to extend
+    the tracks left over, so an object does not lose its track when its score dips for
+    a few frames. Only confident detections start new tracks.
+    """
+
+    def __init__(
+        self,
+        iou_threshold: float,
+        high_score: float,
+        max_missed: int,
+        min_hits: int,
+    ):
+        """
+        :param iou_threshold: Minimum IoU between a track and a detection to associate them.
+        :param high_score: Detections at or above this score are confident.
+        :param max_missed: Updates a track survives without a match.
+        :param min_hits: Matches needed before a track is confirmed (and reported).
+        """
+        self.iou_threshold = iou_threshold
+        self.high_score = high_score
+        self.max_missed = max_missed
+        self.min_hits = min_hits
+        self.tracks: List[Track] = []
+        self.confirmed_total = 0
+        self._next_id = 1
+
+    def update(self, detections: Detections, frame_index: int) -> List[Track]:
+        """
+        Advance the tracker by one processed frame.
+        :param detections: Detections of the frame
+        :param frame_index: Index of the frame in the source
+        :return: Tracks confirmed by this update, each one is returned exactly once
+        """
+        high = detections.scores >= self.high_score
+        unmatched = np.ones(len(self.tracks), dtype=bool)
+        remaining_high = np.zeros(len(detections), dtype=bool)
+        for stage in (high, ~high):
+            candidates = np.where(stage)[0]
+            track_rows = np.where(unmatched)[0]
+            ious = box_iou(
+                np.array([self.tracks[t].box for t in track_rows]).reshape(-1, 4),
+                detections.boxes[candidates],
+            )
+            # Boxes of different classes never belong to the same object
+            classes = np.array([self.tracks[t].cls for t in track_rows], dtype=np.int64)
+            ious[classes[:, None] != detections.classes[candidates][None, :]] = 0
+            pairs, _, free_cols = greedy_match(ious, self.iou_threshold)
+            for row, col in pairs:
+                track = self.tracks[track_rows[row]]
+                self._extend(track, detections, candidates[col], frame_index)
+                unmatched[track_rows[row]] = False
+            if stage is high:
+                remaining_high[candidates[free_cols]] = True
+
+        for index, track in enumerate(self.tracks):
+            if unmatched[index]:
+                track.missed += 1
+        self.tracks = [t for t in self.tracks if t.missed <= self.max_missed]
+        for index in np.where(remaining_high)[0]:
+            self.tracks.append(
+                Track(
+                    track_id=self._next_id,
+                    box=detections.boxes[index].copy(),
+                    cls=int(detections.classes[index]),
+                    score=float(detections.scores[index]),
+                    first_frame=frame_index,
+                    last_frame=frame_index,
+                )
+            )
+            self._next_id += 1
+
+        newly_confirmed = []
+        for track in self.tracks:
+            if not track.confirmed and track.hits >= self.min_hits:
+                track.confirmed = True
+                newly_confirmed.append(track)
+        self.confirmed_total += len(newly_confirmed)
+        return newly_confirmed
+
+    @staticmethod
+    def _extend(
+        track: Track, detections: Detections, index: int, frame_index: int
+    ) -> None:
+        track.box = detections.boxes[index].copy()
+        track.score = max(track.score, float(detections.scores[index]))
+        track.hits += 1
+        track.missed = 0
+        track.last_frame = frame_index
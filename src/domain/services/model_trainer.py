@@ -1,4 +1,7 @@
 from abc import ABC, abstractmethod
+from typing import Optional
+
+from src.domain.services.detection_metrics import MeanAveragePrecision
 
 
 class ModelTrainer(ABC):
@@ -12,3 +15,15 @@ class ModelTrainer(ABC):
         :return:
         """
         pass
+
+    def evaluate(
+        self, loader, device, split: str = "val"
+    ) -> Optional[MeanAveragePrecision]:
+        """
+        Evaluate the trained model on a split given as a data loader.
+        :param loader: Dataloader of the split
+        :param device: 'cpu', 'gpu' or 'mps' depending on system
+        :param split: Name of the split
+        :return: mAP of the split, None for trainers that evaluate on their own
+        """
+        return None
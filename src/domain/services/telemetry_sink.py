@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+
+from src.domain.training_telemetry import EpochTelemetry
+
+
+class TelemetrySink(ABC):
+    @abstractmethod
+    def write(self, record: EpochTelemetry) -> None:
+        """
+        Persist one record as soon as it is known, so a crashed run keeps its history.
+        :param record: Telemetry of an epoch or of a final evaluation
+        """
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "TelemetrySink":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,91 @@
+from typing import Optional, Sequence
+
+from src.domain.training_telemetry import EpochTelemetry, TrainingSummary
+
+BOTTLENECK_ADVICE = {
+    "io": "Samples arrive slower than the model consumes them and most worker time "
+    "goes to reading and decoding: enable the decoded image cache or add loader "
+    "workers.",
+    "augmentation": "Samples arrive slower than the model consumes them and most "
+    "worker time goes to the transforms: add loader workers or simplify the "
+    "augmentations.",
+    "compute": "The model rarely waits for data: a faster device, mixed precision or "
+    "a smaller model speed training up, more loader workers do not.",
+    "unknown": "The trainer did not report data wait times.",
+}
+
+
+def classify_bottleneck(
+    data_wait_fraction: Optional[float],
+    load_s: Optional[float],
+    augment_s: Optional[float],
+    data_bound_fraction: float,
+) -> str:
+    """
+    A run whose training loop waits for batches more than data_bound_fraction of the
+    time is input bound; the worker time spent loading versus transforming samples then
+    tells I/O from augmentation. Otherwise the model itself sets the pace.
+    :param data_wait_fraction: Share of the loop spent waiting for batches
+    :param load_s: Worker seconds reading and decoding samples
+    :param augment_s: Worker seconds in the transforms
+    :param data_bound_fraction: Data wait share above which a run is input bound
+    :return: 'io', 'augmentation', 'compute' or 'unknown'
+    """
+    if data_wait_fraction is None:
+        return "unknown"
+    if data_wait_fraction < data_bound_fraction:
+        return "compute"
+    return "augmentation" if (augment_s or 0.0) > (load_s or 0.0) else "io"
+
+
+def _total(values: Sequence[Optional[float]]) -> Optional[float]:
+    known = [v for v in values if v is not None]
+    return sum(known) if known else None
+
+
+def _peak(values: Sequence[Optional[float]]) -> Optional[float]:
+    known = [v for v in values if v is not None]
+    return max(known) if known else None
+
+
+def summarize(
+    run: str, records: Sequence[EpochTelemetry], data_bound_fraction: float
+) -> TrainingSummary:
+    """
+    Totals over the training epochs of a run, the best val mAP and the result of a
+    final test evaluation when one was recorded.
+    :param run: Id of the run
+    :param records: Telemetry records of the run
+    :param data_bound_fraction: Data wait share above which a run is input bound
+    :return: The summary
+    """
+    epochs = [r for r in records if r.phase == "train"]
+    vals = [r for r in records if r.phase == "val"]
+    tests = [r for r in records if r.phase == "test"]
+    wall_s = sum(r.wall_s for r in epochs)
+    data_wait_s = _total([r.data_wait_s for r in epochs])
+    compute_s = _total([r.compute_s for r in epochs])
+    data_wait_fraction = None
+    if data_wait_s is not None and compute_s is not None:
+        loop_s = data_wait_s + compute_s
+        data_wait_fraction = data_wait_s / loop_s if loop_s else 0.0
+    load_s = _total([r.load_s for r in epochs])
+    augment_s = _total([r.augment_s for r in epochs])
+    bottleneck = classify_bottleneck(
+        data_wait_fraction, load_s, augment_s, data_bound_fraction
+    )
+    return TrainingSummary(
+        run=run,
+        epochs=len(epochs),
+        wall_s=wall_s,
+        images_per_s=sum(r.images for r in epochs) / wall_s if wall_s else 0.0,
+        data_wait_fraction=data_wait_fraction,
+        load_s=load_s,
+        augment_s=augment_s,
+        peak_rss_mb=_peak([r.peak_rss_mb for r in records]),
+        peak_device_mb=_peak([r.peak_device_mb for r in records]),
+        best_map50_95=_peak([r.map50_95 for r in vals]),
+        test_map50_95=tests[-1].map50_95 if tests else None,
+        bottleneck=bottleneck,
+        advice=BOTTLENECK_ADVICE[bottleneck],
+    )
@@ -0,0 +1,18 @@
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+
+@dataclass(frozen=True)
+class TrialResult:
+    """One configuration of a hyperparameter sweep and how far it got."""
+
+    trial_id: int
+    params: Dict[str, object] = field(default_factory=dict)
+    status: str = "pending"  # pending, running, pruned, completed or failed
+    epochs: int = 0  # Epochs trained
+    val_map50_95: Optional[float] = None  # Of the last epoch, from the training run
+    map50: Optional[float] = None  # Of best.pt, measured after the sweep
+    map50_95: Optional[float] = None
+    latency_ms: Optional[float] = None  # Mean CPU latency per image of best.pt
+    weights: Optional[str] = None
+    error: Optional[str] = None
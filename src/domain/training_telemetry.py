@@ -0,0 +1,87 @@
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class EpochTelemetry:
+    """Where the time of one training epoch, or of one evaluation, went."""
+
+    run: str
+    phase: str  # 'train' for training epochs, the split name for evaluations
+    epoch: int  # Epochs trained
+    images: int
+    wall_s: float
+    loss: Optional[float] = None
+    data_wait_s: Optional[float] = None  # Training loop waiting for the next batch
+    compute_s: Optional[float] = None  # Training loop working on a batch
+    load_s: Optional[float] = None  # Worker seconds reading and decoding samples
+    augment_s: Optional[float] = None  # Worker seconds in the dataset transforms
+    map50: Optional[float] = None  # Of evaluation records
+    map50_95: Optional[float] = None
+    peak_rss_mb: Optional[float] = None  # Peak resident memory of the process
+    peak_device_mb: Optional[float] = None  # Peak CUDA memory of a training epoch
+    timestamp: float = field(default_factory=time.time)
+
+    @property
+    def images_per_s(self) -> float:
+        return self.images / self.wall_s if self.wall_s else 0.0
+
+    @property
+    def data_wait_fraction(self) -> Optional[float]:
+        if self.data_wait_s is None or self.compute_s is None:
+            return None
+        total = self.data_wait_s + self.compute_s
+        return self.data_wait_s / total if total else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            **asdict(self),
+            "images_per_s": self.images_per_s,
+            "data_wait_fraction": self.data_wait_fraction,
+        }
+
+
+@dataclass(frozen=True)
+class TrainingSummary:
+    """Totals of a training run and what bounds its speed."""
+
+    run: str
+    epochs: int
+    wall_s: float
+    images_per_s: float
+    data_wait_fraction: Optional[float]
+    load_s: Optional[float]
+    augment_s: Optional[float]
+    peak_rss_mb: Optional[float]
+    peak_device_mb: Optional[float]
+    best_map50_95: Optional[float]
+    test_map50_95: Optional[float]
+    bottleneck: str  # io, augmentation, compute or unknown
+    advice: str
+
+    def __str__(self) -> str:
+        lines = [
+            f"Run {self.run}: {self.epochs} epochs in {self.wall_s:.0f}s, "
+            f"{self.images_per_s:.1f} images/s"
+        ]
+        if self.data_wait_fraction is not None:
+            lines.append(f"Data wait: {self.data_wait_fraction:.0%} of the loop")
+        if self.load_s is not None and self.augment_s is not None:
+            lines.append(
+                f"Loader workers: {self.load_s:.1f}s loading, "
+                f"{self.augment_s:.1f}s augmenting"
+            )
+        if self.peak_rss_mb is not None:
+            device = (
+                f", device {self.peak_device_mb:.0f} MB"
+                if self.peak_device_mb is not None
+                else ""
+            )
+            lines.append(f"Peak memory: host {self.peak_rss_mb:.0f} MB{device}")
+        if self.best_map50_95 is not None:
+            lines.append(f"Best val mAP@0.5:0.95: {self.best_map50_95:.3f}")
+        if self.test_map50_95 is not None:
+            lines.append(f"Test mAP@0.5:0.95: {self.test_map50_95:.3f}")
+        lines.append(f"Bound by: {self.bottleneck}. {self.advice}")
+        return "\n".join(lines)
@@ -0,0 +1,10 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class VideoFrame:
+    index: int  # Position in the source, counting frames dropped by the reader
+    timestamp_s: float
+    image: np.ndarray  # RGB, HxWx3 uint8
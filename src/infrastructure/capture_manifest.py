@@ -0,0 +1,154 @@
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from loguru import logger
+
+from src.config import (
+    CAPTURE_MAX_AGE_H,
+    CAPTURE_MAX_ATTEMPTS,
+    CAPTURE_RETRY_BASE_S,
+    CAPTURE_RETRY_MAX_S,
+)
+from src.domain.camera import CameraDataFromCsv
+from src.domain.capture import CaptureResult
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS captures (
+    url TEXT PRIMARY KEY,
+    path TEXT,
+    status TEXT NOT NULL,
+    captured_at REAL,
+    content_hash TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0
+)
+"""
+
+
+def file_sha256(path: Path) -> str:
+    """
+    Compute the SHA-256 of a file in chunks.
+    :param path: The file to hash
+    :return: Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class CaptureManifest:
+    """
+    Persistent per-URL record of screenshot captures: last capture time, status,
+    content hash and error. Every result is committed as soon as it is known, so an
+    interrupted run resumes with only the cameras that were not captured yet.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        max_age_h: float = CAPTURE_MAX_AGE_H,
+        retry_base_s: float = CAPTURE_RETRY_BASE_S,
+        retry_max_s: float = CAPTURE_RETRY_MAX_S,
+        max_attempts: int = CAPTURE_MAX_ATTEMPTS,
+    ):
+        """
+        :param db_path: Path of the SQLite manifest file.
+        :param max_age_h: Successful captures younger than this are skipped.
+        :param retry_base_s: Backoff after the first failure, doubled on every further failure.
+        :param retry_max_s: Upper bound of the backoff.
+        :param max_attempts: Failed URLs are given up after this many consecutive failures.
+        """
+        self.db_path = db_path
+        self.max_age_s = max_age_h * 3600
+        self.retry_base_s = retry_base_s
+        self.retry_max_s = retry_max_s
+        self.max_attempts = max_attempts
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(db_path)
+        self.connection.execute(SCHEMA)
+        self.connection.commit()
+
+    def pending(
+        self, cameras: List[CameraDataFromCsv], now: Optional[float] = None
+    ) -> List[CameraDataFromCsv]:
+        """
+        Filter the cameras down to the ones that need a (re)capture.
+        :param cameras: All cameras of the registry
+        :param now: Reference time, defaults to the current time
+        :return: Cameras that are new, stale or due for a retry
+        """
+        now = time.time() if now is None else now
+        rows = self.connection.execute(
+            "SELECT url, status, captured_at, attempts, next_attempt_at FROM captures"
+        ).fetchall()
+        known = {row[0]: row[1:] for row in rows}
+
+        due = []
+        for camera in cameras:
+            record = known.get(camera.url)
+            if record is None:
+                due.append(camera)
+                continue
+            status, captured_at, attempts, next_attempt_at = record
+            if status == "ok":
+                if now - captured_at >= self.max_age_s:
+                    due.append(camera)
+            elif attempts < self.max_attempts and next_attempt_at <= now:
+                due.append(camera)
+
+        logger.info(
+            f"Manifest: {len(due)} of {len(cameras)} cameras due, "
+            f"{len(cameras) - len(due)} fresh or backing off."
+        )
+        return due
+
+    def record(self, result: CaptureResult, now: Optional[float] = None) -> None:
+        """
+        Persist the outcome of one capture.
+        :param result: The capture result reported by the scraper
+        :param now: Reference time, defaults to the current time
+        :return:
+        """
+        now = time.time() if now is None else now
+        url = result.camera.url
+        if result.ok:
+            content_hash = file_sha256(result.path)
+            previous = self.connection.execute(
+                "SELECT content_hash FROM captures WHERE url = ?", (url,)
+            ).fetchone()
+            if previous and previous[0] == content_hash:
+                logger.info(f"Unchanged since last capture: {url}")
+            self.connection.execute(
+                "INSERT OR REPLACE INTO captures VALUES (?, ?, 'ok', ?, ?, NULL, 0, 0)",
+                (url, str(result.path), now, content_hash),
+            )
+        else:
+            row = self.connection.execute(
+                "SELECT attempts FROM captures WHERE url = ? AND status = 'failed'",
+                (url,),
+            ).fetchone()
+            attempts = (row[0] if row else 0) + 1
+            backoff = min(self.retry_max_s, self.retry_base_s * 2 ** (attempts - 1))
+            # Keep the last good capture time and hash around for reference
+            self.connection.execute(
+                """
+                INSERT INTO captures (url, status, error, attempts, next_attempt_at)
+                VALUES (?, 'failed', ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    status = 'failed',
+                    error = excluded.error,
+                    attempts = excluded.attempts,
+                    next_attempt_at = excluded.next_attempt_at
+                """,
+                (url, result.error, attempts, now + backoff),
+            )
+        self.connection.commit()
+
+    def close(self) -> None:
+        self.connection.close()
@@ -0,0 +1,201 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+from loguru import logger
+from playwright.async_api import BrowserContext, Page, async_playwright
+
+from src.config import (
+    SCRAPER_CONCURRENCY,
+    SCRAPER_NAVIGATION_TIMEOUT_MS,
+    SCRAPER_PER_HOST_DELAY_MS,
+    SCRAPER_PER_HOST_LIMIT,
+)
+from src.domain.camera import CameraDataFromCsv
+from src.domain.capture import CaptureResult, ScrapeSummary
+from src.infrastructure.image_scraper import (
+    REJECT_BUTTON_XPATH,
+    log_summary,
+    screenshot_path,
+)
+from src.infrastructure.page_readiness import PageReadiness, PixelStabilityReadiness
+
+
+class HostThrottle:
+    """
+    Politeness limits per host: caps simultaneous navigations to the same host and
+    spaces consecutive navigations to it by a minimum interval.
+    """
+
+    def __init__(self, max_concurrent: int, min_interval_ms: int):
+        self.max_concurrent = max_concurrent
+        self.min_interval_s = min_interval_ms / 1000
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._last_start: Dict[str, float] = {}
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        host = urlparse(url).netloc
+        semaphore = self._semaphores.setdefault(
+            host, asyncio.Semaphore(self.max_concurrent)
+        )
+        async with semaphore:
+            async with self._locks.setdefault(host, asyncio.Lock()):
+                last = self._last_start.get(host)
+                if last is not None:
+                    wait = last + self.min_interval_s - time.monotonic()
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                self._last_start[host] = time.monotonic()
+            yield
+
+
+class CookieConsent:
+    """
+    Cookie-rejection state shared by all workers. Pages live in a single browser
+    context, so the consent dialog is probed once: the first worker runs the probe and
+    the others wait for its outcome, whether a dialog was found or not. Later captures
+    return straight away instead of each waiting for a dialog that never shows.
+    """
+
+    def __init__(self):
+        self.rejected = False
+        self._probe: Optional[asyncio.Task] = None
+
+    async def reject(self, page: Page) -> None:
+        if self._probe is None:
+            self._probe = asyncio.ensure_future(self._reject(page))
+        await self._probe
+
+    async def _reject(self, page: Page) -> None:
+        try:
+            await page.wait_for_selector(REJECT_BUTTON_XPATH, timeout=5000)
+            await page.click(REJECT_BUTTON_XPATH)
+            await page.wait_for_load_state("networkidle")
+            self.rejected = True
+            logger.info("Cookies rejected successfully.")
+        except Exception as e:
+            logger.info(f"Cookie consent not shown or already rejected. {e}")
+
+
+class ConcurrentImageScraper:
+    def __init__(
+        self,
+        output_dir: Path,
+        headless: bool = True,
+        concurrency: int = SCRAPER_CONCURRENCY,
+        per_host_limit: int = SCRAPER_PER_HOST_LIMIT,
+        per_host_delay_ms: int = SCRAPER_PER_HOST_DELAY_MS,
+        readiness: Optional[PageReadiness] = None,
+    ):
+        """
+        :param output_dir: Folder where screenshots are saved.
+        :param headless: Run the browser without a window.
+        :param concurrency: Number of pages capturing in parallel.
+        :param per_host_limit: Max simultaneous navigations to the same host.
+        :param per_host_delay_ms: Min spacing in ms between navigations to the same host.
+        :param readiness: Strategy deciding when a page is ready for the screenshot.
+        """
+        self.output_dir = output_dir
+        self.headless = headless
+        self.concurrency = concurrency
+        self.per_host_limit = per_host_limit
+        self.per_host_delay_ms = per_host_delay_ms
+        self.readiness = readiness or PixelStabilityReadiness()
+
+    def scrape_images(
+        self,
+        cameras: List[CameraDataFromCsv],
+        on_result: Optional[Callable[[CaptureResult], None]] = None,
+    ) -> ScrapeSummary:
+        """
+        Capture screenshots from given URLs using a bounded pool of pages in one browser.
+        :param cameras: List of urls from csv file
+        :param on_result: Called with every capture result as soon as it is known
+        :return: Summary of the run with per-camera results
+        """
+        return asyncio.run(self.scrape_images_async(cameras, on_result))
+
+    async def scrape_images_async(
+        self,
+        cameras: List[CameraDataFromCsv],
+        on_result: Optional[Callable[[CaptureResult], None]] = None,
+    ) -> ScrapeSummary:
+        """
+        Async variant of scrape_images for callers already running an event loop.
+        :param cameras: List of urls from csv file
+        :param on_result: Called with every capture result as soon as it is known
+        :return: Summary of the run with per-camera results
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        queue: asyncio.Queue = asyncio.Queue()
+        for camera in cameras:
+            queue.put_nowait(camera)
+
+        throttle = HostThrottle(self.per_host_limit, self.per_host_delay_ms)
+        consent = CookieConsent()
+        summary = ScrapeSummary()
+        start = time.perf_counter()
+
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=self.headless)
+            context = await browser.new_context()
+            workers = [
+                self._worker(context, queue, throttle, consent, summary, on_result)
+                for _ in range(max(1, min(self.concurrency, len(cameras))))
+            ]
+            await asyncio.gather(*workers)
+            await browser.close()
+
+        summary.elapsed_s = time.perf_counter() - start
+        log_summary(summary)
+        return summary
+
+    async def _worker(
+        self,
+        context: BrowserContext,
+        queue: asyncio.Queue,
+        throttle: HostThrottle,
+        consent: CookieConsent,
+        summary: ScrapeSummary,
+        on_result: Optional[Callable[[CaptureResult], None]],
+    ) -> None:
+        page = await context.new_page()
+        try:
+            while True:
+                try:
+                    camera = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                result = await self._capture(page, camera, throttle, consent)
+                summary.results.append(result)
+                if on_result is not None:
+                    on_result(result)
+        finally:
+            await page.close()
+
+    async def _capture(
+        self,
+        page: Page,
+        camera: CameraDataFromCsv,
+        throttle: HostThrottle,
+        consent: CookieConsent,
+    ) -> CaptureResult:
+        filename = screenshot_path(self.output_dir, camera)
+        try:
+            async with throttle.slot(camera.url):
+                await page.goto(camera.url, timeout=SCRAPER_NAVIGATION_TIMEOUT_MS)
+            await consent.reject(page)
+            await page.wait_for_load_state("networkidle")
+            time_to_ready = await self.readiness.wait_async(page)
+            logger.info(f"Ready after {time_to_ready:.2f}s: {camera.url}")
+            await page.screenshot(path=str(filename))
+            logger.success(f"Saved: {filename}")
+            return CaptureResult(camera, filename, time_to_ready_s=time_to_ready)
+        except Exception as e:
+            logger.error(f"Failed: {camera.url} - {e}")
+            return CaptureResult(camera, None, str(e))
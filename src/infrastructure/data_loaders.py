@@ -1,24 +1,126 @@
 from pathlib import Path
-from typing import List
+from typing import Iterator, List, Optional, Set
+
 import pandas as pd
+from loguru import logger
 
+from src.config import CSV_CHUNKSIZE
 from src.domain.camera import CameraDataFromCsv
+from src.domain.region import Region
+
+CAMERA_COLUMNS = ["latitude", "longitude", "url"]
+CAMERA_DTYPES = {"latitude": "float64", "longitude": "float64", "url": "object"}
 
 
 class CameraDataLoader:
-    @staticmethod
-    def load_camera_data(csv_path: Path) -> List[CameraDataFromCsv]:
+    def __init__(
+        self,
+        region: Optional[Region] = None,
+        chunksize: int = CSV_CHUNKSIZE,
+        cache_dir: Optional[Path] = None,
+    ):
+        """
+        :param region: Optional bounding box or radius; cameras outside it are dropped.
+        :param chunksize: Rows read from the csv per chunk.
+        :param cache_dir: Optional folder for a Parquet cache of the cleaned registry (needs pyarrow).
+        """
+        self.region = region
+        self.chunksize = chunksize
+        self.cache_dir = cache_dir
+
+    def load_camera_data(self, csv_path: Path) -> List[CameraDataFromCsv]:
         """
         Load camera data from a CSV file and extract valid unique URLs with coordinates.
         :param csv_path: The Path object to the csv file.
         :return: A list of camera information: lon, lat, url.
         """
-        df = pd.read_csv(csv_path)
-        df = df.dropna(subset=["url"])  # Remove rows where URL is missing
-        df = df.drop_duplicates(subset=["url"])  # Keep only unique URLs
-
         cameras = [
-            CameraDataFromCsv(row["latitude"], row["longitude"], row["url"])
-            for _, row in df.iterrows()
+            camera for chunk in self.iter_camera_data(csv_path) for camera in chunk
         ]
+        logger.info(f"Loaded {len(cameras)} cameras from {csv_path}")
         return cameras
+
+    def iter_camera_data(self, csv_path: Path) -> Iterator[List[CameraDataFromCsv]]:
+        """
+        Stream camera data chunk by chunk so memory stays bounded by the chunk size.
+        URLs are deduplicated across chunks.
+        :param csv_path: The Path object to the csv file.
+        :return: Iterator over lists of cameras.
+        """
+        cached = self._read_cache(csv_path)
+        if cached is not None:
+            yield self._to_cameras(self._filter_region(cached))
+            return
+
+        seen: Set[str] = set()
+        frames = []
+        reader = pd.read_csv(
+            csv_path,
+            usecols=CAMERA_COLUMNS,
+            dtype=CAMERA_DTYPES,
+            chunksize=self.chunksize,
+        )
+        for chunk in reader:
+            chunk = chunk.dropna(subset=["url"])  # Remove rows where URL is missing
+            chunk = chunk.drop_duplicates(subset=["url"])  # Keep only unique URLs
+            chunk = chunk[~chunk["url"].isin(seen)]
+            seen.update(chunk["url"].tolist())
+            if self.cache_dir is not None:
+                frames.append(chunk)
+            yield self._to_cameras(self._filter_region(chunk))
+
+        if self.cache_dir is not None:
+            self._write_cache(csv_path, frames)
+
+    def _filter_region(self, df: pd.DataFrame) -> pd.DataFrame:
+        if self.region is None:
+            return df
+        mask = self.region.mask(df["latitude"].to_numpy(), df["longitude"].to_numpy())
+        return df[mask]
+
+    @staticmethod
+    def _to_cameras(df: pd.DataFrame) -> List[CameraDataFromCsv]:
+        # Column-wise access avoids building a Series per row as iterrows does
+        return [
+            CameraDataFromCsv(latitude, longitude, url)
+            for latitude, longitude, url in zip(
+                df["latitude"].tolist(), df["longitude"].tolist(), df["url"].tolist()
+            )
+        ]
+
+    def _cache_path(self, csv_path: Path) -> Path:
+        # Source size and mtime in the name invalidate the cache when the csv changes
+        stat = csv_path.stat()
+        return (
+            self.cache_dir
+            / f"{csv_path.stem}-{stat.st_size}-{stat.st_mtime_ns}.parquet"
+        )
+
+    def _read_cache(self, csv_path: Path) -> Optional[pd.DataFrame]:
+        if self.cache_dir is None:
+            return None
+        cache_path = self._cache_path(csv_path)
+        if not cache_path.exists():
+            return None
+        try:
+            df = pd.read_parquet(cache_path, columns=CAMERA_COLUMNS)
+        except ImportError as e:
+            logger.warning(f"Parquet cache unavailable: {e}")
+            return None
+        logger.info(f"Loaded cameras from cache {cache_path}")
+        return df
+
+    def _write_cache(self, csv_path: Path, frames: List[pd.DataFrame]) -> None:
+        cache_path = self._cache_path(csv_path)
+        df = (
+            pd.concat(frames, ignore_index=True)
+            if frames
+            else pd.DataFrame(columns=CAMERA_COLUMNS)
+        )
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            df.to_parquet(cache_path, index=False)
+        except ImportError as e:
+            logger.warning(f"Parquet cache unavailable: {e}")
+            return
+        logger.info(f"Cached cleaned camera registry at {cache_path}")
@@ -0,0 +1,242 @@
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+from PIL import Image
+
+from src.config import NUM_CLASSES
+from src.infrastructure.yolo_labels import read_yolo_labels
+
+INDEX_IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp", ".bmp"}
+
+
+def _empty_strings() -> np.ndarray:
+    return np.array([], dtype=str)
+
+
+def _empty_ints() -> np.ndarray:
+    return np.array([], dtype=np.int64)
+
+
+@dataclass
+class DatasetIndex:
+    """
+    Columnar index of an image/label tree, persisted as a NumPy .npz file.
+    One row per image; boxes of all images are stored in one (M, 5) array and image i
+    owns boxes[box_offsets[i]:box_offsets[i + 1]].
+    """
+
+    images: np.ndarray = field(default_factory=_empty_strings)
+    image_sizes: np.ndarray = field(default_factory=_empty_ints)
+    image_mtimes: np.ndarray = field(default_factory=_empty_ints)  # ns
+    widths: np.ndarray = field(default_factory=_empty_ints)
+    heights: np.ndarray = field(default_factory=_empty_ints)
+    hashes: np.ndarray = field(default_factory=_empty_strings)
+    labels: np.ndarray = field(default_factory=_empty_strings)  # "" when missing
+    label_mtimes: np.ndarray = field(default_factory=_empty_ints)  # -1 when missing
+    box_offsets: np.ndarray = field(default_factory=lambda: np.zeros(1, np.int64))
+    boxes: np.ndarray = field(
+        default_factory=lambda: np.zeros((0, 5), dtype=np.float32)
+    )
+
+    @classmethod
+    def load(cls, index_path: Path) -> "DatasetIndex":
+        """
+        Load an index from disk, or return an empty one if it does not exist yet.
+        :param index_path: The .npz index file
+        :return: The index
+        """
+        if not index_path.exists():
+            return cls()
+        with np.load(index_path, allow_pickle=False) as data:
+            return cls(**{name: data[name] for name in data.files})
+
+    def save(self, index_path: Path) -> None:
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write next to the target first so a crash never leaves a truncated index
+        tmp_path = index_path.with_name(f"{index_path.stem}.tmp.npz")
+        np.savez(tmp_path, **self.__dict__)
+        os.replace(tmp_path, index_path)
+
+    def __len__(self) -> int:
+        return len(self.images)
+
+    def boxes_of(self, row: int) -> np.ndarray:
+        return self.boxes[self.box_offsets[row] : self.box_offsets[row + 1]]
+
+    @property
+    def box_counts(self) -> np.ndarray:
+        return np.diff(self.box_offsets)
+
+    def update(self, images_dir: Path, labels_dir: Path) -> "DatasetIndex":
+        """
+        Bring the index in line with the tree. One directory scan per folder gives the
+        mtimes; only images or labels that changed since the last update are read again.
+        :param images_dir: Folder with the images
+        :param labels_dir: Folder with the YOLO label files
+        :return: The updated index (a new object)
+        """
+        with os.scandir(images_dir) as it:
+            image_entries = sorted(
+                (e.path, e.stat())
+                for e in it
+                if e.is_file() and Path(e.name).suffix.lower() in INDEX_IMAGE_SUFFIXES
+            )
+        label_entries: Dict[str, Tuple[str, int]] = {}
+        if labels_dir.exists():
+            with os.scandir(labels_dir) as it:
+                for e in it:
+                    if e.name.endswith(".txt"):
+                        label_entries[Path(e.name).stem] = (
+                            e.path,
+                            e.stat().st_mtime_ns,
+                        )
+
+        previous = {path: row for row, path in enumerate(self.images.tolist())}
+        image_labels = [
+            label_entries.get(Path(path).stem, ("", -1)) for path, _ in image_entries
+        ]
+        rows: List[Optional[int]] = []
+        for (path, stat), (label, label_mtime) in zip(image_entries, image_labels):
+            row = previous.get(path)
+            unchanged = (
+                row is not None
+                and self.image_sizes[row] == stat.st_size
+                and self.image_mtimes[row] == stat.st_mtime_ns
+                and self.labels[row] == label
+                and self.label_mtimes[row] == label_mtime
+            )
+            rows.append(row if unchanged else None)
+
+        stale = [position for position, row in enumerate(rows) if row is None]
+        with ThreadPoolExecutor() as pool:
+            described = pool.map(
+                lambda position: _describe(
+                    image_entries[position][0], image_labels[position][0]
+                ),
+                stale,
+            )
+            fresh = dict(zip(stale, described))
+
+        widths, heights, hashes, boxes = [], [], [], []
+        for position, row in enumerate(rows):
+            if row is None:
+                width, height, digest, image_boxes = fresh[position]
+            else:
+                width, height = int(self.widths[row]), int(self.heights[row])
+                digest, image_boxes = str(self.hashes[row]), self.boxes_of(row)
+            widths.append(width)
+            heights.append(height)
+            hashes.append(digest)
+            boxes.append(image_boxes)
+
+        removed = previous.keys() - {path for path, _ in image_entries}
+        logger.info(
+            f"Dataset index: {len(rows)} images, {len(stale)} (re)indexed, "
+            f"{len(removed)} removed."
+        )
+        counts = np.array([len(b) for b in boxes], dtype=np.int64)
+        return DatasetIndex(
+            images=np.array([path for path, _ in image_entries], dtype=str),
+            image_sizes=np.array(
+                [stat.st_size for _, stat in image_entries], dtype=np.int64
+            ),
+            image_mtimes=np.array(
+                [stat.st_mtime_ns for _, stat in image_entries], dtype=np.int64
+            ),
+            widths=np.array(widths, dtype=np.int64),
+            heights=np.array(heights, dtype=np.int64),
+            hashes=np.array(hashes, dtype=str),
+            labels=np.array([label for label, _ in image_labels], dtype=str),
+            label_mtimes=np.array([mtime for _, mtime in image_labels], dtype=np.int64),
+            box_offsets=np.concatenate([[0], np.cumsum(counts)]).astype(np.int64),
+            boxes=(
+                np.concatenate(boxes).astype(np.float32)
+                if boxes
+                else np.zeros((0, 5), dtype=np.float32)
+            ),
+        )
+
+    # ------------------- Queries -------------------#
+    def pairs(self) -> List[Tuple[Path, Path]]:
+        """
+        :return: (image, label) pairs of all images that have a label file
+        """
+        return [
+            (Path(image), Path(label))
+            for image, label in zip(self.images.tolist(), self.labels.tolist())
+            if label
+        ]
+
+    def missing_labels(self) -> List[Path]:
+        return [Path(p) for p in self.images[self.labels == ""].tolist()]
+
+    def empty_labels(self) -> List[Path]:
+        mask = (self.labels != "") & (self.box_counts == 0)
+        return [Path(p) for p in self.images[mask].tolist()]
+
+    def _known_classes(self, num_classes: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        :param num_classes: Number of classes
+        :return: Class id of every box and a mask of the ids in [0, num_classes)
+        """
+        classes = self.boxes[:, 0].astype(np.int64)
+        known = (classes >= 0) & (classes < num_classes)
+        if not known.all():
+            unknown = np.unique(classes[~known]).tolist()
+            logger.warning(
+                f"Ignoring {np.count_nonzero(~known)} boxes with class ids {unknown} "
+                f"outside of 0..{num_classes - 1}"
+            )
+        return classes, known
+
+    def class_counts(self, num_classes: int = NUM_CLASSES) -> np.ndarray:
+        """
+        :param num_classes: Number of classes
+        :return: Number of boxes per class, ids outside [0, num_classes) are ignored
+        """
+        classes, known = self._known_classes(num_classes)
+        return np.bincount(classes[known], minlength=num_classes)
+
+    def class_count_matrix(self, num_classes: int = NUM_CLASSES) -> np.ndarray:
+        """
+        :param num_classes: Number of classes
+        :return: int32 array (n_images, num_classes) of boxes per image and class, ids
+        outside [0, num_classes) are ignored
+        """
+        matrix = np.zeros((len(self), num_classes), dtype=np.int32)
+        owners = np.repeat(np.arange(len(self)), self.box_counts)
+        classes, known = self._known_classes(num_classes)
+        np.add.at(matrix, (owners[known], classes[known]), 1)
+        return matrix
+
+    def box_size_histogram(self, bins: int = 20) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Histogram of box sizes in pixels (square root of the box area), useful to pick
+        imgsz or tiling settings for small objects.
+        :param bins: Number of bins
+        :return: Counts and bin edges
+        """
+        widths = np.repeat(self.widths, self.box_counts)
+        heights = np.repeat(self.heights, self.box_counts)
+        sizes = np.sqrt(self.boxes[:, 3] * widths * self.boxes[:, 4] * heights)
+        return np.histogram(sizes, bins=bins)
+
+
+def _describe(image_path: str, label_path: str) -> Tuple[int, int, str, np.ndarray]:
+    """
+    Read the expensive columns of one image: dimensions (header only), content hash and boxes.
+    """
+    with Image.open(image_path) as image:
+        width, height = image.size
+    digest = hashlib.blake2b(digest_size=16)
+    with open(image_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    boxes = read_yolo_labels(Path(label_path) if label_path else None)
+    return width, height, digest.hexdigest(), boxes
@@ -1,12 +1,36 @@
-import shutil
 from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
 from loguru import logger
 
-from src.domain.services.dataset_preparer import DatasetPreparer
+from src.config import NUM_CLASSES
+
+from src.domain.services.data_splitter import DatasetSplitter
+from src.domain.services.dataset_preparer import DatasetPreparer, TransferMode
+from src.infrastructure.dataset_index import DatasetIndex
+from src.infrastructure.split_materializer import (
+    Sample,
+    materialize_split,
+    write_list_file,
+    write_split_manifest,
+)
 from src.infrastructure.splitters import SklearnDatasetSplitter
 
 
 class SklearnDatasetPreparer(DatasetPreparer):
+    def __init__(
+        self,
+        splitter: Optional[DatasetSplitter] = None,
+        index_path: Optional[Path] = None,
+    ):
+        """
+        :param splitter: Splitter of the (image, label) pairs, defaults to a random sklearn split.
+        :param index_path: Optional dataset index used to find image-label pairs instead of globbing.
+        """
+        self.splitter = splitter or SklearnDatasetSplitter()
+        self.index_path = index_path
+
     def prepare_ultralytics_dataset(
         self,
         source_images: Path,
@@ -16,21 +40,16 @@ class SklearnDatasetPreparer(DatasetPreparer):
         train_ratio: float,
         val_ratio: float,
         move_files: bool = True,
+        transfer_mode: Optional[TransferMode] = None,
     ) -> None:
-        # Gather all image files
-        image_files = list(source_images.glob("*.*"))
-        if not image_files:
-            logger.warning(f"No images found in {source_images}.")
-            return
+        if transfer_mode is None:
+            transfer_mode = TransferMode.MOVE if move_files else TransferMode.COPY
 
-        # Build list of (image, label) tuples, warn if a label is missing
-        dataset = []
-        for img in image_files:
-            label_file = source_labels / f"{img.stem}.txt"
-            if not label_file.exists():
-                logger.warning(f"Missing label for image {img.name}; skipping.")
-                continue
-            dataset.append((img, label_file))
+        class_counts = None
+        if self.index_path is not None:
+            dataset, class_counts = self._indexed_pairs(source_images, source_labels)
+        else:
+            dataset = self._globbed_pairs(source_images, source_labels)
 
         if not dataset:
             logger.error(
@@ -39,9 +58,8 @@ class SklearnDatasetPreparer(DatasetPreparer):
             return
 
         # Split the dataset
-        splitter = SklearnDatasetSplitter()
-        train_data, val_data, test_data = splitter.split(
-            dataset, train_ratio, val_ratio
+        train_data, val_data, test_data = self.splitter.split(
+            dataset, train_ratio, val_ratio, class_counts=class_counts
         )
         splits = {
             "train": train_data,
@@ -49,29 +67,71 @@ class SklearnDatasetPreparer(DatasetPreparer):
             "test": test_data,  # You might not use test in training
         }
 
+        # The manifest sits next to the images/labels folders
+        write_split_manifest(output_images.parent / "split_manifest.csv", splits)
+
         # Organize files into the split directories
         for split_name, data in splits.items():
             if not data:
                 logger.info(f"No data for split: {split_name}.")
+                # Clear what an earlier run left, or Ultralytics would still use it
+                if transfer_mode == TransferMode.LIST:
+                    (output_images.parent / f"{split_name}.txt").unlink(missing_ok=True)
+                elif transfer_mode == TransferMode.LINK:
+                    materialize_split(
+                        data,
+                        output_images / split_name,
+                        output_labels / split_name,
+                        transfer_mode,
+                    )
+                continue
+
+            if transfer_mode == TransferMode.LIST:
+                list_file = output_images.parent / f"{split_name}.txt"
+                write_list_file(list_file, data)
+                logger.info(
+                    f"Listed {len(data)} items for '{split_name}' split in {list_file}."
+                )
                 continue
 
             split_img_dir = output_images / split_name
             split_lbl_dir = output_labels / split_name
-            split_img_dir.mkdir(parents=True, exist_ok=True)
-            split_lbl_dir.mkdir(parents=True, exist_ok=True)
-
-            for img_file, lbl_file in data:
-                dest_img = split_img_dir / img_file.name
-                dest_lbl = split_lbl_dir / lbl_file.name
-                if move_files:
-                    shutil.move(img_file, dest_img)
-                    shutil.move(lbl_file, dest_lbl)
-                else:
-                    shutil.copy(img_file, dest_img)
-                    shutil.copy(lbl_file, dest_lbl)
+            materialize_split(data, split_img_dir, split_lbl_dir, transfer_mode)
 
             logger.info(
                 f"Prepared {len(data)} items for '{split_name}' split at "
                 f"{split_img_dir} and {split_lbl_dir}."
             )
         logger.info("Dataset preparation completed successfully.")
+
+    @staticmethod
+    def _globbed_pairs(source_images: Path, source_labels: Path) -> List[Sample]:
+        # Gather all image files
+        image_files = list(source_images.glob("*.*"))
+        if not image_files:
+            logger.warning(f"No images found in {source_images}.")
+            return []
+
+        # Build list of (image, label) tuples, warn if a label is missing
+        dataset = []
+        for img in image_files:
+            label_file = source_labels / f"{img.stem}.txt"
+            if not label_file.exists():
+                logger.warning(f"Missing label for image {img.name}; skipping.")
+                continue
+            dataset.append((img, label_file))
+        return dataset
+
+    def _indexed_pairs(
+        self, source_images: Path, source_labels: Path
+    ) -> Tuple[List[Sample], np.ndarray]:
+        """
+        :return: The labelled pairs of the index and their class-count matrix, so the
+        splitter does not read the label files again
+        """
+        index = DatasetIndex.load(self.index_path).update(source_images, source_labels)
+        index.save(self.index_path)
+        for img in index.missing_labels():
+            logger.warning(f"Missing label for image {img.name}; skipping.")
+        labelled = index.labels != ""  # The rows of index.pairs()
+        return index.pairs(), index.class_count_matrix(NUM_CLASSES)[labelled]
@@ -0,0 +1,164 @@
+import os
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+from PIL import Image
+
+from src.infrastructure.dataset_index import DatasetIndex
+
+
+def cached_shape(width: int, height: int, max_side: int) -> Tuple[int, int]:
+    """
+    Size of an image once its longest side is brought down to max_side (never up).
+    :param width: Original width
+    :param height: Original height
+    :param max_side: Longest side kept
+    :return: (height, width) of the resized image
+    """
+    scale = min(1.0, max_side / max(width, height))
+    return max(1, round(height * scale)), max(1, round(width * scale))
+
+
+def decode_resized(path: Path, shape: Tuple[int, int]) -> np.ndarray:
+    """
+    :param path: Image file
+    :param shape: (height, width) to resize to
+    :return: RGB uint8 array of that shape
+    """
+    with Image.open(path) as image:
+        image = image.convert("RGB")
+        if image.size != (shape[1], shape[0]):
+            image = image.resize((shape[1], shape[0]), Image.BILINEAR)
+        return np.asarray(image)
+
+
+class DecodedImageCache:
+    """
+    Decoded, resized images of a DatasetIndex in one flat uint8 memmap shard, so epochs
+    after the first read pixels straight from the page cache instead of decoding JPEGs.
+    Image i owns pixels[offsets[i]:offsets[i + 1]]; a second one-byte-per-image memmap
+    marks which images are filled. Images are filled on first access, from any
+    DataLoader worker: the maps are shared file mappings, so a worker sees what the
+    others wrote. The layout is keyed by image content hash, and unchanged images are
+    carried over when the dataset changes.
+    """
+
+    def __init__(self, cache_dir: Path, index: DatasetIndex, max_side: int):
+        """
+        :param cache_dir: Folder of the shard files.
+        :param index: Index of the images, providing paths, sizes and content hashes.
+        :param max_side: Longest side of the cached images.
+        """
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        stem = cache_dir / f"decoded_{max_side}"
+        self.pixels_path = stem.with_suffix(".u8")
+        self.ready_path = stem.with_suffix(".ready")
+        self.layout_path = stem.with_suffix(".npz")
+        self.images = [Path(p) for p in index.images.tolist()]
+        self.shapes = np.array(
+            [
+                cached_shape(int(w), int(h), max_side)
+                for w, h in zip(index.widths, index.heights)
+            ],
+            dtype=np.int64,
+        ).reshape(-1, 2)
+        sizes = self.shapes.prod(axis=1) * 3
+        self.offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+        self.hashes = index.hashes
+        self._pixels: Optional[np.memmap] = None
+        self._ready: Optional[np.memmap] = None
+        if not self._layout_matches():
+            self._rebuild()
+
+    def __len__(self) -> int:
+        return len(self.images)
+
+    def __getstate__(self) -> Dict:
+        # Workers map the files themselves; a pickled memmap would be a full copy
+        state = self.__dict__.copy()
+        state["_pixels"] = state["_ready"] = None
+        return state
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.offsets[-1])
+
+    @property
+    def filled(self) -> int:
+        self._open()
+        return int(np.count_nonzero(self._ready))
+
+    def _files_exist(self) -> bool:
+        return all(
+            p.exists() for p in (self.layout_path, self.pixels_path, self.ready_path)
+        )
+
+    def _layout_matches(self) -> bool:
+        if not self._files_exist():
+            return False
+        with np.load(self.layout_path, allow_pickle=False) as layout:
+            return np.array_equal(layout["hashes"], self.hashes) and np.array_equal(
+                layout["shapes"], self.shapes
+            )
+
+    def _rebuild(self) -> None:
+        previous: Dict[str, Tuple[int, int]] = {}  # hash -> (offset, size) filled
+        if self._files_exist():
+            with np.load(self.layout_path, allow_pickle=False) as layout:
+                old_ready = np.fromfile(self.ready_path, dtype=np.uint8)
+                for row, digest in enumerate(layout["hashes"].tolist()):
+                    if old_ready[row]:
+                        start, end = layout["offsets"][row : row + 2].tolist()
+                        previous[digest] = (start, end - start)
+
+        pixels_tmp = self.pixels_path.with_suffix(".u8.tmp")
+        ready_tmp = self.ready_path.with_suffix(".ready.tmp")
+        pixels = np.memmap(pixels_tmp, np.uint8, "w+", shape=(max(self.nbytes, 1),))
+        ready = np.memmap(ready_tmp, np.uint8, "w+", shape=(max(len(self), 1),))
+        carried = 0
+        if previous:
+            old_pixels = np.memmap(self.pixels_path, np.uint8, "r")
+            for row, digest in enumerate(self.hashes.tolist()):
+                start, end = self.offsets[row : row + 2].tolist()
+                old_start, size = previous.get(digest, (0, -1))
+                if size == end - start:
+                    pixels[start:end] = old_pixels[old_start : old_start + size]
+                    ready[row] = 1
+                    carried += 1
+            del old_pixels
+        pixels.flush()
+        ready.flush()
+        del pixels, ready
+        os.replace(pixels_tmp, self.pixels_path)
+        os.replace(ready_tmp, self.ready_path)
+        layout_tmp = self.layout_path.with_name(f"{self.layout_path.stem}.tmp.npz")
+        np.savez(
+            layout_tmp, hashes=self.hashes, shapes=self.shapes, offsets=self.offsets
+        )
+        os.replace(layout_tmp, self.layout_path)
+        logger.info(
+            f"Decoded image cache {self.pixels_path}: {len(self)} images, "
+            f"{self.nbytes / 2**30:.2f} GB, {carried} carried over"
+        )
+
+    def _open(self) -> None:
+        if self._pixels is None:
+            self._pixels = np.memmap(self.pixels_path, np.uint8, "r+")
+            self._ready = np.memmap(self.ready_path, np.uint8, "r+")
+
+    def get(self, row: int) -> np.ndarray:
+        """
+        :param row: Index row of the image
+        :return: The resized RGB uint8 image, a view into the shard once filled
+        """
+        self._open()
+        start, end = self.offsets[row], self.offsets[row + 1]
+        height, width = self.shapes[row]
+        if not self._ready[row]:
+            image = decode_resized(self.images[row], (height, width))
+            self._pixels[start:end] = image.reshape(-1)
+            self._ready[row] = 1
+            return image
+        return self._pixels[start:end].reshape(height, width, 3)
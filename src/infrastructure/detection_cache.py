@@ -0,0 +1,228 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Union
+
+import numpy as np
+from loguru import logger
+
+from src.config import DETECTION_CACHE_MAX_MB, DETECTION_CACHE_MEMORY_ITEMS
+from src.domain.detection import Detections
+from src.domain.services.detector import Detector
+from src.infrastructure.capture_manifest import file_sha256
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS detections (
+    key TEXT PRIMARY KEY,
+    boxes BLOB NOT NULL,
+    scores BLOB NOT NULL,
+    classes BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+)
+"""
+EVICT_TO = 0.9  # Eviction frees space down to this fraction of the size bound
+
+
+def image_digest(image: np.ndarray) -> str:
+    """
+    Content hash of decoded pixels, so the same picture hits the cache whatever file
+    format or name it arrived in.
+    :param image: Image array
+    :return: Hex digest
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(image.shape).encode())
+    digest.update(np.ascontiguousarray(image).data)
+    return digest.hexdigest()
+
+
+def model_fingerprint(weights: Union[str, Path]) -> str:
+    """
+    Hash of a model file, or of all files of a model folder (e.g. OpenVINO exports), so
+    retrained weights never reuse results of the old ones.
+    :param weights: Model file or folder
+    :return: Hex digest
+    """
+    weights = Path(weights)
+    if weights.is_file():
+        return file_sha256(weights)
+    digest = hashlib.sha256()
+    for path in sorted(p for p in weights.rglob("*") if p.is_file()):
+        digest.update(path.name.encode())
+        digest.update(file_sha256(path).encode())
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    memory_hits: int
+    disk_hits: int
+    misses: int
+    evictions: int
+    disk_entries: int
+    disk_mb: float
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+
+
+class DetectionCache:
+    """
+    Two-level content-addressed store of detections: an in-memory LRU in front of a
+    SQLite file. The file is bounded in size; when it grows past the bound the least
+    recently used entries are evicted.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        memory_items: int = DETECTION_CACHE_MEMORY_ITEMS,
+        max_disk_mb: float = DETECTION_CACHE_MAX_MB,
+    ):
+        """
+        :param db_path: The SQLite file of the disk store.
+        :param memory_items: Entries kept in the in-memory LRU.
+        :param max_disk_mb: Size bound of the stored detections.
+        """
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.memory_items = memory_items
+        self.max_disk_bytes = int(max_disk_mb * 2**20)
+        self._memory: "OrderedDict[str, Detections]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(SCHEMA)
+        self._connection.commit()
+        self._disk_bytes = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM detections"
+        ).fetchone()[0]
+        self._memory_hits = self._disk_hits = self._misses = self._evictions = 0
+
+    @staticmethod
+    def key(image_hash: str, model_hash: str, conf: float, imgsz: int) -> str:
+        return f"{model_hash[:16]}:{image_hash}:{conf:g}:{imgsz}"
+
+    def get(self, key: str) -> Optional[Detections]:
+        with self._lock:
+            detections = self._memory.get(key)
+            if detections is not None:
+                self._memory.move_to_end(key)
+                self._memory_hits += 1
+                return detections
+            row = self._connection.execute(
+                "SELECT boxes, scores, classes FROM detections WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._misses += 1
+                return None
+            self._connection.execute(
+                "UPDATE detections SET last_access = ? WHERE key = ?",
+                (time.time(), key),
+            )
+            self._connection.commit()
+            self._disk_hits += 1
+            detections = Detections(
+                boxes=np.frombuffer(row[0], dtype=np.float32).reshape(-1, 4),
+                scores=np.frombuffer(row[1], dtype=np.float32),
+                classes=np.frombuffer(row[2], dtype=np.int64),
+            )
+            self._remember(key, detections)
+            return detections
+
+    def put(self, key: str, detections: Detections) -> None:
+        blobs = [
+            detections.boxes.astype(np.float32).tobytes(),
+            detections.scores.astype(np.float32).tobytes(),
+            detections.classes.astype(np.int64).tobytes(),
+        ]
+        size = sum(len(blob) for blob in blobs) + len(key)
+        with self._lock:
+            self._remember(key, detections)
+            previous = self._connection.execute(
+                "SELECT size FROM detections WHERE key = ?", (key,)
+            ).fetchone()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO detections VALUES (?, ?, ?, ?, ?, ?)",
+                (key, *blobs, size, time.time()),
+            )
+            self._disk_bytes += size - (previous[0] if previous else 0)
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict()
+            self._connection.commit()
+
+    def _remember(self, key: str, detections: Detections) -> None:
+        self._memory[key] = detections
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _evict(self) -> None:
+        target = self.max_disk_bytes * EVICT_TO
+        evicted = []
+        for key, size in self._connection.execute(
+            "SELECT key, size FROM detections ORDER BY last_access"
+        ).fetchall():
+            if self._disk_bytes <= target:
+                break
+            evicted.append((key,))
+            self._disk_bytes -= size
+        self._connection.executemany("DELETE FROM detections WHERE key = ?", evicted)
+        self._evictions += len(evicted)
+        logger.debug(f"Evicted {len(evicted)} cached detections")
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            entries = self._connection.execute(
+                "SELECT COUNT(*) FROM detections"
+            ).fetchone()[0]
+            return CacheStats(
+                memory_hits=self._memory_hits,
+                disk_hits=self._disk_hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                disk_entries=entries,
+                disk_mb=self._disk_bytes / 2**20,
+            )
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+class CachedDetector(Detector):
+    """
+    Serves repeated images from a DetectionCache; only the misses of a batch reach the
+    wrapped detector, still in a single predict call.
+    """
+
+    def __init__(self, detector: Detector, cache: DetectionCache, model_hash: str):
+        """
+        :param detector: The detector computing cache misses.
+        :param cache: The detection cache.
+        :param model_hash: Fingerprint of the model weights, part of every key.
+        """
+        self.detector = detector
+        self.cache = cache
+        self.model_hash = model_hash
+
+    def predict(
+        self, images: List[np.ndarray], conf: float, imgsz: int
+    ) -> List[Detections]:
+        keys = [
+            self.cache.key(image_digest(image), self.model_hash, conf, imgsz)
+            for image in images
+        ]
+        results: List[Optional[Detections]] = [self.cache.get(key) for key in keys]
+        misses = [index for index, result in enumerate(results) if result is None]
+        if misses:
+            computed = self.detector.predict([images[i] for i in misses], conf, imgsz)
+            for index, detections in zip(misses, computed):
+                self.cache.put(keys[index], detections)
+                results[index] = detections
+        return results
@@ -0,0 +1,111 @@
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import torch
+from torch.utils.data import Dataset
+
+from src.config import TRAINING_MAX_SIDE
+from src.infrastructure.dataset_index import DatasetIndex
+from src.infrastructure.decoded_image_cache import (
+    DecodedImageCache,
+    cached_shape,
+    decode_resized,
+)
+from src.infrastructure.training_telemetry import StageTimes
+from src.infrastructure.yolo_labels import yolo_to_xyxy
+
+Target = Dict[str, torch.Tensor]
+
+
+class CCTVDetectionDatasetLoader(Dataset):
+    """
+    Images and YOLO labels of a dataset folder as torchvision detection samples: a float
+    CxHxW image in [0, 1] and a target with xyxy pixel `boxes` and `labels` shifted by
+    one, since Faster R-CNN reserves label 0 for the background. Images without a label
+    file are kept as background images with empty targets.
+    """
+
+    def __init__(
+        self,
+        images_dir: Path,
+        labels_dir: Path,
+        transforms: Optional[Callable[[torch.Tensor, Target], Tuple]] = None,
+        cache_dir: Optional[Path] = None,
+        max_side: int = TRAINING_MAX_SIDE,
+    ):
+        """
+        :param images_dir: Folder with the images.
+        :param labels_dir: Folder with the YOLO label files.
+        :param transforms: Optional callable applied to (image, target).
+        :param cache_dir: Optional folder of the dataset index and of a memmap shard of
+        decoded, resized images; epochs after the first then skip JPEG decoding.
+        :param max_side: Images are downscaled to this longest side.
+        """
+        index_path = cache_dir / "dataset_index.npz" if cache_dir else None
+        index = DatasetIndex.load(index_path) if index_path else DatasetIndex()
+        self.index = index.update(images_dir, labels_dir)
+        if index_path:
+            self.index.save(index_path)
+        self.transforms = transforms
+        self.max_side = max_side
+        self.cache = (
+            DecodedImageCache(cache_dir, self.index, max_side) if cache_dir else None
+        )
+        # (image, label) pairs in dataset order, what the dataset splitters work on
+        self.samples: List[Tuple[Path, Optional[Path]]] = [
+            (Path(image), Path(label) if label else None)
+            for image, label in zip(
+                self.index.images.tolist(), self.index.labels.tolist()
+            )
+        ]
+        # Loading versus transform time of the loader workers, read by the telemetry
+        self.stage_times = StageTimes()
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def image(self, idx: int) -> np.ndarray:
+        """
+        :param idx: Sample index
+        :return: The resized RGB uint8 image
+        """
+        if self.cache is not None:
+            return self.cache.get(idx)
+        shape = cached_shape(
+            int(self.index.widths[idx]), int(self.index.heights[idx]), self.max_side
+        )
+        return decode_resized(self.samples[idx][0], shape)
+
+    def target(self, idx: int, width: int, height: int) -> Target:
+        """
+        :param idx: Sample index
+        :param width: Width of the returned image
+        :param height: Height of the returned image
+        :return: Faster R-CNN target of the sample
+        """
+        labels = self.index.boxes_of(idx)
+        boxes = yolo_to_xyxy(labels, width, height)
+        boxes = boxes.clip(0, [width, height, width, height])
+        # Boxes without area make the detection losses NaN
+        keep = (boxes[:, 2] > boxes[:, 0]) & (boxes[:, 3] > boxes[:, 1])
+        boxes = torch.from_numpy(np.ascontiguousarray(boxes[keep], dtype=np.float32))
+        return {
+            "boxes": boxes,
+            "labels": torch.from_numpy(labels[keep, 0].astype(np.int64) + 1),
+            "image_id": torch.tensor(idx),
+            "area": (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1]),
+            "iscrowd": torch.zeros(len(boxes), dtype=torch.int64),
+        }
+
+    def __getitem__(self, idx: int) -> Tuple[torch.Tensor, Target]:
+        with self.stage_times.measure("load"):
+            image = self.image(idx)
+            height, width = image.shape[:2]
+            # The division copies, so transforms never write into the cache shard
+            tensor = torch.from_numpy(np.asarray(image)).permute(2, 0, 1).float() / 255
+            target = self.target(idx, width, height)
+        if self.transforms is not None:
+            with self.stage_times.measure("augment"):
+                tensor, target = self.transforms(tensor, target)
+        return tensor, target
@@ -0,0 +1,140 @@
+import json
+import os
+from pathlib import Path
+from typing import List, Set
+
+from loguru import logger
+
+from src.domain.detection import DetectionRecord
+from src.domain.services.detection_sink import DetectionSink
+
+PARQUET_ROWS_PER_PART = 4096  # Records buffered before a Parquet part is written
+
+
+def record_to_dict(record: DetectionRecord) -> dict:
+    return {
+        "image": record.image_id,
+        "width": record.width,
+        "height": record.height,
+        "boxes": record.detections.boxes.round(2).tolist(),
+        "classes": record.detections.classes.tolist(),
+        "scores": record.detections.scores.round(4).tolist(),
+        "error": record.error,
+    }
+
+
+class JsonlDetectionSink(DetectionSink):
+    """
+    One JSON object per line. Every batch is flushed and fsynced, so after a crash at
+    most the batch in flight is lost; a torn last line is cut off on reopen.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._truncate_partial_line()
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _truncate_partial_line(self) -> None:
+        if not self.path.exists():
+            return
+        with open(self.path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+                logger.warning(f"Dropped a partially written record in {self.path}")
+
+    def completed(self) -> Set[str]:
+        succeeded = {}  # The last record of an image wins
+        with open(self.path, encoding="utf-8") as f:
+            for number, line in enumerate(f, start=1):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping unreadable line {number} of {self.path}")
+                    continue
+                succeeded[record["image"]] = record.get("error") is None
+        return {image for image, ok in succeeded.items() if ok}
+
+    def write(self, records: List[DetectionRecord]) -> None:
+        self._file.write("".join(json.dumps(record_to_dict(r)) + "\n" for r in records))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetDetectionSink(DetectionSink):
+    """
+    A directory of Parquet part files, readable as one dataset by pandas/pyarrow. Parts
+    are written to a hidden temporary name and renamed, so a part is either complete or
+    absent; records buffered since the last part are redone after a crash. Needs pyarrow.
+    """
+
+    def __init__(self, path: Path, rows_per_part: int = PARQUET_ROWS_PER_PART):
+        import pyarrow as pa
+
+        self.path = path
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.rows_per_part = rows_per_part
+        self._buffer: List[dict] = []
+        self._schema = pa.schema(
+            [
+                ("image", pa.string()),
+                ("width", pa.int32()),
+                ("height", pa.int32()),
+                ("boxes", pa.list_(pa.list_(pa.float32(), 4))),
+                ("classes", pa.list_(pa.int64())),
+                ("scores", pa.list_(pa.float32())),
+                ("error", pa.string()),
+            ]
+        )
+
+    def _parts(self) -> List[Path]:
+        return sorted(self.path.glob("part-*.parquet"))
+
+    def completed(self) -> Set[str]:
+        import pyarrow.parquet as pq
+
+        succeeded = {}  # Parts are numbered in write order, the last record wins
+        for part in self._parts():
+            table = pq.read_table(part, columns=["image", "error"]).to_pydict()
+            for image, error in zip(table["image"], table["error"]):
+                succeeded[image] = error is None
+        return {image for image, ok in succeeded.items() if ok}
+
+    def write(self, records: List[DetectionRecord]) -> None:
+        self._buffer.extend(record_to_dict(r) for r in records)
+        if len(self._buffer) >= self.rows_per_part:
+            self._flush()
+
+    def _flush(self) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not self._buffer:
+            return
+        parts = self._parts()
+        index = int(parts[-1].stem.split("-")[1]) + 1 if parts else 0
+        target = self.path / f"part-{index:05d}.parquet"
+        temporary = self.path / f".{target.name}.tmp"
+        table = pa.Table.from_pylist(self._buffer, schema=self._schema)
+        pq.write_table(table, temporary)
+        os.replace(temporary, target)
+        self._buffer = []
+
+    def close(self) -> None:
+        self._flush()
+
+
+def open_detection_sink(path: Path) -> DetectionSink:
+    """
+    Pick the sink from the output path: a '.parquet' path becomes a Parquet dataset
+    directory, anything else is written as JSONL.
+    :param path: Output path
+    :return: The opened sink
+    """
+    if path.suffix == ".parquet":
+        return ParquetDetectionSink(path)
+    return JsonlDetectionSink(path)
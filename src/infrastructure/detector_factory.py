@@ -0,0 +1,60 @@
+from pathlib import Path
+from typing import Optional, Union
+
+from src.config import (
+    INFERENCE_BACKEND,
+    INFERENCE_DEVICE,
+    MODEL_WEIGHTS,
+    ONNX_WEIGHTS,
+    OPENVINO_WEIGHTS,
+)
+from src.domain.services.detector import Detector
+from src.infrastructure.detection_cache import (
+    CachedDetector,
+    DetectionCache,
+    model_fingerprint,
+)
+
+DEFAULT_WEIGHTS = {
+    "ultralytics": MODEL_WEIGHTS,
+    "onnx": ONNX_WEIGHTS,
+    "openvino": OPENVINO_WEIGHTS,
+}
+DETECTOR_BACKENDS = tuple(DEFAULT_WEIGHTS)
+
+
+def build_detector(
+    backend: str = INFERENCE_BACKEND,
+    weights: Optional[Union[str, Path]] = None,
+    device: str = INFERENCE_DEVICE,
+    cache: Optional[DetectionCache] = None,
+) -> Detector:
+    """
+    Create the detector of a backend. Runtimes are imported only when chosen, so a host
+    serving the ONNX model needs neither torch nor ultralytics.
+    :param backend: One of DETECTOR_BACKENDS
+    :param weights: Model file or folder, defaults to the configured artifact of the backend
+    :param device: Device of the ultralytics backend; onnx and openvino run on the CPU
+    :param cache: Optional detection cache serving repeated images
+    :return: The detector
+    """
+    if backend not in DEFAULT_WEIGHTS:
+        raise ValueError(
+            f"Unknown backend {backend}, expected one of {DETECTOR_BACKENDS}"
+        )
+    weights = weights or DEFAULT_WEIGHTS[backend]
+    if backend == "ultralytics":
+        from src.infrastructure.detectors import UltralyticsDetector
+
+        detector = UltralyticsDetector(weights, device=device)
+    elif backend == "onnx":
+        from src.infrastructure.exported_detectors import OnnxRuntimeDetector
+
+        detector = OnnxRuntimeDetector(weights)
+    else:
+        from src.infrastructure.exported_detectors import OpenVinoDetector
+
+        detector = OpenVinoDetector(weights)
+    if cache is None:
+        return detector
+    return CachedDetector(detector, cache, model_fingerprint(weights))
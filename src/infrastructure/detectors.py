@@ -0,0 +1,42 @@
+from pathlib import Path
+from typing import List, Union
+
+import numpy as np
+from ultralytics import YOLO
+
+from src.config import DETECTOR_NMS_IOU, MAX_DETECTIONS
+from src.domain.detection import Detections
+from src.domain.services.detector import Detector
+
+
+class UltralyticsDetector(Detector):
+    def __init__(self, weights: Union[str, Path], device: str = "cpu"):
+        """
+        :param weights: Path to YOLO weights (e.g. best.pt produced by YoloUltralyticsTrainer).
+        :param device: Device the model runs on.
+        """
+        self.weights = weights
+        self.device = device
+        self.model = YOLO(str(weights))
+
+    def predict(
+        self, images: List[np.ndarray], conf: float, imgsz: int
+    ) -> List[Detections]:
+        # Ultralytics reads numpy arrays as BGR
+        results = self.model.predict(
+            source=[np.ascontiguousarray(image[..., ::-1]) for image in images],
+            conf=conf,
+            imgsz=imgsz,
+            iou=DETECTOR_NMS_IOU,
+            max_det=MAX_DETECTIONS,
+            device=self.device,
+            verbose=False,
+        )
+        return [
+            Detections(
+                boxes=result.boxes.xyxy.cpu().numpy().astype(np.float32),
+                scores=result.boxes.conf.cpu().numpy().astype(np.float32),
+                classes=result.boxes.cls.cpu().numpy().astype(np.int64),
+            )
+            for result in results
+        ]
@@ -0,0 +1,221 @@
+from abc import abstractmethod
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image
+
+from src.config import DETECTOR_NMS_IOU, INFERENCE_THREADS, MAX_DETECTIONS
+from src.domain.detection import Detections
+from src.domain.services.box_ops import batched_nms
+from src.domain.services.detector import Detector
+
+LETTERBOX_FILL = 114  # Padding grey used by Ultralytics
+STRIDE = 32  # Input sides of the exported YOLO models must be multiples of this
+
+
+def letterbox(image: np.ndarray, size: int) -> Tuple[np.ndarray, float, np.ndarray]:
+    """
+    Resize keeping the aspect ratio and pad to a size x size square, like Ultralytics does
+    before inference.
+    :param image: RGB HxWx3 uint8 image
+    :param size: Side of the square model input
+    :return: Padded image, scale applied and the (x, y) padding offset
+    """
+    height, width = image.shape[:2]
+    scale = min(size / width, size / height)
+    new_width, new_height = round(width * scale), round(height * scale)
+    resized = np.asarray(
+        Image.fromarray(image).resize((new_width, new_height), Image.BILINEAR)
+    )
+    offset = np.array([(size - new_width) // 2, (size - new_height) // 2])
+    canvas = np.full((size, size, 3), LETTERBOX_FILL, dtype=np.uint8)
+    canvas[offset[1] : offset[1] + new_height, offset[0] : offset[0] + new_width] = (
+        resized
+    )
+    return canvas, scale, offset
+
+
+def decode_yolo_output(
+    output: np.ndarray,
+    conf: float,
+    iou_threshold: float,
+    max_det: int,
+) -> Detections:
+    """
+    Turn the raw head output of one image into detections in model input coordinates.
+    :param output: Array of shape (4 + num_classes, n) with cx, cy, w, h and class scores
+    :param conf: Minimum class score
+    :param iou_threshold: IoU of the class-aware NMS
+    :param max_det: Max detections kept
+    :return: Detections sorted by score
+    """
+    class_scores = output[4:]
+    classes = class_scores.argmax(axis=0)
+    scores = class_scores[classes, np.arange(class_scores.shape[1])]
+    keep = scores > conf
+    centers, sizes = output[:2, keep].T, output[2:4, keep].T
+    boxes = np.concatenate([centers - sizes / 2, centers + sizes / 2], axis=1)
+    scores, classes = scores[keep], classes[keep]
+    selected = batched_nms(boxes, scores, classes, iou_threshold)[:max_det]
+    return Detections(
+        boxes=boxes[selected].astype(np.float32),
+        scores=scores[selected].astype(np.float32),
+        classes=classes[selected].astype(np.int64),
+    )
+
+
+class ExportedYoloDetector(Detector):
+    """
+    Shared pre- and post-processing of YOLO models exported by Ultralytics (ONNX,
+    OpenVINO): letterbox to the model input, one batched forward pass, decode the
+    (batch, 4 + num_classes, anchors) output, NMS and map boxes back to the image.
+    Subclasses only provide the runtime. Neither torch nor ultralytics is needed.
+    """
+
+    def __init__(
+        self,
+        iou_threshold: float = DETECTOR_NMS_IOU,
+        max_det: int = MAX_DETECTIONS,
+    ):
+        self.iou_threshold = iou_threshold
+        self.max_det = max_det
+
+    @property
+    @abstractmethod
+    def input_size(self) -> Optional[int]:
+        """Side of a model with a fixed input shape, None if the shape is dynamic."""
+        pass
+
+    @property
+    def batch_size(self) -> Optional[int]:
+        """Batch of a model with a fixed batch dimension, None if dynamic."""
+        return None
+
+    @abstractmethod
+    def forward(self, batch: np.ndarray) -> np.ndarray:
+        """
+        :param batch: float32 NCHW batch scaled to [0, 1]
+        :return: Raw output of shape (N, 4 + num_classes, anchors)
+        """
+        pass
+
+    def predict(
+        self, images: List[np.ndarray], conf: float, imgsz: int
+    ) -> List[Detections]:
+        if not images:
+            return []
+        size = self.input_size or int(np.ceil(imgsz / STRIDE) * STRIDE)
+        letterboxed = [letterbox(image, size) for image in images]
+        batch = np.stack([canvas for canvas, _, _ in letterboxed])
+        batch = batch.transpose(0, 3, 1, 2).astype(np.float32) / 255.0
+
+        chunk = self.batch_size or len(images)
+        outputs = []
+        for start in range(0, len(images), chunk):
+            part = batch[start : start + chunk]
+            filled = len(part)
+            if filled < chunk:
+                # Models exported with a fixed batch need the last chunk padded
+                padding = np.zeros((chunk - filled, *part.shape[1:]), np.float32)
+                part = np.concatenate([part, padding])
+            outputs.append(self.forward(part)[:filled])
+        outputs = np.concatenate(outputs)
+
+        results = []
+        for output, image, (_, scale, offset) in zip(outputs, images, letterboxed):
+            detections = decode_yolo_output(
+                output, conf, self.iou_threshold, self.max_det
+            )
+            height, width = image.shape[:2]
+            boxes = (detections.boxes - np.tile(offset, 2)) / scale
+            boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, width)
+            boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, height)
+            results.append(
+                Detections(
+                    boxes.astype(np.float32), detections.scores, detections.classes
+                )
+            )
+        return results
+
+
+class OnnxRuntimeDetector(ExportedYoloDetector):
+    def __init__(
+        self,
+        model_path: Union[str, Path],
+        threads: Optional[int] = INFERENCE_THREADS,
+        iou_threshold: float = DETECTOR_NMS_IOU,
+        max_det: int = MAX_DETECTIONS,
+    ):
+        """
+        :param model_path: ONNX model exported from the YOLO weights.
+        :param threads: Intra-op CPU threads, None lets onnxruntime use all cores.
+        :param iou_threshold: IoU of the NMS applied to the raw output.
+        :param max_det: Max detections per image.
+        """
+        import onnxruntime as ort
+
+        super().__init__(iou_threshold, max_det)
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(
+            str(model_path), options, providers=["CPUExecutionProvider"]
+        )
+        model_input = self.session.get_inputs()[0]
+        self._input_name = model_input.name
+        self._shape = model_input.shape
+
+    @property
+    def input_size(self) -> Optional[int]:
+        side = self._shape[2]
+        return side if isinstance(side, int) else None
+
+    @property
+    def batch_size(self) -> Optional[int]:
+        batch = self._shape[0]
+        return batch if isinstance(batch, int) else None
+
+    def forward(self, batch: np.ndarray) -> np.ndarray:
+        return self.session.run(None, {self._input_name: batch})[0]
+
+
+class OpenVinoDetector(ExportedYoloDetector):
+    def __init__(
+        self,
+        model_dir: Union[str, Path],
+        threads: Optional[int] = INFERENCE_THREADS,
+        iou_threshold: float = DETECTOR_NMS_IOU,
+        max_det: int = MAX_DETECTIONS,
+    ):
+        """
+        :param model_dir: OpenVINO model folder exported by Ultralytics (or the .xml file).
+        :param threads: CPU inference threads, None lets OpenVINO decide.
+        :param iou_threshold: IoU of the NMS applied to the raw output.
+        :param max_det: Max detections per image.
+        """
+        import openvino as ov
+
+        super().__init__(iou_threshold, max_det)
+        model_dir = Path(model_dir)
+        xml = model_dir if model_dir.suffix == ".xml" else next(model_dir.glob("*.xml"))
+        core = ov.Core()
+        config = {"PERFORMANCE_HINT": "LATENCY"}
+        if threads:
+            config["INFERENCE_NUM_THREADS"] = threads
+        self.model = core.compile_model(core.read_model(xml), "CPU", config)
+        self._shape = self.model.input(0).get_partial_shape()
+
+    @property
+    def input_size(self) -> Optional[int]:
+        side = self._shape[2]
+        return side.get_length() if side.is_static else None
+
+    @property
+    def batch_size(self) -> Optional[int]:
+        batch = self._shape[0]
+        return batch.get_length() if batch.is_static else None
+
+    def forward(self, batch: np.ndarray) -> np.ndarray:
+        return self.model(batch)[self.model.output(0)]
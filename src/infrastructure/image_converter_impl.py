@@ -1,31 +1,298 @@
+import io
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from PIL import Image
+from typing import Callable, Dict, Iterable, Iterator, Optional, Set, Tuple
+
+from PIL import Image, ImageCms, ImageOps
 from loguru import logger
 import pillow_heif
 
-from src.domain.services.image_converter import ImageConverter
+from src.config import CONVERT_WORKERS, JPEG_QUALITY, TRAINING_MAX_SIDE
+from src.domain.services.image_converter import ConversionReport, ImageConverter
+
+# Lets Image.open decode HEIC/HEIF like any other format
+pillow_heif.register_heif_opener()
+
+NORMALIZE_SUFFIXES = {
+    ".jpg",
+    ".jpeg",
+    ".png",
+    ".webp",
+    ".heic",
+    ".heif",
+    ".bmp",
+    ".tif",
+    ".tiff",
+}
+NORMALIZED_SUFFIX = ".jpg"
+SRGB_PROFILE = ImageCms.createProfile("sRGB")
+
+
+def is_up_to_date(source: Path, target: Path) -> bool:
+    """
+    Check whether a converted file is newer than its source and not empty.
+    :param source: The original file
+    :param target: The converted file
+    :return: True if the conversion can be skipped
+    """
+    if not target.exists():
+        return False
+    target_stat = target.stat()
+    return target_stat.st_size > 0 and target_stat.st_mtime >= source.stat().st_mtime
+
+
+def convert_heic_file(
+    heic_file: Path, output_path: Path, max_side: Optional[int], quality: int
+) -> Optional[str]:
+    """
+    Convert a single HEIC file. Module level so it can run in a worker process.
+    :param heic_file: The HEIC file
+    :param output_path: Destination JPG file
+    :param max_side: Optional longest side to downscale to
+    :param quality: JPEG quality
+    :return: None on success, the error message otherwise
+    """
+    try:
+        # Read the heic file
+        heif_file = pillow_heif.read_heif(heic_file)
+        image = Image.frombytes(heif_file.mode, heif_file.size, heif_file.data)
+        if max_side is not None:
+            image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+        image.save(output_path, format="JPEG", quality=quality)
+        return None
+    except Exception as e:
+        output_path.unlink(missing_ok=True)  # Never leave a truncated JPG behind
+        return str(e)
+
+
+def read_image(path: Path) -> Image.Image:
+    image = Image.open(path)
+    image.load()
+    return image
+
+
+def apply_exif_orientation(image: Image.Image) -> Image.Image:
+    return ImageOps.exif_transpose(image)
+
+
+def convert_to_srgb(image: Image.Image) -> Image.Image:
+    """
+    Drop alpha/palette modes and map embedded ICC profiles (e.g. Display P3 from phones) to sRGB.
+    :param image: Decoded image
+    :return: RGB image in the sRGB colour space
+    """
+    icc_profile = image.info.get("icc_profile")
+    image = image.convert("RGB")
+    if not icc_profile:
+        return image
+    try:
+        source_profile = ImageCms.ImageCmsProfile(io.BytesIO(icc_profile))
+        return ImageCms.profileToProfile(
+            image, source_profile, SRGB_PROFILE, outputMode="RGB"
+        )
+    except (ImageCms.PyCMSError, OSError):
+        return image
+
+
+def resize_to_max_side(image: Image.Image, max_side: int) -> Image.Image:
+    if max(image.size) > max_side:
+        image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+    return image
+
+
+def encode_jpeg(image: Image.Image, quality: int) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def normalize_file(
+    source: Path, target: Path, max_side: int, quality: int
+) -> Tuple[Optional[str], Dict[str, float]]:
+    """
+    Push one image through the normalization stages, timing each stage.
+    :param source: Image file in any supported format
+    :param target: Destination file in the canonical format
+    :param max_side: Longest side to downscale to
+    :param quality: JPEG quality
+    :return: The error message (None on success) and the seconds spent per stage
+    """
+    stages: Iterable[Tuple[str, Callable]] = (
+        ("read", read_image),
+        ("orient", apply_exif_orientation),
+        ("colour", convert_to_srgb),
+        ("resize", partial(resize_to_max_side, max_side=max_side)),
+        ("encode", partial(encode_jpeg, quality=quality)),
+        ("write", target.write_bytes),
+    )
+    timings: Dict[str, float] = {}
+    value = source
+    try:
+        for name, stage in stages:
+            start = time.perf_counter()
+            value = stage(value)
+            timings[name] = time.perf_counter() - start
+        return None, timings
+    except Exception as e:
+        target.unlink(missing_ok=True)
+        return str(e), timings
+
+
+def bounded_map(
+    executor: Executor, fn: Callable, items: Iterable, window: int
+) -> Iterator:
+    """
+    Like Executor.map, but pulls items lazily and keeps at most `window` tasks in flight,
+    so only a few decoded images are ever held in memory.
+    :param executor: Executor running fn
+    :param fn: Function applied to every item
+    :param items: Possibly lazy iterable of items
+    :param window: Max number of submitted but not yet consumed tasks
+    :return: Iterator over (item, result) in input order
+    """
+    pending = deque()
+    for item in items:
+        pending.append((item, executor.submit(fn, *item)))
+        if len(pending) >= window:
+            queued, future = pending.popleft()
+            yield queued, future.result()
+    while pending:
+        queued, future = pending.popleft()
+        yield queued, future.result()
 
 
 class PillowImageConverter(ImageConverter):
-    def convert_heic_to_jpg(self, input_folder: Path, output_folder: Path):
+    def __init__(
+        self,
+        workers: Optional[int] = CONVERT_WORKERS,
+        max_side: Optional[int] = None,
+        quality: int = JPEG_QUALITY,
+        skip_up_to_date: bool = True,
+    ):
         """
-        Convert all HEIC images in a folder to JPG format.
+        :param workers: Worker processes; None uses all cores, 1 converts in-process.
+        :param max_side: Optional longest side (e.g. the training resolution) to downscale to.
+        :param quality: JPEG quality of the converted files.
+        :param skip_up_to_date: Skip files whose JPG is newer than the HEIC.
+        """
+        self.workers = workers
+        self.max_side = max_side
+        self.quality = quality
+        self.skip_up_to_date = skip_up_to_date
+
+    def convert_heic_to_jpg(
+        self, input_folder: Path, output_folder: Path
+    ) -> ConversionReport:
+        """
+        Convert all HEIC images in a folder to JPG format. Failures do not abort the batch,
+        they are collected and reported at the end.
         :param input_folder: Path to input folder
         :param output_folder: Path to output folder
-        :return:
+        :return: Report of converted, skipped and failed files
         """
         # Ensure that output folder exists
         output_folder.mkdir(parents=True, exist_ok=True)
+        report = ConversionReport()
+
+        jobs = []
+        for heic_file in sorted(input_folder.iterdir()):
+            if heic_file.suffix.lower() != ".heic":
+                continue
+            output_path = output_folder / heic_file.with_suffix(".jpg").name
+            if self.skip_up_to_date and is_up_to_date(heic_file, output_path):
+                report.skipped.append(heic_file)
+                continue
+            jobs.append((heic_file, output_path))
 
-        for heic_file in input_folder.glob("*HEIC"):
-            try:
-                # Read the heic file
-                heif_file = pillow_heif.read_heif(heic_file)
-                image = Image.frombytes(heif_file.mode, heif_file.size, heif_file.data)
-                output_path = output_folder / heic_file.with_suffix(".jpg").name
+        convert = partial(
+            convert_heic_file, max_side=self.max_side, quality=self.quality
+        )
+        sources = [heic_file for heic_file, _ in jobs]
+        targets = [output_path for _, output_path in jobs]
+        if self.workers == 1 or len(jobs) <= 1:
+            errors = list(map(convert, sources, targets))
+        else:
+            with ProcessPoolExecutor(self.workers) as pool:
+                errors = list(pool.map(convert, sources, targets, chunksize=8))
 
-                image.save(output_path, format="JPEG")
+        for (heic_file, output_path), error in zip(jobs, errors):
+            if error is None:
+                report.converted.append(heic_file)
                 logger.info(f"Converted: {heic_file} -> {output_path}")
-            except Exception as e:
-                logger.error(f"Failed to convert {heic_file.name}: {e}")
-                raise e
+            else:
+                report.failed.append((heic_file, error))
+
+        logger.info(
+            f"Converted {len(report.converted)}, skipped {len(report.skipped)} "
+            f"up-to-date, failed {len(report.failed)}."
+        )
+        for heic_file, error in report.failed:
+            logger.error(f"Failed to convert {heic_file.name}: {error}")
+        return report
+
+    def normalize_images(
+        self, input_folder: Path, output_folder: Path
+    ) -> ConversionReport:
+        """
+        Stream every supported image through read -> EXIF orientation -> sRGB -> resize ->
+        JPEG encode -> write. A bounded window of images is in flight at once, spread over a
+        thread pool (Pillow releases the GIL while decoding, resizing and encoding).
+        Images are resized to max_side, or TRAINING_MAX_SIDE when it is not set.
+        :param input_folder: Path to input folder
+        :param output_folder: Path to output folder
+        :return: Report of converted, skipped and failed files with per-stage timings
+        """
+        output_folder.mkdir(parents=True, exist_ok=True)
+        report = ConversionReport()
+        workers = self.workers or os.cpu_count() or 1
+        normalize = partial(
+            normalize_file,
+            max_side=self.max_side or TRAINING_MAX_SIDE,
+            quality=self.quality,
+        )
+
+        jobs = self._normalization_jobs(input_folder, output_folder, report)
+        with ThreadPoolExecutor(workers) as pool:
+            for (source, target), (error, timings) in bounded_map(
+                pool, normalize, jobs, window=2 * workers
+            ):
+                for stage, seconds in timings.items():
+                    report.stage_seconds[stage] = (
+                        report.stage_seconds.get(stage, 0.0) + seconds
+                    )
+                if error is None:
+                    report.converted.append(source)
+                else:
+                    report.failed.append((source, error))
+                    logger.error(f"Failed to normalize {source.name}: {error}")
+
+        stage_summary = ", ".join(
+            f"{stage} {seconds:.2f}s" for stage, seconds in report.stage_seconds.items()
+        )
+        logger.info(
+            f"Normalized {len(report.converted)}, skipped {len(report.skipped)} "
+            f"up-to-date, failed {len(report.failed)}. Stage time: {stage_summary}."
+        )
+        return report
+
+    def _normalization_jobs(
+        self, input_folder: Path, output_folder: Path, report: ConversionReport
+    ) -> Iterator[Tuple[Path, Path]]:
+        targets: Set[Path] = set()
+        for source in sorted(input_folder.iterdir()):
+            if source.suffix.lower() not in NORMALIZE_SUFFIXES:
+                continue
+            target = output_folder / f"{source.stem}{NORMALIZED_SUFFIX}"
+            if target in targets:
+                # e.g. IMG_1.HEIC and IMG_1.png would both become IMG_1.jpg
+                report.failed.append((source, f"{target.name} already produced"))
+                continue
+            targets.add(target)
+            if self.skip_up_to_date and is_up_to_date(source, target):
+                report.skipped.append(source)
+                continue
+            yield source, target
@@ -0,0 +1,283 @@
+import csv
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+from PIL import Image
+
+from src.config import DEDUP_HASH, DEDUP_MAX_DISTANCE
+from src.infrastructure.split_materializer import link_files
+
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".webp", ".bmp"}
+PHASH_SIZE = 32  # Side of the grayscale image the DCT runs on
+HASH_SIZE = 8  # 8x8 = 64 bit hashes
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    """
+    Orthonormal DCT-II basis, so that D @ X @ D.T is the 2D DCT of X.
+    :param n: Size of the transform
+    :return: n x n matrix
+    """
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    matrix = np.sqrt(2 / n) * np.cos(np.pi * (2 * i + 1) * k / (2 * n))
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+
+DCT_MATRIX = _dct_matrix(PHASH_SIZE)
+
+
+def pack_hashes(bits: np.ndarray) -> np.ndarray:
+    """
+    Pack boolean hash bits into one unsigned 64-bit integer per image.
+    :param bits: Array of shape (N, 64)
+    :return: Array of shape (N,) with dtype uint64
+    """
+    return np.packbits(bits, axis=1).view(">u8").ravel().astype(np.uint64)
+
+
+def phash(thumbnails: np.ndarray) -> np.ndarray:
+    """
+    Perceptual hash of a batch: low frequency DCT coefficients compared to their median.
+    :param thumbnails: Grayscale float array of shape (N, 32, 32)
+    :return: Hashes of shape (N,) with dtype uint64
+    """
+    coefficients = DCT_MATRIX @ thumbnails @ DCT_MATRIX.T
+    low = coefficients[:, :HASH_SIZE, :HASH_SIZE].reshape(len(thumbnails), -1)
+    # The DC term only encodes mean brightness, keep it out of the median
+    median = np.median(low[:, 1:], axis=1, keepdims=True)
+    return pack_hashes(low > median)
+
+
+def dhash(thumbnails: np.ndarray) -> np.ndarray:
+    """
+    Difference hash of a batch: sign of the horizontal gradient.
+    :param thumbnails: Grayscale float array of shape (N, 8, 9)
+    :return: Hashes of shape (N,) with dtype uint64
+    """
+    bits = thumbnails[:, :, 1:] > thumbnails[:, :, :-1]
+    return pack_hashes(bits.reshape(len(thumbnails), -1))
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree over Hamming distance. Radius queries only descend into
+    children whose edge distance lies within [d - radius, d + radius], so lookup stays
+    far below a linear scan for small radii.
+    """
+
+    def __init__(self):
+        self.root: Optional[Tuple[int, int, Dict]] = None  # (hash, item, children)
+        self.size = 0
+
+    def add(self, value: int, item: int) -> None:
+        self.size += 1
+        if self.root is None:
+            self.root = (value, item, {})
+            return
+        node = self.root
+        while True:
+            distance = (node[0] ^ value).bit_count()
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = (value, item, {})
+                return
+            node = child
+
+    def query(self, value: int, radius: int) -> List[Tuple[int, int]]:
+        """
+        Find all items within the given Hamming radius.
+        :param value: Hash to look up
+        :param radius: Max Hamming distance
+        :return: List of (distance, item) sorted by distance
+        """
+        if self.root is None:
+            return []
+        matches = []
+        stack = [self.root]
+        while stack:
+            node_value, item, children = stack.pop()
+            distance = (node_value ^ value).bit_count()
+            if distance <= radius:
+                matches.append((distance, item))
+            for edge, child in children.items():
+                if distance - radius <= edge <= distance + radius:
+                    stack.append(child)
+        return sorted(matches)
+
+
+@dataclass(frozen=True)
+class DedupDecision:
+    path: Path
+    hash: int
+    keep: bool
+    duplicate_of: Optional[Path] = None
+    distance: Optional[int] = None
+    error: Optional[str] = None  # Set when the image could not be decoded
+
+
+@dataclass
+class DedupReport:
+    decisions: List[DedupDecision] = field(default_factory=list)
+
+    @property
+    def kept(self) -> List[DedupDecision]:
+        return [d for d in self.decisions if d.keep]
+
+    @property
+    def dropped(self) -> List[DedupDecision]:
+        return [d for d in self.decisions if not d.keep and d.error is None]
+
+    @property
+    def failed(self) -> List[DedupDecision]:
+        return [d for d in self.decisions if d.error is not None]
+
+
+class ImageDeduplicator:
+    def __init__(
+        self,
+        hash_method: str = DEDUP_HASH,
+        max_distance: int = DEDUP_MAX_DISTANCE,
+        batch_size: int = 1024,
+        workers: Optional[int] = None,
+    ):
+        """
+        :param hash_method: 'phash' or 'dhash'.
+        :param max_distance: Images within this Hamming distance of a kept image are dropped.
+        :param batch_size: Number of images hashed per vectorized batch.
+        :param workers: Threads decoding images, defaults to the executor default.
+        """
+        if hash_method not in ("phash", "dhash"):
+            raise ValueError(f"Unknown hash method: {hash_method}")
+        self.hash_method = hash_method
+        self.max_distance = max_distance
+        self.batch_size = batch_size
+        self.workers = workers
+
+    def _thumbnail(self, path: Path) -> np.ndarray:
+        size = (PHASH_SIZE, PHASH_SIZE) if self.hash_method == "phash" else (9, 8)
+        with Image.open(path) as image:
+            image = image.convert("L").resize(size, Image.Resampling.LANCZOS)
+            return np.asarray(image, dtype=np.float32)
+
+    def _try_thumbnail(self, path: Path) -> Tuple[Optional[np.ndarray], Optional[str]]:
+        try:
+            return self._thumbnail(path), None
+        except (OSError, ValueError) as e:  # PIL's UnidentifiedImageError is an OSError
+            logger.error(f"Could not hash {path}: {e}")
+            return None, str(e)
+
+    def compute_hashes(
+        self, paths: List[Path]
+    ) -> Tuple[np.ndarray, List[Optional[str]]]:
+        """
+        Hash the images in vectorized batches, decoding them in a thread pool. An image
+        that cannot be decoded gets hash 0 and an error instead of aborting the pass.
+        :param paths: Image files
+        :return: Array of uint64 hashes and the decoding errors, aligned with paths
+        """
+        hash_fn = phash if self.hash_method == "phash" else dhash
+        hashes = np.zeros(len(paths), dtype=np.uint64)
+        errors: List[Optional[str]] = []
+        with ThreadPoolExecutor(self.workers) as pool:
+            for start in range(0, len(paths), self.batch_size):
+                batch = paths[start : start + self.batch_size]
+                results = list(pool.map(self._try_thumbnail, batch))
+                errors += [error for _, error in results]
+                decoded = [
+                    i for i, (thumb, _) in enumerate(results) if thumb is not None
+                ]
+                if decoded:
+                    thumbnails = np.stack([results[i][0] for i in decoded])
+                    hashes[start + np.array(decoded)] = hash_fn(thumbnails)
+        return hashes, errors
+
+    def deduplicate(
+        self,
+        image_dir: Path,
+        report_path: Optional[Path] = None,
+        clean_dir: Optional[Path] = None,
+    ) -> DedupReport:
+        """
+        Keep the first image of every group of near-duplicates and drop the rest.
+        :param image_dir: Folder with the scraped screenshots
+        :param report_path: Optional csv file receiving the keep/drop report
+        :param clean_dir: Optional folder receiving hardlinks of the kept images, or
+        copies where hardlinks are not possible
+        :return: The keep/drop report
+        """
+        paths = sorted(
+            p for p in image_dir.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES
+        )
+        if not paths:
+            logger.warning(f"No images found in {image_dir}.")
+            return DedupReport()
+
+        hashes, errors = self.compute_hashes(paths)
+        tree = BKTree()
+        report = DedupReport()
+        for index, (path, value, error) in enumerate(
+            zip(paths, hashes.tolist(), errors)
+        ):
+            if error is not None:
+                # Neither kept nor a match candidate for later images
+                report.decisions.append(DedupDecision(path, value, False, error=error))
+                continue
+            matches = tree.query(value, self.max_distance)
+            if matches:
+                distance, kept_index = matches[0]
+                report.decisions.append(
+                    DedupDecision(path, value, False, paths[kept_index], distance)
+                )
+            else:
+                tree.add(value, index)
+                report.decisions.append(DedupDecision(path, value, True))
+
+        logger.info(
+            f"Deduplicated {len(paths)} images: kept {len(report.kept)}, "
+            f"dropped {len(report.dropped)} near-duplicates, "
+            f"{len(report.failed)} could not be read."
+        )
+        if report_path is not None:
+            self.write_report(report, report_path)
+        if clean_dir is not None:
+            # Copies, not symlinks, when hardlinks fail: pruning the raw folder must not
+            # break the clean one
+            link_files((d.path for d in report.kept), clean_dir, copy_fallback=True)
+        return report
+
+    @staticmethod
+    def write_report(report: DedupReport, report_path: Path) -> None:
+        """
+        Write the keep/drop decisions to a csv file.
+        :param report: The report to write
+        :param report_path: Destination csv file
+        :return:
+        """
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(report_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(
+                ["path", "hash", "status", "duplicate_of", "distance", "error"]
+            )
+            for d in report.decisions:
+                if d.error is not None:
+                    status = "failed"
+                else:
+                    status = "keep" if d.keep else "drop"
+                writer.writerow(
+                    [
+                        d.path,
+                        "" if d.error is not None else f"{d.hash:016x}",
+                        status,
+                        d.duplicate_of or "",
+                        "" if d.distance is None else d.distance,
+                        d.error or "",
+                    ]
+                )
+        logger.info(f"Dedup report written to {report_path}")
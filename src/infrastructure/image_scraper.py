@@ -1,26 +1,80 @@
+import time
 from pathlib import Path
-from typing import List
+from typing import Callable, List, Optional
 
 from loguru import logger
 from playwright.sync_api import sync_playwright
 
-from src.config import REJECT_ALL, REJECT_ALL_GR
+from src.config import REJECT_ALL, REJECT_ALL_GR, SCRAPER_NAVIGATION_TIMEOUT_MS
 from src.domain.camera import CameraDataFromCsv
+from src.domain.capture import CaptureResult, ScrapeSummary
+from src.infrastructure.page_readiness import PageReadiness, PixelStabilityReadiness
+
+# XPath to match buttons with "Reject all" labels
+REJECT_BUTTON_XPATH = (
+    f"//button[@aria-label='{REJECT_ALL}' or @aria-label='{REJECT_ALL_GR}']"
+)
+
+
+def screenshot_path(output_dir: Path, camera: CameraDataFromCsv) -> Path:
+    """
+    Build the structured screenshot filename for a camera.
+    :param output_dir: Folder where screenshots are saved
+    :param camera: The camera the screenshot belongs to
+    :return: The Path of the screenshot file
+    """
+    return output_dir / f"camera_{camera.latitude}_{camera.longitude}.png"
+
+
+def log_summary(summary: ScrapeSummary) -> None:
+    """
+    Log throughput and failures of a scraping run.
+    :param summary: The summary returned by a scraper
+    :return:
+    """
+    logger.info(
+        f"Scraped {len(summary.succeeded)}/{len(summary.results)} cameras in "
+        f"{summary.elapsed_s:.1f}s ({summary.screenshots_per_min:.1f} screenshots/min)."
+    )
+    logger.info(
+        f"Time to ready: p50 {summary.time_to_ready_percentile(50):.2f}s, "
+        f"p95 {summary.time_to_ready_percentile(95):.2f}s."
+    )
+    for result in summary.failed:
+        logger.warning(f"Failed: {result.camera.url} - {result.error}")
 
 
 class ImageScraper:
-    def __init__(self, output_dir: Path, headless: bool = False):
+    def __init__(
+        self,
+        output_dir: Path,
+        headless: bool = False,
+        readiness: Optional[PageReadiness] = None,
+    ):
+        """
+        :param output_dir: Folder where screenshots are saved.
+        :param headless: Run the browser without a window.
+        :param readiness: Strategy deciding when a page is ready for the screenshot.
+        """
         self.output_dir = output_dir
         self.headless = headless
+        self.readiness = readiness or PixelStabilityReadiness()
 
-    def scrape_images(self, cameras: List[CameraDataFromCsv]) -> None:
+    def scrape_images(
+        self,
+        cameras: List[CameraDataFromCsv],
+        on_result: Optional[Callable[[CaptureResult], None]] = None,
+    ) -> ScrapeSummary:
         """
         Capture screenshots from given URLs and save them with structured filenames.
         :param cameras: List of urls from csv file
-        :return:
+        :param on_result: Called with every capture result as soon as it is known
+        :return: Summary of the run with per-camera results
         """
         self.output_dir.mkdir(parents=True, exist_ok=True)
         cookies_rejected = False  # Track if cookies have already been rejected
+        summary = ScrapeSummary()
+        start = time.perf_counter()
 
         with sync_playwright() as p:
             browser = p.chromium.launch(headless=self.headless)
@@ -28,28 +82,18 @@ class ImageScraper:
             page = context.new_page()
 
             for camera in cameras:
-                filename = (
-                    self.output_dir / f"camera_{camera.latitude}_{camera.longitude}.png"
-                )
+                filename = screenshot_path(self.output_dir, camera)
                 try:
                     page.goto(
-                        camera.url, timeout=20000
+                        camera.url, timeout=SCRAPER_NAVIGATION_TIMEOUT_MS
                     )  # Allow more time for page navigation
 
                     if not cookies_rejected:
-                        # XPath to match buttons with "Reject all"labels
-                        reject_button_xpath = (
-                            "//button[@aria-label="
-                            + REJECT_ALL
-                            + " or @aria-label="
-                            + REJECT_ALL_GR
-                            + "]"
-                        )
                         try:
                             # Wait for the "Reject all" button (if it exists)
-                            page.wait_for_selector(reject_button_xpath, timeout=5000)
+                            page.wait_for_selector(REJECT_BUTTON_XPATH, timeout=5000)
                             # Click the "Reject all" button
-                            page.click(reject_button_xpath)
+                            page.click(REJECT_BUTTON_XPATH)
                             # Allow the page to load after rejecting cookies
                             page.wait_for_load_state("networkidle")
                             cookies_rejected = True  # Mark cookies as rejected
@@ -63,13 +107,25 @@ class ImageScraper:
                     page.wait_for_load_state(
                         "networkidle"
                     )  # Wait for the network to go idle
-                    page.wait_for_timeout(
-                        5000
-                    )  # Wait for an additional 5 seconds as a buffer
+                    # Wait until the view is rendered, bounded by the readiness timeout
+                    time_to_ready = self.readiness.wait(page)
+                    logger.info(f"Ready after {time_to_ready:.2f}s: {camera.url}")
 
                     page.screenshot(path=str(filename))
                     logger.success(f"Saved: {filename}")
+                    result = CaptureResult(
+                        camera, filename, time_to_ready_s=time_to_ready
+                    )
                 except Exception as e:
                     logger.error(f"Failed: {camera.url} - {e}")
+                    result = CaptureResult(camera, None, str(e))
+
+                summary.results.append(result)
+                if on_result is not None:
+                    on_result(result)
 
             browser.close()
+
+        summary.elapsed_s = time.perf_counter() - start
+        log_summary(summary)
+        return summary
@@ -0,0 +1,42 @@
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+from loguru import logger
+
+from src.config import EXPORT_FORMATS, INFERENCE_IMGSZ
+
+
+def export_yolo(
+    weights: Path,
+    formats: Sequence[str] = EXPORT_FORMATS,
+    imgsz: int = INFERENCE_IMGSZ,
+    int8: bool = False,
+    data_config: Optional[Path] = None,
+) -> Dict[str, Path]:
+    """
+    Export trained YOLO weights to CPU-friendly inference formats next to the weights.
+    ONNX is exported with dynamic batch and input size so one artifact serves every
+    batch size; OpenVINO can additionally be quantized to INT8 by Ultralytics (NNCF),
+    which needs the data config for calibration images.
+    :param weights: The trained .pt file, e.g. best.pt
+    :param formats: Any of 'onnx' and 'openvino'
+    :param imgsz: Input size of the exported model
+    :param int8: Quantize the OpenVINO model to INT8
+    :param data_config: data.yaml of the dataset, required with int8
+    :return: Path of the artifact per format
+    """
+    from ultralytics import YOLO
+
+    if int8 and data_config is None:
+        raise ValueError("INT8 export needs a data config for calibration")
+    model = YOLO(str(weights))
+    artifacts = {}
+    for export_format in formats:
+        options = {"format": export_format, "imgsz": imgsz}
+        if export_format == "onnx":
+            options.update(dynamic=True, simplify=True)
+        elif export_format == "openvino" and int8:
+            options.update(int8=True, data=str(data_config))
+        artifacts[export_format] = Path(model.export(**options))
+        logger.info(f"Exported {weights} to {artifacts[export_format]}")
+    return artifacts
@@ -0,0 +1,115 @@
+import json
+import os
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from loguru import logger
+
+from src.domain.model_version import ModelVersion
+
+
+class ModelRegistry:
+    """
+    Named, versioned pointers to model weights, stored as one JSON file so the training
+    process can publish a new version and serving processes can pick it up. Each name
+    has one active version; writes replace the file atomically.
+    """
+
+    def __init__(self, path: Path):
+        """
+        :param path: The registry JSON file, created on the first registration.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict:
+        if not self.path.exists():
+            return {"active": {}, "versions": []}
+        return json.loads(self.path.read_text())
+
+    def _write(self, data: Dict) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(data, indent=2))
+        os.replace(temporary, self.path)
+
+    @property
+    def modified_at(self) -> float:
+        return self.path.stat().st_mtime if self.path.exists() else 0.0
+
+    def versions(self, name: str) -> List[ModelVersion]:
+        return [
+            ModelVersion(**entry)
+            for entry in self._read()["versions"]
+            if entry["name"] == name
+        ]
+
+    def register(
+        self,
+        name: str,
+        weights: Union[str, Path],
+        backend: str = "ultralytics",
+        activate: bool = True,
+    ) -> ModelVersion:
+        """
+        Add a new version of a model.
+        :param name: Model name
+        :param weights: Model file or folder
+        :param backend: Backend able to load the weights
+        :param activate: Make it the version that is served
+        :return: The new version
+        """
+        with self._lock:
+            data = self._read()
+            previous = [e["version"] for e in data["versions"] if e["name"] == name]
+            entry = ModelVersion(
+                name=name,
+                version=max(previous, default=0) + 1,
+                weights=str(Path(weights).resolve()),
+                backend=backend,
+                registered_at=time.time(),
+            )
+            data["versions"].append(asdict(entry))
+            if activate:
+                data["active"][name] = entry.version
+            self._write(data)
+        logger.info(f"Registered {name} v{entry.version} ({backend}): {entry.weights}")
+        return entry
+
+    def ensure(
+        self, name: str, weights: Union[str, Path], backend: str = "ultralytics"
+    ) -> ModelVersion:
+        """
+        Register the weights as the first version of a model that has none yet.
+        :return: The active version
+        """
+        if not self.versions(name):
+            self.register(name, weights, backend)
+        return self.resolve(name)
+
+    def activate(self, name: str, version: int) -> ModelVersion:
+        with self._lock:
+            data = self._read()
+            if not any(
+                e["name"] == name and e["version"] == version for e in data["versions"]
+            ):
+                raise KeyError(f"{name} has no version {version}")
+            data["active"][name] = version
+            self._write(data)
+        return self.resolve(name, version)
+
+    def resolve(self, name: str, version: Optional[int] = None) -> ModelVersion:
+        """
+        :param name: Model name
+        :param version: Specific version, defaults to the active one
+        :return: The model version
+        """
+        data = self._read()
+        version = version or data["active"].get(name)
+        for entry in data["versions"]:
+            if entry["name"] == name and entry["version"] == version:
+                return ModelVersion(**entry)
+        raise KeyError(f"No model {name} v{version} in {self.path}")
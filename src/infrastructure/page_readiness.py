@@ -0,0 +1,158 @@
+import asyncio
+import io
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import numpy as np
+from loguru import logger
+from PIL import Image
+from playwright.async_api import Page as AsyncPage
+from playwright.sync_api import Page
+
+from src.config import SCRAPER_READY_TIMEOUT_MS
+
+# True once every <img> has finished loading/decoding and every <canvas> has a size
+MEDIA_DECODED_JS = """
+() => Array.from(document.images).every(img => img.complete)
+   && Array.from(document.querySelectorAll('canvas')).every(c => c.width > 0 && c.height > 0)
+"""
+
+
+class PageReadiness(ABC):
+    """
+    Decides when a page is ready to be screenshotted. Implementations return as soon
+    as the page is ready and never wait longer than timeout_ms.
+    """
+
+    def __init__(self, timeout_ms: int = SCRAPER_READY_TIMEOUT_MS):
+        self.timeout_ms = timeout_ms
+
+    def wait(self, page: Page) -> float:
+        """
+        Block until the page is ready or the upper bound is reached.
+        :param page: Playwright sync page
+        :return: Time to ready in seconds
+        """
+        start = time.perf_counter()
+        try:
+            self._wait(page)
+        except Exception as e:
+            logger.warning(f"Readiness not reached within {self.timeout_ms}ms: {e}")
+        return time.perf_counter() - start
+
+    async def wait_async(self, page: AsyncPage) -> float:
+        """
+        Async variant of wait for the concurrent scraper.
+        :param page: Playwright async page
+        :return: Time to ready in seconds
+        """
+        start = time.perf_counter()
+        try:
+            await self._wait_async(page)
+        except Exception as e:
+            logger.warning(f"Readiness not reached within {self.timeout_ms}ms: {e}")
+        return time.perf_counter() - start
+
+    @abstractmethod
+    def _wait(self, page: Page) -> None:
+        pass
+
+    @abstractmethod
+    async def _wait_async(self, page: AsyncPage) -> None:
+        pass
+
+
+class FixedDelayReadiness(PageReadiness):
+    """The original behaviour: always wait the full timeout."""
+
+    def _wait(self, page: Page) -> None:
+        page.wait_for_timeout(self.timeout_ms)
+
+    async def _wait_async(self, page: AsyncPage) -> None:
+        await page.wait_for_timeout(self.timeout_ms)
+
+
+class SelectorReadiness(PageReadiness):
+    def __init__(self, selector: str, timeout_ms: int = SCRAPER_READY_TIMEOUT_MS):
+        """
+        :param selector: CSS or XPath selector that becomes visible once the view is rendered.
+        :param timeout_ms: Upper bound of the wait in ms.
+        """
+        super().__init__(timeout_ms)
+        self.selector = selector
+
+    def _wait(self, page: Page) -> None:
+        page.wait_for_selector(self.selector, state="visible", timeout=self.timeout_ms)
+
+    async def _wait_async(self, page: AsyncPage) -> None:
+        await page.wait_for_selector(
+            self.selector, state="visible", timeout=self.timeout_ms
+        )
+
+
+class MediaDecodedReadiness(PageReadiness):
+    """Ready once all images have finished decoding and all canvases are sized."""
+
+    def _wait(self, page: Page) -> None:
+        page.wait_for_function(MEDIA_DECODED_JS, timeout=self.timeout_ms)
+
+    async def _wait_async(self, page: AsyncPage) -> None:
+        await page.wait_for_function(MEDIA_DECODED_JS, timeout=self.timeout_ms)
+
+
+class PixelStabilityReadiness(PageReadiness):
+    def __init__(
+        self,
+        timeout_ms: int = SCRAPER_READY_TIMEOUT_MS,
+        interval_ms: int = 250,
+        threshold: float = 1.0,
+        thumbnail_size: int = 64,
+    ):
+        """
+        Ready once two consecutive cheap low-res captures are (almost) identical.
+        :param timeout_ms: Upper bound of the wait in ms.
+        :param interval_ms: Pause between two probe captures in ms.
+        :param threshold: Max mean absolute grayscale difference (0-255) counted as stable.
+        :param thumbnail_size: Side of the grayscale thumbnail the captures are compared at.
+        """
+        super().__init__(timeout_ms)
+        self.interval_ms = interval_ms
+        self.threshold = threshold
+        self.thumbnail_size = thumbnail_size
+
+    def _thumbnail(self, screenshot: bytes) -> np.ndarray:
+        image = Image.open(io.BytesIO(screenshot)).convert("L")
+        image = image.resize((self.thumbnail_size, self.thumbnail_size))
+        return np.asarray(image, dtype=np.float32)
+
+    def _is_stable(self, previous: Optional[np.ndarray], current: np.ndarray) -> bool:
+        if previous is None:
+            return False
+        return float(np.abs(current - previous).mean()) <= self.threshold
+
+    def _wait(self, page: Page) -> None:
+        deadline = time.perf_counter() + self.timeout_ms / 1000
+        previous = None
+        while time.perf_counter() < deadline:
+            current = self._thumbnail(
+                page.screenshot(type="jpeg", quality=30, scale="css")
+            )
+            if self._is_stable(previous, current):
+                return
+            previous = current
+            page.wait_for_timeout(self.interval_ms)
+        raise TimeoutError("page never became visually stable")
+
+    async def _wait_async(self, page: AsyncPage) -> None:
+        deadline = time.perf_counter() + self.timeout_ms / 1000
+        previous = None
+        while time.perf_counter() < deadline:
+            current = self._thumbnail(
+                await page.screenshot(type="jpeg", quality=30, scale="css")
+            )
+            if self._is_stable(previous, current):
+                return
+            previous = current
+            await asyncio.sleep(self.interval_ms / 1000)
+        raise TimeoutError("page never became visually stable")
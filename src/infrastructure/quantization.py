@@ -0,0 +1,133 @@
+import re
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence
+
+import numpy as np
+import onnx
+import onnxruntime as ort
+from loguru import logger
+from onnxruntime.quantization import (
+    CalibrationDataReader,
+    CalibrationMethod,
+    QuantFormat,
+    QuantType,
+    quantize_static,
+)
+from onnxruntime.quantization.shape_inference import quant_pre_process
+from PIL import Image
+
+from src.config import INFERENCE_IMGSZ
+from src.infrastructure.exported_detectors import letterbox
+
+MODULE_INDEX = re.compile(r"^/model\.(\d+)/")  # Node names of Ultralytics exports
+
+
+class LetterboxCalibrationReader(CalibrationDataReader):
+    """
+    Feeds calibration images to onnxruntime exactly as the detector pre-processes them,
+    one image at a time, so only a single decoded image is in memory.
+    """
+
+    def __init__(self, images: Sequence[Path], input_name: str, imgsz: int):
+        self.images = images
+        self.input_name = input_name
+        self.imgsz = imgsz
+        self._iterator: Optional[Iterator[dict]] = None
+
+    def _batches(self) -> Iterator[dict]:
+        for path in self.images:
+            image = np.array(Image.open(path).convert("RGB"))
+            canvas, _, _ = letterbox(image, self.imgsz)
+            batch = canvas.transpose(2, 0, 1)[None].astype(np.float32) / 255.0
+            yield {self.input_name: batch}
+
+    def get_next(self) -> Optional[dict]:
+        if self._iterator is None:
+            self._iterator = self._batches()
+        return next(self._iterator, None)
+
+    def rewind(self) -> None:
+        self._iterator = None
+
+
+def detection_head_nodes(model_path: Path) -> List[str]:
+    """
+    Nodes of the last module of an Ultralytics export, i.e. the detection head decoding
+    boxes (DFL, anchor grid, concat of box and class outputs). Its outputs mix pixel
+    coordinates and probabilities in one tensor, which one INT8 scale cannot represent.
+    :param model_path: The FP32 ONNX model
+    :return: Names of the nodes to keep in float
+    """
+    nodes = onnx.load(str(model_path), load_external_data=False).graph.node
+    indices = [
+        (int(match.group(1)), node.name)
+        for node in nodes
+        if (match := MODULE_INDEX.match(node.name))
+    ]
+    if not indices:
+        return []
+    head = max(index for index, _ in indices)
+    return [name for index, name in indices if index == head]
+
+
+def quantize_onnx_int8(
+    fp32_path: Path,
+    int8_path: Path,
+    calibration_images: Sequence[Path],
+    imgsz: int = INFERENCE_IMGSZ,
+    method: str = "minmax",
+    per_channel: bool = True,
+    keep_head_float: bool = True,
+) -> Path:
+    """
+    Static post-training INT8 quantization of an ONNX model. Activation ranges are
+    calibrated on real images; weights are quantized per channel. The QDQ format keeps
+    the graph portable across execution providers.
+    :param fp32_path: The FP32 ONNX model
+    :param int8_path: Where the quantized model is written
+    :param calibration_images: Images the activation ranges are calibrated on
+    :param imgsz: Side of the calibration inputs
+    :param method: Calibration method: minmax, entropy or percentile
+    :param per_channel: Quantize weights per output channel
+    :param keep_head_float: Keep the detection head in float for box precision
+    :return: int8_path
+    """
+    methods = {
+        "minmax": CalibrationMethod.MinMax,
+        "entropy": CalibrationMethod.Entropy,
+        "percentile": CalibrationMethod.Percentile,
+    }
+    int8_path.parent.mkdir(parents=True, exist_ok=True)
+    # Shape inference and graph optimization first, as onnxruntime recommends
+    prepared = int8_path.with_name(f"{int8_path.stem}_prepared.onnx")
+    try:
+        quant_pre_process(str(fp32_path), str(prepared))
+        input_name = (
+            ort.InferenceSession(str(prepared), providers=["CPUExecutionProvider"])
+            .get_inputs()[0]
+            .name
+        )
+        excluded = detection_head_nodes(prepared) if keep_head_float else []
+        logger.info(
+            f"Calibrating INT8 ranges on {len(calibration_images)} images ({method}), "
+            f"{len(excluded)} head nodes kept in float"
+        )
+        quantize_static(
+            str(prepared),
+            str(int8_path),
+            LetterboxCalibrationReader(calibration_images, input_name, imgsz),
+            quant_format=QuantFormat.QDQ,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+            per_channel=per_channel,
+            calibrate_method=methods[method],
+            nodes_to_exclude=excluded,
+        )
+    finally:
+        prepared.unlink(missing_ok=True)
+    logger.info(
+        f"INT8 model written to {int8_path} "
+        f"({fp32_path.stat().st_size / 2**20:.1f} MB -> "
+        f"{int8_path.stat().st_size / 2**20:.1f} MB)"
+    )
+    return int8_path
@@ -0,0 +1,141 @@
+import csv
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence, Set, Tuple
+
+from loguru import logger
+
+from src.domain.services.dataset_preparer import TransferMode
+
+Sample = Tuple[Path, Optional[Path]]  # (image, label)
+
+
+def link_file(source: Path, target: Path, copy_fallback: bool = False) -> None:
+    """
+    Hardlink a file, falling back to an absolute symlink (e.g. across devices).
+    Existing targets that already point at the source are left untouched.
+    :param source: The original file
+    :param target: The link to create
+    :param copy_fallback: Copy instead of symlinking when a hardlink is not possible,
+    so the target outlives the source
+    :return:
+    """
+    if target.is_symlink() or target.exists():
+        if target.exists() and os.path.samefile(source, target):
+            return
+        target.unlink()
+    try:
+        os.link(source, target)
+    except OSError:
+        if copy_fallback:
+            shutil.copy2(source, target)
+        else:
+            target.symlink_to(source.resolve())
+
+
+def link_files(
+    paths: Iterable[Path], destination: Path, copy_fallback: bool = False
+) -> None:
+    """
+    Link files into a folder with link_file.
+    :param paths: Files to link
+    :param destination: Target folder
+    :param copy_fallback: Copy files that cannot be hardlinked instead of symlinking
+    :return:
+    """
+    destination.mkdir(parents=True, exist_ok=True)
+    for path in paths:
+        link_file(path, destination / path.name, copy_fallback)
+
+
+def transfer_file(source: Path, target: Path, mode: TransferMode) -> None:
+    if mode == TransferMode.MOVE:
+        shutil.move(source, target)
+    elif mode == TransferMode.COPY:
+        shutil.copy(source, target)
+    elif mode == TransferMode.LINK:
+        link_file(source, target)
+    else:
+        raise ValueError(f"{mode} does not place files in split folders")
+
+
+def remove_stale_links(directory: Path, keep: Set[str]) -> int:
+    """
+    Remove links left over from a previous split. Regular files that are the only copy of
+    their data (e.g. produced by a MOVE split) are never deleted.
+    :param directory: A split folder
+    :param keep: File names that belong to the new split
+    :return: Number of removed links
+    """
+    removed = 0
+    for entry in directory.iterdir():
+        if entry.name in keep:
+            continue
+        if entry.is_symlink() or (entry.is_file() and entry.stat().st_nlink > 1):
+            entry.unlink()
+            removed += 1
+    return removed
+
+
+def materialize_split(
+    samples: Sequence[Sample],
+    images_dir: Path,
+    labels_dir: Path,
+    mode: TransferMode,
+) -> None:
+    """
+    Place the images and labels of one split into its folders.
+    :param samples: (image, label) pairs of the split; label may be None
+    :param images_dir: Folder of the split images
+    :param labels_dir: Folder of the split labels
+    :param mode: MOVE, COPY or LINK
+    :return:
+    """
+    images_dir.mkdir(parents=True, exist_ok=True)
+    labels_dir.mkdir(parents=True, exist_ok=True)
+    if mode == TransferMode.LINK:
+        removed = remove_stale_links(images_dir, {img.name for img, _ in samples})
+        removed += remove_stale_links(
+            labels_dir, {lbl.name for _, lbl in samples if lbl is not None}
+        )
+        if removed:
+            logger.info(f"Removed {removed} stale links from {images_dir.parent.name}.")
+
+    for img_file, lbl_file in samples:
+        transfer_file(img_file, images_dir / img_file.name, mode)
+        if lbl_file is not None:
+            transfer_file(lbl_file, labels_dir / lbl_file.name, mode)
+
+
+def write_list_file(list_path: Path, samples: Sequence[Sample]) -> None:
+    """
+    Write an Ultralytics image list file. Ultralytics finds each label by replacing the
+    'images' path segment of the image with 'labels'.
+    :param list_path: Destination txt file
+    :param samples: (image, label) pairs of the split
+    :return:
+    """
+    list_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(list_path, "w") as f:
+        for img_file, _ in samples:
+            f.write(f"{img_file.resolve()}\n")
+
+
+def write_split_manifest(
+    manifest_path: Path, splits: Dict[str, Sequence[Sample]]
+) -> None:
+    """
+    Record which split every sample belongs to.
+    :param manifest_path: Destination csv file
+    :param splits: Split name to (image, label) pairs
+    :return:
+    """
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(manifest_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["image", "label", "split"])
+        for split_name, samples in splits.items():
+            for img_file, lbl_file in samples:
+                writer.writerow([img_file, lbl_file or "", split_name])
+    logger.info(f"Split manifest written to {manifest_path}")
@@ -1,17 +1,154 @@
+import re
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
 from sklearn.model_selection import train_test_split
 
+from src.config import NUM_CLASSES, SPLIT_SEED
 from src.domain.services.data_splitter import DatasetSplitter
+from src.infrastructure.yolo_labels import class_count_matrix
+
+# Screenshots are named camera_{lat}_{lon}.png, optionally followed by a suffix
+CAMERA_NAME = re.compile(r"^camera_(-?\d+(?:\.\d+)?)_(-?\d+(?:\.\d+)?)")
 
 
 class SklearnDatasetSplitter(DatasetSplitter):
-    def split(self, dataset, train_ratio: float, val_ratio: float):
+    def __init__(self, random_state: int = SPLIT_SEED):
+        """
+        :param random_state: Seed of the random splits.
+        """
+        self.random_state = random_state
+
+    def split(self, dataset, train_ratio: float, val_ratio: float, class_counts=None):
         train_data, temp_data = train_test_split(
-            dataset, train_size=train_ratio, random_state=42
+            dataset, train_size=train_ratio, random_state=self.random_state
         )
 
         # Compute the validation size as a fraction of the remaining data.
         val_size = val_ratio / (1 - train_ratio)
         val_data, test_data = train_test_split(
-            temp_data, train_size=val_size, random_state=42
+            temp_data, train_size=val_size, random_state=self.random_state
         )
         return train_data, val_data, test_data
+
+
+def camera_group(image_path: Path) -> str:
+    """
+    Group key of an image: its camera coordinate when the name carries one, else its stem.
+    :param image_path: The image file
+    :return: Group key
+    """
+    match = CAMERA_NAME.match(image_path.stem)
+    if match is None:
+        return image_path.stem
+    return f"{float(match.group(1))}_{float(match.group(2))}"
+
+
+class StratifiedGroupSplitter(DatasetSplitter):
+    """
+    Splits (image, label) pairs so that every class is represented in each split in
+    proportion to the ratios, while all images of the same camera location stay in the
+    same split. Uses iterative stratification (Sechidis et al., 2011) over camera groups:
+    the rarest remaining class is distributed first, each group going to the split that
+    still needs that class the most.
+    """
+
+    def __init__(
+        self,
+        num_classes: int = NUM_CLASSES,
+        random_state: int = SPLIT_SEED,
+        workers: Optional[int] = None,
+    ):
+        """
+        :param num_classes: Number of label classes.
+        :param random_state: Seed used to break ties.
+        :param workers: Processes parsing the label files, None uses all cores.
+        """
+        self.num_classes = num_classes
+        self.random_state = random_state
+        self.workers = workers
+
+    def split(
+        self,
+        dataset: Sequence[Tuple[Path, Optional[Path]]],
+        train_ratio: float,
+        val_ratio: float,
+        class_counts: Optional[np.ndarray] = None,
+    ) -> Tuple[List, List, List]:
+        if not dataset:
+            return [], [], []
+        if class_counts is None:
+            counts = class_count_matrix(
+                [label for _, label in dataset], self.num_classes, self.workers
+            )
+        else:
+            counts = np.asarray(class_counts)
+        keys = [camera_group(Path(image)) for image, _ in dataset]
+        _, group_ids = np.unique(keys, return_inverse=True)
+        ratios = np.array([train_ratio, val_ratio, 1 - train_ratio - val_ratio])
+        assignment = self.assign_groups(counts, group_ids, ratios)
+
+        splits = ([], [], [])
+        for item, split_index in zip(dataset, assignment):
+            splits[split_index].append(item)
+        for split_index, name in enumerate(("train", "val", "test")):
+            logger.info(
+                f"{name}: {len(splits[split_index])} images "
+                f"(target {max(ratios[split_index], 0):.0%}), class counts "
+                f"{counts[assignment == split_index].sum(0).tolist()}"
+            )
+        return splits[0], splits[1], splits[2]
+
+    def assign_groups(
+        self, counts: np.ndarray, group_ids: np.ndarray, ratios: np.ndarray
+    ) -> np.ndarray:
+        """
+        Iterative stratification on group level.
+        :param counts: Class-count matrix of shape (n_samples, n_classes)
+        :param group_ids: Group index of every sample
+        :param ratios: Target fraction of every split
+        :return: Split index of every sample
+        """
+        rng = np.random.default_rng(self.random_state)
+        ratios = np.clip(ratios, 0, None)
+        n_groups = int(group_ids.max()) + 1
+        group_counts = np.zeros((n_groups, counts.shape[1]), dtype=np.int64)
+        np.add.at(group_counts, group_ids, counts)
+        group_sizes = np.bincount(group_ids, minlength=n_groups)
+
+        # Remaining demand per split and class, and per split in images
+        desired_labels = ratios[:, None] * group_counts.sum(0)[None, :]
+        desired_sizes = ratios * len(group_ids)
+        group_split = np.full(n_groups, -1)
+
+        def place(group: int, demand: np.ndarray) -> None:
+            # Most demand first, then most missing images, then random
+            candidates = np.flatnonzero(demand == demand.max())
+            if len(candidates) > 1:
+                sizes = desired_sizes[candidates]
+                candidates = candidates[sizes == sizes.max()]
+            split_index = int(rng.choice(candidates))
+            group_split[group] = split_index
+            desired_labels[split_index] -= group_counts[group]
+            desired_sizes[split_index] -= group_sizes[group]
+
+        while True:
+            unassigned = group_split < 0
+            remaining = group_counts[unassigned].sum(0)
+            if not remaining.any():
+                break
+            # The rarest class has the fewest ways to end up balanced, so it goes first
+            label = int(
+                np.argmin(np.where(remaining > 0, remaining, np.iinfo(np.int64).max))
+            )
+            groups = np.flatnonzero(unassigned & (group_counts[:, label] > 0))
+            for group in rng.permutation(groups):
+                place(group, desired_labels[:, label].copy())
+
+        # Groups without any box only balance the split sizes
+        for group in rng.permutation(np.flatnonzero(group_split < 0)):
+            place(group, desired_sizes.copy())
+
+        return group_split[group_ids]
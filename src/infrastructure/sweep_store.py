@@ -0,0 +1,125 @@
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.domain.sweep_trial import TrialResult
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trials (
+    trial_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL,
+    epochs INTEGER NOT NULL DEFAULT 0,
+    val_map50_95 REAL,
+    map50 REAL,
+    map50_95 REAL,
+    latency_ms REAL,
+    weights TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS epochs (
+    trial_id INTEGER NOT NULL REFERENCES trials (trial_id),
+    epoch INTEGER NOT NULL,
+    map50_95 REAL NOT NULL,
+    PRIMARY KEY (trial_id, epoch)
+);
+"""
+
+TRIAL_COLUMNS = (
+    "trial_id, params, status, epochs, val_map50_95, map50, map50_95, latency_ms, "
+    "weights, error"
+)
+
+
+class SweepStore:
+    """
+    Results table of a hyperparameter sweep: one row per trial, plus the val mAP of
+    every epoch of every trial. Trial processes write to it concurrently, so it runs
+    in WAL mode and every write is its own short transaction. A store reopened on the
+    same file keeps its trials, so later sweeps add to the results and the rungs.
+    """
+
+    def __init__(self, db_path: Path, timeout_s: float = 30.0):
+        """
+        :param db_path: Path of the SQLite file.
+        :param timeout_s: How long a write waits for the lock held by another process.
+        """
+        self.db_path = db_path
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(db_path, timeout=timeout_s)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+        self.connection.commit()
+
+    def add_trial(self, params: Dict[str, object]) -> int:
+        """
+        :param params: Hyperparameters of the trial
+        :return: Id of the new, pending trial
+        """
+        now = time.time()
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO trials (params, status, created_at, updated_at) "
+                "VALUES (?, 'pending', ?, ?)",
+                (json.dumps(params), now, now),
+            )
+        return cursor.lastrowid
+
+    def update(self, trial_id: int, **columns) -> None:
+        """
+        :param trial_id: The trial
+        :param columns: New values, e.g. status='completed', weights='.../best.pt'
+        """
+        assignments = ", ".join(f"{name} = ?" for name in columns)
+        with self.connection:
+            self.connection.execute(
+                f"UPDATE trials SET {assignments}, updated_at = ? WHERE trial_id = ?",
+                (*columns.values(), time.time(), trial_id),
+            )
+
+    def report_epoch(self, trial_id: int, epoch: int, map50_95: float) -> List[float]:
+        """
+        Record the val mAP of a finished epoch.
+        :param trial_id: The trial
+        :param epoch: The finished epoch, counted from 1
+        :param map50_95: Val mAP@0.5:0.95 after the epoch
+        :return: mAP after this epoch of every trial that got this far, this one included
+        """
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO epochs VALUES (?, ?, ?)",
+                (trial_id, epoch, map50_95),
+            )
+            self.connection.execute(
+                "UPDATE trials SET epochs = ?, val_map50_95 = ?, updated_at = ? "
+                "WHERE trial_id = ?",
+                (epoch, map50_95, time.time(), trial_id),
+            )
+            rows = self.connection.execute(
+                "SELECT map50_95 FROM epochs WHERE epoch = ?", (epoch,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def trials(self, status: Optional[str] = None) -> List[TrialResult]:
+        """
+        :param status: Only trials with this status, e.g. 'completed'
+        :return: Trials in the order they were added
+        """
+        query = f"SELECT {TRIAL_COLUMNS} FROM trials"
+        if status is not None:
+            rows = self.connection.execute(
+                f"{query} WHERE status = ? ORDER BY trial_id", (status,)
+            ).fetchall()
+        else:
+            rows = self.connection.execute(f"{query} ORDER BY trial_id").fetchall()
+        return [
+            TrialResult(row[0], json.loads(row[1]), *row[2:])  # Columns in field order
+            for row in rows
+        ]
+
+    def close(self) -> None:
+        self.connection.close()
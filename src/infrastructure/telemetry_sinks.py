@@ -0,0 +1,105 @@
+import csv
+import json
+import os
+from pathlib import Path
+from typing import Dict
+
+from src.domain.services.telemetry_sink import TelemetrySink
+from src.domain.training_telemetry import EpochTelemetry
+
+# Gauges of the Prometheus text file: metric name, record field, help text
+PROMETHEUS_GAUGES = [
+    ("epoch", "epoch", "Epochs trained"),
+    ("images_per_second", "images_per_s", "Images per second of the last record"),
+    ("loss", "loss", "Training loss of the last epoch"),
+    ("data_wait_ratio", "data_wait_fraction", "Share of the loop waiting for data"),
+    ("load_seconds", "load_s", "Loader worker seconds reading and decoding"),
+    ("augment_seconds", "augment_s", "Loader worker seconds in the transforms"),
+    ("map50_95", "map50_95", "mAP@0.5:0.95 of the last evaluation"),
+    ("peak_rss_megabytes", "peak_rss_mb", "Peak resident memory of the process"),
+    ("peak_device_megabytes", "peak_device_mb", "Peak CUDA memory of the last epoch"),
+]
+PROMETHEUS_PREFIX = "cctv_training_"
+
+
+class JsonlTelemetrySink(TelemetrySink):
+    """One JSON object per record, appended and flushed as it arrives."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def write(self, record: EpochTelemetry) -> None:
+        self._file.write(json.dumps(record.as_dict()) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class CsvTelemetrySink(TelemetrySink):
+    """One row per record; the header is written when the file is new."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        is_new = not self.path.exists() or self.path.stat().st_size == 0
+        self._file = open(self.path, "a", encoding="utf-8", newline="")
+        self._writer = None
+        self._write_header = is_new
+
+    def write(self, record: EpochTelemetry) -> None:
+        row = record.as_dict()
+        if self._writer is None:
+            self._writer = csv.DictWriter(self._file, fieldnames=list(row))
+            if self._write_header:
+                self._writer.writeheader()
+        self._writer.writerow(row)
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class PrometheusTelemetrySink(TelemetrySink):
+    """
+    Gauges of the latest record of each phase in the Prometheus text format, for the
+    node_exporter textfile collector. The file is rewritten on every record through a
+    temporary file and a rename, so the collector never reads a partial file.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._latest: Dict[str, EpochTelemetry] = {}
+
+    def write(self, record: EpochTelemetry) -> None:
+        self._latest[record.phase] = record
+        lines = []
+        for name, attribute, help_text in PROMETHEUS_GAUGES:
+            metric = PROMETHEUS_PREFIX + name
+            samples = [
+                f'{metric}{{run="{latest.run}",phase="{phase}"}} {value}'
+                for phase, latest in self._latest.items()
+                if (value := latest.as_dict()[attribute]) is not None
+            ]
+            if samples:
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} gauge"]
+                lines += samples
+        temporary = self.path.with_name(f".{self.path.name}.tmp")
+        temporary.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        os.replace(temporary, self.path)
+
+
+def open_telemetry_sink(path: Path) -> TelemetrySink:
+    """
+    Pick the sink from the file suffix: '.csv', '.prom' or else JSONL.
+    :param path: Output file
+    :return: The opened sink
+    """
+    if path.suffix == ".csv":
+        return CsvTelemetrySink(path)
+    if path.suffix == ".prom":
+        return PrometheusTelemetrySink(path)
+    return JsonlTelemetrySink(path)
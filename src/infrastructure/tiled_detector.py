@@ -0,0 +1,116 @@
+from typing import List
+
+import numpy as np
+
+from src.config import NMS_IOU, TILE_OVERLAP, TILE_SIZE
+from src.domain.detection import Detections
+from src.domain.services.box_ops import batched_nms, weighted_boxes_fusion
+from src.domain.services.detector import Detector
+
+
+def tile_windows(width: int, height: int, tile_size: int, overlap: float) -> np.ndarray:
+    """
+    Overlapping tile windows covering the whole image; the last row/column is aligned to
+    the image border so no tile runs off the image.
+    :param width: Image width
+    :param height: Image height
+    :param tile_size: Side of a square tile in pixels
+    :param overlap: Fraction of a tile shared with its neighbour
+    :return: int array of shape (k, 4) with x0, y0, x1, y1 per tile
+    """
+    stride = max(1, int(tile_size * (1 - overlap)))
+
+    def starts(length: int) -> np.ndarray:
+        if length <= tile_size:
+            return np.array([0])
+        points = np.arange(0, length - tile_size + 1, stride)
+        if points[-1] != length - tile_size:
+            points = np.append(points, length - tile_size)
+        return points
+
+    xs, ys = np.meshgrid(starts(width), starts(height))
+    x0, y0 = xs.ravel(), ys.ravel()
+    return np.stack(
+        [x0, y0, np.minimum(x0 + tile_size, width), np.minimum(y0 + tile_size, height)],
+        axis=1,
+    )
+
+
+class TiledDetector(Detector):
+    """
+    Sliced inference: every image is cut into overlapping tiles (plus, optionally, the
+    full frame for large objects), all tiles of the whole batch go through the wrapped
+    detector in one call, and the detections are shifted back and merged.
+    """
+
+    def __init__(
+        self,
+        detector: Detector,
+        tile_size: int = TILE_SIZE,
+        overlap: float = TILE_OVERLAP,
+        include_full_frame: bool = True,
+        merge: str = "nms",
+        iou_threshold: float = NMS_IOU,
+        match_metric: str = "ios",
+    ):
+        """
+        :param detector: The detector running on the tiles.
+        :param tile_size: Side of a square tile in pixels.
+        :param overlap: Fraction of a tile shared with its neighbour.
+        :param include_full_frame: Also run on the whole frame so large objects are not cut.
+        :param merge: 'nms' keeps the best box per cluster, 'wbf' fuses them.
+        :param iou_threshold: Overlap above which boxes of neighbouring tiles are merged.
+        :param match_metric: 'ios' also merges boxes cut at a tile border, 'iou' does not.
+        """
+        if merge not in ("nms", "wbf"):
+            raise ValueError(f"Unknown merge method: {merge}")
+        self.detector = detector
+        self.tile_size = tile_size
+        self.overlap = overlap
+        self.include_full_frame = include_full_frame
+        self.merge = merge
+        self.iou_threshold = iou_threshold
+        self.match_metric = match_metric
+
+    def predict(
+        self, images: List[np.ndarray], conf: float, imgsz: int
+    ) -> List[Detections]:
+        crops, owners, offsets = [], [], []
+        for index, image in enumerate(images):
+            height, width = image.shape[:2]
+            windows = tile_windows(width, height, self.tile_size, self.overlap)
+            for x0, y0, x1, y1 in windows.tolist():
+                crops.append(image[y0:y1, x0:x1])
+                owners.append(index)
+                offsets.append((x0, y0))
+            if self.include_full_frame and len(windows) > 1:
+                crops.append(image)
+                owners.append(index)
+                offsets.append((0, 0))
+
+        # One forward call for all tiles of all images
+        tile_detections = self.detector.predict(crops, conf, imgsz)
+
+        per_image: List[List[Detections]] = [[] for _ in images]
+        for owner, (x0, y0), detections in zip(owners, offsets, tile_detections):
+            shift = np.array([x0, y0, x0, y0], dtype=np.float32)
+            per_image[owner].append(
+                Detections(
+                    detections.boxes + shift, detections.scores, detections.classes
+                )
+            )
+        return [self._merge(parts) for parts in per_image]
+
+    def _merge(self, parts: List[Detections]) -> Detections:
+        boxes = np.concatenate([p.boxes for p in parts]).astype(np.float32)
+        scores = np.concatenate([p.scores for p in parts]).astype(np.float32)
+        classes = np.concatenate([p.classes for p in parts]).astype(np.int64)
+        if self.merge == "wbf":
+            boxes, scores, classes = weighted_boxes_fusion(
+                boxes, scores, classes, self.iou_threshold, self.match_metric
+            )
+            return Detections(boxes, scores, classes)
+        keep = batched_nms(
+            boxes, scores, classes, self.iou_threshold, self.match_metric
+        )
+        return Detections(boxes[keep], scores[keep], classes[keep])
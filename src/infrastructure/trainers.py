@@ -1,74 +1,220 @@
+import contextlib
+import time
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple
 
-import torch
-from torch import optim
-from torchvision.models.detection import fasterrcnn_resnet50_fpn
-from torchvision.models.detection.faster_rcnn import FastRCNNPredictor, FasterRCNN
-from ultralytics import YOLO
 from loguru import logger
 
-from src.config import BATCH_SIZE
+from src.config import BATCH_SIZE, EVAL_CONF, EXPORT_FORMATS
+from src.domain.detection import Detections
+from src.domain.services.detection_metrics import (
+    DetectionEvaluator,
+    MeanAveragePrecision,
+)
 from src.domain.services.model_trainer import ModelTrainer
+from src.infrastructure.model_export import export_yolo
+
+# torch, torchvision and ultralytics take seconds to import; they are imported where a
+# model is built so tools that only touch this module's neighbours start fast
+if TYPE_CHECKING:
+    from torchvision.models.detection.faster_rcnn import FasterRCNN
+
+    from src.infrastructure.training_engine import EngineConfig
+    from src.infrastructure.training_loaders import EpochTiming
+    from src.infrastructure.training_telemetry import TrainingTelemetry
+
+
+# Fine-tuning defaults for the small CCTV dataset, overridden per run e.g. by a sweep
+YOLO_HYPERPARAMETERS: Dict[str, Any] = {
+    "lr0": 0.005,  # Reduced initial learning rate
+    "weight_decay": 0.001,  # Increased regularization to mitigate overfitting
+    "mosaic": 0.8,  # Slightly reduced mosaic augmentation
+    "mixup": 0.1,  # Apply a small mixup augmentation factor
+    "freeze": [0, 1, 2, 3],  # Freeze the early layers to leverage pretrained features
+}
 
 
 class YoloUltralyticsTrainer(ModelTrainer):
     def __init__(
-        self, model_weights: str, data_config: Path, epochs: int, img_size: int = 640
+        self,
+        model_weights: str,
+        data_config: Path,
+        epochs: int,
+        img_size: int = 640,
+        hyperparameters: Optional[Dict[str, Any]] = None,
+        train_args: Optional[Dict[str, Any]] = None,
+        telemetry: Optional["TrainingTelemetry"] = None,
     ):
         """
         :param model_weights: Path to a YOLO model weight file or a model name (e.g., 'yolov8n.pt').
         :param data_config: Path to a YAML file with the data configuration for training.
         :param epochs: Number of training epochs.
         :param img_size: Image size to use for training.
+        :param hyperparameters: Overrides of YOLO_HYPERPARAMETERS.
+        :param train_args: Further arguments of the Ultralytics train call, e.g. project,
+        name or workers.
+        :param telemetry: Receives the duration, throughput and mAP of every epoch.
         """
         self.model_weights = model_weights
         self.data_config = data_config
         self.epochs = epochs
         self.img_size = img_size
+        self.hyperparameters = {**YOLO_HYPERPARAMETERS, **(hyperparameters or {})}
+        self.train_args = train_args or {}
+        self.telemetry = telemetry
+        from ultralytics import YOLO
+
         # Initialize YOLO model from ultralytics
         self.model = YOLO(model_weights)
 
+    def add_callback(self, event: str, callback: Callable) -> None:
+        """
+        Run a callback on an Ultralytics training event, e.g. 'on_fit_epoch_end'.
+        :param event: Ultralytics callback event
+        :param callback: Called with the Ultralytics trainer
+        """
+        self.model.add_callback(event, callback)
+
     def train(self, train_loader, val_loader, device):
         # Note: Ultralytics handles device selection internally (and often chooses the best available one).
         logger.info(f"Training with Ultralytics YOLO on device: {device}")
-        self.model.train(
+        args = dict(
             data=self.data_config,
             epochs=self.epochs,
             imgsz=self.img_size,
             batch=BATCH_SIZE,  # Lower batch size for a small dataset
-            lr0=0.005,  # Reduced initial learning rate
-            weight_decay=0.001,  # Increased regularization to mitigate overfitting
-            mosaic=0.8,  # Slightly reduced mosaic augmentation
-            mixup=0.1,  # Apply a small mixup augmentation factor
-            freeze=[
-                0,
-                1,
-                2,
-                3,
-            ],  # Freeze the early layers to leverage pretrained features
         )
+        args.update(self.hyperparameters)
+        args.update(self.train_args)
+        if self.telemetry:
+            self._report_epochs(self.telemetry)
+        self.model.train(**args)
+
+    def _report_epochs(self, telemetry: "TrainingTelemetry") -> None:
+        """
+        Ultralytics runs its own training loop, so its epochs are reported from its
+        callbacks. It does not time its data loading, so the records have no data wait.
+        :param telemetry: Receives a 'train' and a 'val' record per epoch
+        """
+        validation_start = {}
+
+        def on_train_epoch_start(trainer) -> None:
+            telemetry.epoch_started(trainer.device)
+
+        def on_train_epoch_end(trainer) -> None:
+            loss = getattr(trainer, "tloss", None)
+            telemetry.epoch_finished(
+                trainer.epoch + 1,
+                len(trainer.train_loader.dataset),
+                float(loss.sum()) if loss is not None else None,
+            )
+            validation_start["time"] = time.perf_counter()
+
+        def on_fit_epoch_end(trainer) -> None:
+            val_loader = getattr(trainer, "test_loader", None)  # The val split
+            telemetry.evaluated(
+                "val",
+                trainer.epoch + 1,
+                len(val_loader.dataset) if val_loader is not None else 0,
+                time.perf_counter() - validation_start.get("time", time.perf_counter()),
+                MeanAveragePrecision(
+                    map50=trainer.metrics.get("metrics/mAP50(B)", 0.0),
+                    map50_95=trainer.metrics.get("metrics/mAP50-95(B)", 0.0),
+                ),
+            )
+
+        self.add_callback("on_train_epoch_start", on_train_epoch_start)
+        self.add_callback("on_train_epoch_end", on_train_epoch_end)
+        self.add_callback("on_fit_epoch_end", on_fit_epoch_end)
+
+    @property
+    def best_weights(self) -> Path:
+        """
+        :return: best.pt of the last training run, or the initial weights before training.
+        """
+        trainer = getattr(self.model, "trainer", None)
+        if trainer is not None and Path(trainer.best).exists():
+            return Path(trainer.best)
+        return Path(self.model_weights)
+
+    def export(
+        self, formats: Sequence[str] = EXPORT_FORMATS, int8: bool = False
+    ) -> Dict[str, Path]:
+        """
+        Export the best trained weights for CPU inference.
+        :param formats: Any of 'onnx' and 'openvino'
+        :param int8: Also quantize the OpenVINO model to INT8, calibrated on the data config
+        :return: Path of the artifact per format
+        """
+        return export_yolo(
+            self.best_weights,
+            formats,
+            imgsz=self.img_size,
+            int8=int8,
+            data_config=self.data_config,
+        )
+
+
+def to_device(batch: Tuple, device) -> Tuple:
+    """
+    Move a detection batch to the device; pinned batches are copied asynchronously.
+    :param batch: (images, targets)
+    :param device: Target device
+    :return: (images, targets) on the device
+    """
+    images, targets = batch
+    images = [img.to(device, non_blocking=True) for img in images]
+    targets = [
+        {k: v.to(device, non_blocking=True) for k, v in t.items()} for t in targets
+    ]
+    return images, targets
+
+
+def detection_loss(model, batch: Tuple):
+    """
+    :param model: Torchvision detection model in train mode
+    :param batch: (images, targets) on the model device
+    :return: Sum of the detection losses
+    """
+    images, targets = batch
+    # Forward pass returns a dict of losses
+    return sum(model(images, targets).values())
 
 
 class FasterRCNNTrainer(ModelTrainer):
     def __init__(
-        self, num_classes: int, epochs: int = 10, learning_rate: float = 0.005
+        self,
+        num_classes: int,
+        epochs: int = 10,
+        learning_rate: float = 0.005,
+        engine_config: Optional["EngineConfig"] = None,
+        telemetry: Optional["TrainingTelemetry"] = None,
     ):
         """
         Initialize the Faster R-CNN trainer with model and training parameters.
         :param num_classes: Number of classes (including background)
         :param epochs: Number of training epochs
         :param learning_rate: Learning rate for the optimizer
+        :param engine_config: Mixed precision, gradient accumulation and checkpointing
+        :param telemetry: Receives the timing, throughput and memory of every epoch
         """
         self.num_classes = num_classes
         self.epochs = epochs
         self.learning_rate = learning_rate
+        self.engine_config = engine_config
+        self.telemetry = telemetry
         self.model = self.build_model()
+        self.epoch_timings: List["EpochTiming"] = []
+        self.val_metrics: List[MeanAveragePrecision] = []
 
-    def build_model(self) -> FasterRCNN:
+    def build_model(self) -> "FasterRCNN":
         """
         Build and return the Faster R-CNN model with a custom head.
         :return: Faster R-CNN model
         """
+        from torchvision.models.detection import fasterrcnn_resnet50_fpn
+        from torchvision.models.detection.faster_rcnn import FastRCNNPredictor
+
         # Load a pre-trained Faster R-CNN model
         model = fasterrcnn_resnet50_fpn(pretrained=True)
         # Get the number of input features for the classifier
@@ -80,53 +226,112 @@ class FasterRCNNTrainer(ModelTrainer):
     def train(self, train_loader, val_loader, device) -> None:
         """
         Train the Faster R-CNN model using the provided dataloaders on the specified device.
+        An interrupted run resumes after the last checkpointed epoch.
         :param train_loader: Training dataloader
         :param val_loader: Validation dataloader
         :param device: Device to train on ('cpu', 'cuda', or 'mps')
         :return:
         """
+        from torch import optim
+
+        from src.infrastructure.training_engine import TrainingEngine
+        from src.infrastructure.training_loaders import EpochTiming, timed_batches
+
         self.model.to(device)
         # Optimizer for parameters that require gradients
         params = [p for p in self.model.parameters() if p.requires_grad]
         optimizer = optim.SGD(
             params=params, lr=self.learning_rate, momentum=0.9, weight_decay=0.0005
         )
-
-        for epoch in range(self.epochs):
-            self.model.train()
-            epoch_loss = 0.0
-            for images, targets in train_loader:
-                # Move images and targets to the specified device
-                images = [img.to(device) for img in images]
-                targets = [{k: v.to(device) for k, v in t.items()} for t in targets]
-
-                optimizer.zero_grad()
-                # Forward pass returns a dict of losses
-                loss_dict = self.model(images, targets)
-                loss = torch.stack(list(loss_dict.values())).sum()
-                loss.backward()
-                optimizer.step()
-                epoch_loss += loss.item()
+        engine = TrainingEngine(
+            self.model, optimizer, device, detection_loss, self.engine_config
+        )
+        start_epoch = engine.resume()
+        if start_epoch >= self.epochs:
             logger.info(
-                f"Epoch [{epoch + 1}/{self.epochs}], Training Loss: {epoch_loss / len(train_loader):.4f}"
+                f"All {self.epochs} epochs are done according to the checkpoint"
             )
-            # Optionally, evaluate on the validation set after each epoch
-            self.evaluate(val_loader, device)
+        sampler = getattr(train_loader, "batch_sampler", None)
+        if hasattr(sampler, "epoch"):
+            sampler.epoch = start_epoch  # Same shuffling as an uninterrupted run
+
+        telemetry = self.telemetry
+        with telemetry.profiling() if telemetry else contextlib.nullcontext():
+            for epoch in range(start_epoch, self.epochs):
+                timing = EpochTiming()
+                batches = timed_batches(train_loader, timing)
+                if telemetry:
+                    telemetry.epoch_started(device, train_loader)
+                    batches = telemetry.steps(batches)
+                epoch_loss = engine.train_epoch(
+                    to_device(batch, device) for batch in batches
+                )
+                if telemetry:
+                    telemetry.epoch_finished(
+                        epoch + 1, len(train_loader.dataset), epoch_loss, timing
+                    )
+                logger.info(
+                    f"Epoch [{epoch + 1}/{self.epochs}], Training Loss: {epoch_loss:.4f}"
+                )
+                # A large data wait share means the loader, not the model, sets the pace
+                logger.info(f"Epoch [{epoch + 1}/{self.epochs}] {timing}")
+                self.epoch_timings.append(timing)
+                engine.save_checkpoint(epoch, force=epoch + 1 == self.epochs)
+                if val_loader is None or len(val_loader.dataset) == 0:
+                    continue  # No val split to measure
+                start = time.perf_counter()
+                metrics = self.evaluate(val_loader, device)
+                self.val_metrics.append(metrics)
+                if telemetry:
+                    telemetry.evaluated(
+                        "val",
+                        epoch + 1,
+                        metrics.images,
+                        time.perf_counter() - start,
+                        metrics,
+                    )
 
-    def evaluate(self, val_loader, device) -> None:
+    def evaluate(self, loader, device, split: str = "val") -> MeanAveragePrecision:
         """
-        Evaluate the model on the validation set and log the loss.
-        :param val_loader: Validation dataloader
+        COCO-style mAP of the model on a split. Torchvision detection models return
+        predictions in eval mode, which are matched against the targets on the host with
+        vectorized IoU matrices.
+        :param loader: Dataloader of the split
         :param device: Device for evaluation
-        :return:
+        :param split: Name of the split, for the log
+        :return: mAP@0.5 and mAP@0.5:0.95
         """
+        import torch
+
         self.model.eval()
-        total_loss = 0.0
-        with torch.no_grad():
-            for images, targets in val_loader:
-                images = [img.to(device) for img in images]
-                targets = [{k: v.to(device) for k, v in t.items()} for t in targets]
-                loss_dict = self.model(images, targets)
-                loss = torch.stack(list(loss_dict.values())).sum()
-                total_loss += loss.item()
-            logger.info(f"Validation Loss: {total_loss / len(val_loader):.4f}")
+        evaluator = DetectionEvaluator()
+        roi_heads = self.model.roi_heads
+        score_thresh = roi_heads.score_thresh
+        # Keep low scores so the whole precision-recall curve counts, as YOLO val does
+        roi_heads.score_thresh = EVAL_CONF
+        try:
+            with torch.inference_mode():
+                for images, targets in loader:
+                    images = [img.to(device, non_blocking=True) for img in images]
+                    for output, target in zip(self.model(images), targets):
+                        output = {k: v.cpu().numpy() for k, v in output.items()}
+                        # Label 0 is the background, dataset classes start at 1
+                        evaluator.add(
+                            target["boxes"].numpy(),
+                            target["labels"].numpy() - 1,
+                            Detections(
+                                boxes=output["boxes"],
+                                scores=output["scores"],
+                                classes=output["labels"] - 1,
+                            ),
+                        )
+        finally:
+            roi_heads.score_thresh = score_thresh
+        metrics = evaluator.compute()
+        if metrics.instances == 0:
+            logger.warning(f"{split} has no ground truth boxes, its mAP is 0")
+        logger.info(
+            f"{split} mAP@0.5: {metrics.map50:.3f}, mAP@0.5:0.95: {metrics.map50_95:.3f} "
+            f"({metrics.images} images, {metrics.instances} instances)"
+        )
+        return metrics
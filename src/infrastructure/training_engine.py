@@ -0,0 +1,141 @@
+import contextlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+import torch
+from loguru import logger
+
+from src.config import (
+    CHECKPOINT_DIR,
+    CHECKPOINT_EVERY,
+    TRAIN_ACCUMULATE_STEPS,
+    TRAIN_AMP,
+)
+
+AMP_DTYPES = {"cuda": torch.float16, "cpu": torch.bfloat16}
+
+
+@dataclass(frozen=True)
+class EngineConfig:
+    amp: bool = TRAIN_AMP  # Autocast: float16 on CUDA, bfloat16 on CPU
+    accumulate_steps: int = TRAIN_ACCUMULATE_STEPS  # Batches per optimizer step
+    checkpoint_dir: Optional[Path] = CHECKPOINT_DIR  # None disables checkpoints
+    checkpoint_every: int = CHECKPOINT_EVERY  # Epochs between checkpoints
+    resume: bool = True  # Continue from the last checkpoint when there is one
+
+
+class TrainingEngine:
+    """
+    Optimization loop of a torch model: mixed precision autocast, gradient accumulation
+    and loss aggregation on the device, so the loop never waits for the device to report
+    a loss, plus checkpoints to resume an interrupted run at the next epoch.
+    """
+
+    def __init__(
+        self,
+        model: torch.nn.Module,
+        optimizer: torch.optim.Optimizer,
+        device: torch.device,
+        loss_fn: Callable[[torch.nn.Module, object], torch.Tensor],
+        config: Optional[EngineConfig] = None,
+    ):
+        """
+        :param model: The model, already on the device.
+        :param optimizer: Optimizer of the model parameters.
+        :param device: Device the model runs on.
+        :param loss_fn: Computes the scalar training loss of a batch.
+        :param config: Engine settings, defaults from config.py.
+        """
+        self.model = model
+        self.optimizer = optimizer
+        self.device = device
+        self.loss_fn = loss_fn
+        self.config = config or EngineConfig()
+        self.amp_dtype = AMP_DTYPES.get(device.type) if self.config.amp else None
+        if self.config.amp and self.amp_dtype is None:
+            logger.warning(f"No autocast on {device.type}, training in float32")
+        # float16 gradients underflow without loss scaling; bfloat16 has the fp32 range
+        self.scaler = torch.amp.GradScaler(
+            device.type, enabled=self.amp_dtype == torch.float16
+        )
+
+    def _autocast(self):
+        if self.amp_dtype is None:
+            return contextlib.nullcontext()
+        return torch.autocast(self.device.type, dtype=self.amp_dtype)
+
+    def train_epoch(self, batches: Iterable) -> float:
+        """
+        One pass over the batches. The optimizer steps every accumulate_steps batches and
+        after the last one; the loss is summed on the device and read once at the end.
+        :param batches: Training batches, already on the device
+        :return: Mean training loss of the epoch
+        """
+        self.model.train()
+        accumulate = max(self.config.accumulate_steps, 1)
+        total = torch.zeros((), device=self.device)
+        self.optimizer.zero_grad(set_to_none=True)
+        count = 0
+        for count, batch in enumerate(batches, start=1):
+            with self._autocast():
+                loss = self.loss_fn(self.model, batch)
+            total += loss.detach()
+            self.scaler.scale(loss / accumulate).backward()
+            if count % accumulate == 0:
+                self._step()
+        if count % accumulate:
+            self._step()  # Gradients of the last, incomplete accumulation
+        return total.item() / max(count, 1)
+
+    def _step(self) -> None:
+        self.scaler.step(self.optimizer)
+        self.scaler.update()
+        self.optimizer.zero_grad(set_to_none=True)
+
+    # ------------------- Checkpoints -------------------#
+    @property
+    def checkpoint_path(self) -> Optional[Path]:
+        directory = self.config.checkpoint_dir
+        return directory / "last.pt" if directory else None
+
+    def save_checkpoint(self, epoch: int, force: bool = False) -> None:
+        """
+        Save the state after an epoch, every checkpoint_every epochs.
+        :param epoch: The finished epoch, counted from 0
+        :param force: Save regardless of the interval, e.g. after the last epoch
+        """
+        path = self.checkpoint_path
+        if path is None or not (
+            force or (epoch + 1) % self.config.checkpoint_every == 0
+        ):
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        state = {
+            "epoch": epoch,
+            "model": self.model.state_dict(),
+            "optimizer": self.optimizer.state_dict(),
+            "scaler": self.scaler.state_dict(),
+        }
+        # Write next to the target first so a crash never leaves a truncated checkpoint
+        tmp_path = path.with_suffix(".tmp")
+        torch.save(state, tmp_path)
+        os.replace(tmp_path, path)
+        logger.info(f"Checkpoint of epoch {epoch + 1} saved to {path}")
+
+    def resume(self) -> int:
+        """
+        Restore model, optimizer and scaler from the last checkpoint.
+        :return: The epoch to continue with, 0 without a checkpoint
+        """
+        path = self.checkpoint_path
+        if not self.config.resume or path is None or not path.exists():
+            return 0
+        state = torch.load(path, map_location=self.device, weights_only=True)
+        self.model.load_state_dict(state["model"])
+        self.optimizer.load_state_dict(state["optimizer"])
+        if state["scaler"]:  # Empty when the run did not scale, e.g. on CPU
+            self.scaler.load_state_dict(state["scaler"])
+        logger.info(f"Resuming after epoch {state['epoch'] + 1} from {path}")
+        return state["epoch"] + 1
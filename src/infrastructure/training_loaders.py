@@ -0,0 +1,199 @@
+import os
+import time
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+import numpy as np
+import torch
+from loguru import logger
+from torch.utils.data import DataLoader, Dataset, Sampler, Subset
+
+from src.config import (
+    ASPECT_RATIO_GROUP_FACTOR,
+    BATCH_SIZE,
+    LOADER_PIN_MEMORY,
+    LOADER_PREFETCH_FACTOR,
+    LOADER_WORKERS,
+    SPLIT_SEED,
+)
+
+T = TypeVar("T")
+
+
+def collate_detection(batch: Sequence[Tuple]) -> Tuple:
+    """
+    Keep images and targets as tuples: detection images differ in size, so they cannot be
+    stacked. A module-level function, unlike a lambda, pickles into worker processes.
+    :param batch: (image, target) samples
+    :return: (images, targets)
+    """
+    return tuple(zip(*batch))
+
+
+def aspect_ratios(dataset: Dataset) -> Optional[np.ndarray]:
+    """
+    Width / height of every sample, read from the dataset index instead of decoding.
+    :param dataset: A CCTVDetectionDatasetLoader or a Subset of one
+    :return: Aspect ratio per sample, or None if the dataset has no index
+    """
+    if isinstance(dataset, Subset):
+        ratios = aspect_ratios(dataset.dataset)
+        return None if ratios is None else ratios[np.asarray(dataset.indices)]
+    index = getattr(dataset, "index", None)
+    if index is None:
+        return None
+    return index.widths / np.maximum(index.heights, 1)
+
+
+def aspect_ratio_groups(ratios: np.ndarray, group_factor: int) -> np.ndarray:
+    """
+    Bin aspect ratios on a log scale, as the torchvision detection references do: bins
+    run from 1:2 to 2:1 with group_factor bins on each side of square.
+    :param ratios: Width / height per sample
+    :param group_factor: Bins per side of square
+    :return: Group id per sample
+    """
+    bins = 2 ** np.linspace(-1, 1, 2 * group_factor + 1)
+    return np.digitize(ratios, bins)
+
+
+class AspectRatioBatchSampler(Sampler[List[int]]):
+    """
+    Batches of samples with similar aspect ratios. Detection models pad every image of a
+    batch to the largest one, so mixing portrait and landscape images spends most of the
+    compute on padding. Each epoch shuffles the samples, fills one batch per group and
+    finally shuffles the order of the batches.
+    """
+
+    def __init__(
+        self,
+        group_ids: np.ndarray,
+        batch_size: int,
+        shuffle: bool = True,
+        seed: int = SPLIT_SEED,
+    ):
+        """
+        :param group_ids: Aspect ratio group of every sample.
+        :param batch_size: Samples per batch; the last batch of a group may be smaller.
+        :param shuffle: Shuffle samples and batches, differently every epoch.
+        :param seed: Seed of the shuffling.
+        """
+        self.group_ids = np.asarray(group_ids)
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.seed = seed
+        self.epoch = 0
+
+    def __iter__(self) -> Iterator[List[int]]:
+        rng = np.random.default_rng(self.seed + self.epoch)
+        self.epoch += 1
+        order = np.arange(len(self.group_ids))
+        if self.shuffle:
+            order = rng.permutation(order)
+        batches = []
+        for group in np.unique(self.group_ids):
+            members = order[self.group_ids[order] == group].tolist()
+            batches += [
+                members[start : start + self.batch_size]
+                for start in range(0, len(members), self.batch_size)
+            ]
+        if self.shuffle:
+            batches = [batches[i] for i in rng.permutation(len(batches))]
+        yield from batches
+
+    def __len__(self) -> int:
+        sizes = np.bincount(np.unique(self.group_ids, return_inverse=True)[1])
+        return int(np.sum(-(-sizes // self.batch_size)))
+
+
+@dataclass(frozen=True)
+class LoaderConfig:
+    batch_size: int = BATCH_SIZE
+    workers: Optional[int] = LOADER_WORKERS  # None: one per core, leaving one free
+    prefetch_factor: int = LOADER_PREFETCH_FACTOR  # Batches queued per worker
+    pin_memory: bool = LOADER_PIN_MEMORY  # Only used when training on CUDA
+    aspect_ratio_group_factor: int = ASPECT_RATIO_GROUP_FACTOR  # 0 disables grouping
+
+    @property
+    def num_workers(self) -> int:
+        if self.workers is not None:
+            return self.workers
+        return min(8, max((os.cpu_count() or 1) - 1, 0))
+
+
+def build_detection_loader(
+    dataset: Dataset,
+    config: LoaderConfig,
+    shuffle: bool,
+    device: torch.device,
+) -> DataLoader:
+    """
+    DataLoader for detection training: worker processes decode ahead of the model,
+    workers stay alive between epochs, and batches go to page-locked memory when the
+    model runs on CUDA so the copy to the GPU can overlap compute.
+    :param dataset: Detection dataset or a Subset of one
+    :param config: Loader settings
+    :param shuffle: Shuffle every epoch (training) or keep the order (evaluation)
+    :param device: The device the model runs on
+    :return: The DataLoader
+    """
+    workers = config.num_workers
+    options = dict(
+        collate_fn=collate_detection,
+        num_workers=workers,
+        pin_memory=config.pin_memory and device.type == "cuda",
+    )
+    if workers > 0:
+        options.update(persistent_workers=True, prefetch_factor=config.prefetch_factor)
+
+    ratios = aspect_ratios(dataset) if config.aspect_ratio_group_factor > 0 else None
+    if ratios is None:
+        return DataLoader(
+            dataset, batch_size=config.batch_size, shuffle=shuffle, **options
+        )
+    groups = aspect_ratio_groups(ratios, config.aspect_ratio_group_factor)
+    logger.info(
+        f"Aspect ratio groups: {np.bincount(groups).tolist()}, {workers} loader workers"
+    )
+    sampler = AspectRatioBatchSampler(groups, config.batch_size, shuffle=shuffle)
+    return DataLoader(dataset, batch_sampler=sampler, **options)
+
+
+@dataclass
+class EpochTiming:
+    batches: int = 0
+    data_wait_s: float = 0.0  # Time the training loop waited for the next batch
+    compute_s: float = 0.0  # Time spent on each batch once it was there
+
+    @property
+    def data_wait_fraction(self) -> float:
+        total = self.data_wait_s + self.compute_s
+        return self.data_wait_s / total if total else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"data wait {self.data_wait_s:.1f}s ({self.data_wait_fraction:.0%}), "
+            f"compute {self.compute_s:.1f}s over {self.batches} batches"
+        )
+
+
+def timed_batches(loader: Iterable[T], timing: EpochTiming) -> Iterator[T]:
+    """
+    Iterate a loader, adding to timing how long each batch took to arrive and how long
+    the loop body worked on it. A high data wait share means the model is starved.
+    :param loader: The batches
+    :param timing: Accumulates the measurements
+    :return: The batches of the loader
+    """
+    iterator = iter(loader)
+    while True:
+        start = time.perf_counter()
+        try:
+            batch = next(iterator)
+        except StopIteration:
+            return
+        arrived = time.perf_counter()
+        timing.data_wait_s += arrived - start
+        yield batch
+        timing.compute_s += time.perf_counter() - arrived
+        timing.batches += 1
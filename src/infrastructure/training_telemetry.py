@@ -0,0 +1,353 @@
+import contextlib
+import sys
+import time
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TypeVar,
+)
+
+from loguru import logger
+
+from src.config import PROFILE_DIR, TELEMETRY_DATA_BOUND_FRACTION
+from src.domain.services.detection_metrics import MeanAveragePrecision
+from src.domain.services.telemetry_sink import TelemetrySink
+from src.domain.services.training_summary import summarize
+from src.domain.training_telemetry import EpochTelemetry, TrainingSummary
+
+# torch is imported where it is used, so building the telemetry of a run does not
+# import it at startup
+if TYPE_CHECKING:
+    from src.infrastructure.training_loaders import EpochTiming
+
+T = TypeVar("T")
+STAGE_TIME_SLOTS = 64  # Rows of worker stage timers; workers beyond wrap around
+
+
+class StageTimes:
+    """
+    Seconds spent per stage of sample loading, summed over the DataLoader workers. The
+    counters are a tensor in shared memory, which workers inherit or receive as a
+    handle, and every worker adds to its own row so no update is lost to a race.
+    """
+
+    STAGES = ("load", "augment")
+
+    def __init__(self, slots: int = STAGE_TIME_SLOTS):
+        """
+        :param slots: Rows of counters, one for the main process and one per worker.
+        """
+        import torch
+
+        self.seconds = torch.zeros(
+            (slots, len(self.STAGES)), dtype=torch.float64
+        ).share_memory_()
+
+    @contextlib.contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        """
+        Add the time spent in the block to a stage.
+        :param stage: 'load' or 'augment'
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[self._slot(), self.STAGES.index(stage)] += (
+                time.perf_counter() - start
+            )
+
+    def _slot(self) -> int:
+        from torch.utils.data import get_worker_info
+
+        info = get_worker_info()
+        return 0 if info is None else (info.id + 1) % len(self.seconds)
+
+    def totals(self) -> Dict[str, float]:
+        """
+        :return: Seconds per stage since the dataset was created
+        """
+        return dict(zip(self.STAGES, self.seconds.sum(dim=0).tolist()))
+
+
+def loader_stage_times(loader) -> Optional[StageTimes]:
+    """
+    :param loader: A DataLoader over a dataset, or over Subsets of one
+    :return: The stage timers of the dataset, None if it has none
+    """
+    dataset = getattr(loader, "dataset", None)
+    while not hasattr(dataset, "stage_times") and hasattr(dataset, "dataset"):
+        dataset = dataset.dataset  # Unwrap Subsets
+    return getattr(dataset, "stage_times", None)
+
+
+def reset_peak_memory(device) -> None:
+    """
+    Start a new peak of the device memory, so every epoch reports its own.
+    :param device: The training device
+    """
+    if getattr(device, "type", device) == "cuda":
+        import torch
+
+        torch.cuda.reset_peak_memory_stats(device)
+
+
+def peak_rss_mb() -> float:
+    """
+    :return: Peak resident memory of this process since it started
+    """
+    import resource  # Unix only
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def peak_device_mb(device) -> Optional[float]:
+    """
+    :param device: The training device
+    :return: Peak CUDA memory since the last reset, None on other devices
+    """
+    if getattr(device, "type", device) != "cuda":
+        return None
+    import torch
+
+    return torch.cuda.max_memory_allocated(device) / 2**20
+
+
+class TrainingProfiler:
+    """
+    torch.profiler capture of a window of training steps, e.g. steps 10 to 15 so the
+    slow first batches are left out. The Chrome trace of the window is written to
+    output_dir (open it in Perfetto or chrome://tracing), and the operators with the
+    most self time are logged.
+    """
+
+    def __init__(
+        self,
+        start_step: int,
+        stop_step: int,
+        output_dir: Path = PROFILE_DIR,
+        row_limit: int = 15,
+    ):
+        """
+        :param start_step: First profiled step, counted from 0 over the whole run.
+        :param stop_step: First step after the window.
+        :param output_dir: Folder of the traces.
+        :param row_limit: Operators in the logged table.
+        """
+        self.start_step = start_step
+        self.stop_step = stop_step
+        self.output_dir = output_dir
+        self.row_limit = row_limit
+        self._profiler = None
+
+    def __enter__(self) -> "TrainingProfiler":
+        import torch
+        from torch.profiler import ProfilerActivity, profile, schedule
+
+        activities = [ProfilerActivity.CPU]
+        if torch.cuda.is_available():
+            activities.append(ProfilerActivity.CUDA)
+        # One warm-up step before the window when there is one, as torch recommends
+        warmup = min(self.start_step, 1)
+        self._profiler = profile(
+            activities=activities,
+            schedule=schedule(
+                skip_first=self.start_step - warmup,
+                wait=0,
+                warmup=warmup,
+                active=max(self.stop_step - self.start_step, 1),
+                repeat=1,
+            ),
+            on_trace_ready=self._trace_ready,
+            record_shapes=True,
+            profile_memory=True,
+        )
+        self._profiler.__enter__()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._profiler.__exit__(*exc)
+        self._profiler = None
+
+    def _trace_ready(self, profiler) -> None:
+        import torch
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        path = self.output_dir / (
+            f"trace_steps_{self.start_step}-{self.stop_step}_{int(time.time())}.json"
+        )
+        profiler.export_chrome_trace(str(path))
+        sort_by = (
+            "self_cuda_time_total"
+            if torch.cuda.is_available()
+            else "self_cpu_time_total"
+        )
+        table = profiler.key_averages().table(sort_by=sort_by, row_limit=self.row_limit)
+        logger.info(f"Profile of steps {self.start_step}-{self.stop_step}:\n{table}")
+        logger.info(f"Trace written to {path}")
+
+    def steps(self, batches: Iterable[T]) -> Iterator[T]:
+        """
+        Pass the batches through, advancing the profiler schedule after each step.
+        :param batches: Training batches
+        :return: The same batches
+        """
+        for batch in batches:
+            yield batch
+            self._profiler.step()
+
+
+class TrainingTelemetry:
+    """
+    Instrumentation of a training run. Trainers emit a 'train' record per epoch, framed
+    by epoch_started() and epoch_finished(), and a 'val' record per evaluation; the
+    training service emits the final 'test' evaluation. Each record goes to every sink
+    straight away. The optional profiler captures a window of training steps. close()
+    logs a summary that says whether the run is bound by I/O, augmentation or compute.
+    """
+
+    def __init__(
+        self,
+        sinks: Sequence[TelemetrySink],
+        run: Optional[str] = None,
+        profiler: Optional[TrainingProfiler] = None,
+        data_bound_fraction: float = TELEMETRY_DATA_BOUND_FRACTION,
+    ):
+        """
+        :param sinks: Where the records go, e.g. JSONL, CSV and Prometheus files.
+        :param run: Id of the run in the records, defaults to the start time.
+        :param profiler: Profiler of a window of training steps.
+        :param data_bound_fraction: Data wait share above which a run is input bound.
+        """
+        self.sinks = list(sinks)
+        self.run = run or time.strftime("%Y%m%d-%H%M%S")
+        self.profiler = profiler
+        self.data_bound_fraction = data_bound_fraction
+        self.records: List[EpochTelemetry] = []
+        self._epoch_start = 0.0
+        self._stage_times: Optional[StageTimes] = None
+        self._stages_before: Dict[str, float] = {}
+        self._device = None
+
+    def emit(self, record: EpochTelemetry) -> None:
+        self.records.append(record)
+        for sink in self.sinks:
+            sink.write(record)
+
+    def profiling(self):
+        """
+        :return: Context of the profiler, a no-op without one
+        """
+        return self.profiler if self.profiler else contextlib.nullcontext()
+
+    def steps(self, batches: Iterable[T]) -> Iterable[T]:
+        """
+        :param batches: Training batches, inside profiling()
+        :return: The batches, advancing the profiler if there is one
+        """
+        return self.profiler.steps(batches) if self.profiler else batches
+
+    def epoch_started(self, device, loader=None) -> None:
+        """
+        Start the clock, the stage timers and the memory peak of an epoch.
+        :param device: The training device
+        :param loader: Training DataLoader, its dataset may time the loader stages
+        """
+        self._device = device
+        self._stage_times = loader_stage_times(loader)
+        if self._stage_times is not None:
+            self._stages_before = self._stage_times.totals()
+        reset_peak_memory(device)
+        self._epoch_start = time.perf_counter()
+
+    def epoch_finished(
+        self,
+        epoch: int,
+        images: int,
+        loss: Optional[float] = None,
+        timing: Optional["EpochTiming"] = None,
+        wall_s: Optional[float] = None,
+    ) -> None:
+        """
+        Emit the 'train' record of the epoch started last.
+        :param epoch: The finished epoch, counted from 1
+        :param images: Training images of the epoch
+        :param loss: Mean training loss
+        :param timing: Data wait and compute time of the training loop
+        :param wall_s: Duration of the epoch, defaults to the time since epoch_started()
+        """
+        if wall_s is None:
+            wall_s = time.perf_counter() - self._epoch_start
+        stages = {}
+        if self._stage_times is not None:
+            totals = self._stage_times.totals()
+            stages = {
+                f"{stage}_s": totals[stage] - self._stages_before.get(stage, 0.0)
+                for stage in StageTimes.STAGES
+            }
+        self.emit(
+            EpochTelemetry(
+                run=self.run,
+                phase="train",
+                epoch=epoch,
+                images=images,
+                wall_s=wall_s,
+                loss=loss,
+                data_wait_s=timing.data_wait_s if timing else None,
+                compute_s=timing.compute_s if timing else None,
+                peak_rss_mb=peak_rss_mb(),
+                peak_device_mb=peak_device_mb(self._device),
+                **stages,
+            )
+        )
+
+    def evaluated(
+        self,
+        split: str,
+        epoch: int,
+        images: int,
+        wall_s: float,
+        metrics: Optional[MeanAveragePrecision],
+    ) -> None:
+        """
+        Emit the record of an evaluation.
+        :param split: 'val' during training, 'test' for the final evaluation
+        :param epoch: Epochs trained before the evaluation
+        :param images: Evaluated images
+        :param wall_s: Duration of the evaluation
+        :param metrics: mAP of the split, if there is one
+        """
+        self.emit(
+            EpochTelemetry(
+                run=self.run,
+                phase=split,
+                epoch=epoch,
+                images=images,
+                wall_s=wall_s,
+                map50=metrics.map50 if metrics else None,
+                map50_95=metrics.map50_95 if metrics else None,
+                peak_rss_mb=peak_rss_mb(),
+            )
+        )
+
+    def summary(self) -> TrainingSummary:
+        return summarize(self.run, self.records, self.data_bound_fraction)
+
+    def close(self) -> TrainingSummary:
+        """
+        Close the sinks and log the summary of the run.
+        :return: The summary
+        """
+        for sink in self.sinks:
+            sink.close()
+        summary = self.summary()
+        logger.info(f"Training summary\n{summary}")
+        return summary
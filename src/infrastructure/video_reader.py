@@ -0,0 +1,149 @@
+import queue
+import threading
+import time
+from typing import Iterator, Optional, Union
+
+import cv2
+from loguru import logger
+
+from src.config import STREAM_QUEUE_SIZE
+from src.domain.video import VideoFrame
+
+LIVE_PREFIXES = ("rtsp://", "rtmp://", "http://", "https://")
+DEFAULT_FPS = 25.0  # Used when the container or stream does not report a rate
+RECONNECT_DELAY_S = 2.0
+
+
+class ThreadedVideoReader:
+    """
+    Decodes a video file, RTSP/HTTP stream or webcam on a background thread into a bounded
+    queue. For live sources a full queue drops the oldest frame, so the consumer always
+    works on recent frames and a slow detector never makes the stream lag behind; files
+    block instead, so no frame is lost.
+    """
+
+    def __init__(
+        self,
+        source: Union[str, int],
+        queue_size: int = STREAM_QUEUE_SIZE,
+        drop_frames: Optional[bool] = None,
+        reconnect_attempts: int = 3,
+    ):
+        """
+        :param source: Video path, stream URL or webcam index.
+        :param queue_size: Max decoded frames waiting for the consumer.
+        :param drop_frames: Drop frames under backpressure, defaults to True for live sources.
+        :param reconnect_attempts: Times a live source is reopened after it stops delivering.
+        """
+        self.source = int(source) if str(source).isdigit() else source
+        self.live = isinstance(self.source, int) or str(source).startswith(
+            LIVE_PREFIXES
+        )
+        self.drop_frames = self.live if drop_frames is None else drop_frames
+        self.reconnect_attempts = reconnect_attempts if self.live else 0
+        self.frames_read = 0
+        self.frames_dropped = 0
+
+        self._queue: "queue.Queue[Optional[VideoFrame]]" = queue.Queue(queue_size)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._capture = self._open()
+        fps = self._capture.get(cv2.CAP_PROP_FPS)
+        self.fps = fps if fps and fps > 0 else DEFAULT_FPS
+
+    def _open(self) -> "cv2.VideoCapture":
+        capture = cv2.VideoCapture(self.source)
+        if not capture.isOpened():
+            raise IOError(f"Cannot open video source {self.source}")
+        # Keep the driver side buffer small, our own queue does the buffering
+        capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        return capture
+
+    def __iter__(self) -> Iterator[VideoFrame]:
+        self.start()
+        while True:
+            frame = self._queue.get()
+            if frame is None:
+                return
+            yield frame
+
+    def start(self) -> "ThreadedVideoReader":
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="video-reader", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "ThreadedVideoReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _read(self) -> Optional[VideoFrame]:
+        ok, image = self._capture.read()
+        attempts = 0
+        while not ok and attempts < self.reconnect_attempts and not self._stop.is_set():
+            attempts += 1
+            logger.warning(f"Stream {self.source} stalled, reconnect {attempts}")
+            self._capture.release()
+            time.sleep(RECONNECT_DELAY_S)
+            try:
+                self._capture = self._open()
+            except IOError:
+                continue
+            ok, image = self._capture.read()
+        if not ok:
+            return None
+        index = self.frames_read
+        self.frames_read += 1
+        if self.live:
+            timestamp = time.time()
+        else:
+            timestamp = self._capture.get(cv2.CAP_PROP_POS_MSEC) / 1000
+        return VideoFrame(index, timestamp, cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+
+    def _put(self, frame: Optional[VideoFrame]) -> None:
+        while not self._stop.is_set():
+            try:
+                if self.drop_frames:
+                    self._queue.put_nowait(frame)
+                else:
+                    self._queue.put(frame, timeout=0.1)
+                return
+            except queue.Full:
+                if self.drop_frames:
+                    self._discard_oldest()
+        if frame is None:
+            # Stopped: make room so the end marker always gets through
+            while True:
+                try:
+                    self._queue.put_nowait(frame)
+                    return
+                except queue.Full:
+                    self._discard_oldest()
+
+    def _discard_oldest(self) -> None:
+        try:
+            if self._queue.get_nowait() is not None:
+                self.frames_dropped += 1
+        except queue.Empty:
+            pass
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.is_set():
+                frame = self._read()
+                if frame is None:
+                    break
+                self._put(frame)
+        finally:
+            self._capture.release()
+            self._put(None)
@@ -0,0 +1,98 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+from loguru import logger
+
+from src.config import NUM_CLASSES
+
+LABEL_CHUNK = 1024  # Label files parsed per worker task
+
+
+def read_yolo_labels(label_path: Optional[Path]) -> np.ndarray:
+    """
+    Parse a YOLO label file into a (k, 5) array of class, x_center, y_center, width, height
+    (normalized). The format is decided per line: five values are a box, more are a
+    polygon. Missing files and empty files yield an empty array.
+    :param label_path: The label txt file, or None
+    :return: float32 array of shape (k, 5)
+    """
+    if label_path is None or not label_path.exists():
+        return np.zeros((0, 5), dtype=np.float32)
+    rows = []
+    for number, line in enumerate(label_path.read_text().splitlines(), start=1):
+        try:
+            parts = np.array(line.split(), dtype=np.float32)
+        except ValueError:
+            logger.warning(f"Skipping non-numeric line {number} of {label_path}")
+            continue
+        if parts.size == 5:
+            rows.append(parts)
+        elif parts.size > 5:
+            # Segmentation style lines carry polygons, keep the class and derive a box
+            xs, ys = parts[1::2], parts[2::2]
+            rows.append(
+                [
+                    parts[0],
+                    (xs.min() + xs.max()) / 2,
+                    (ys.min() + ys.max()) / 2,
+                    xs.max() - xs.min(),
+                    ys.max() - ys.min(),
+                ]
+            )
+    return np.array(rows, dtype=np.float32).reshape(-1, 5)
+
+
+def count_classes(
+    label_paths: Sequence[Optional[Path]], num_classes: int = NUM_CLASSES
+) -> np.ndarray:
+    """
+    Count boxes per class for a list of label files.
+    :param label_paths: Label files
+    :param num_classes: Number of classes
+    :return: int32 array of shape (len(label_paths), num_classes)
+    """
+    counts = np.zeros((len(label_paths), num_classes), dtype=np.int32)
+    for row, label_path in enumerate(label_paths):
+        classes = read_yolo_labels(label_path)[:, 0].astype(np.int64)
+        classes = classes[(classes >= 0) & (classes < num_classes)]
+        counts[row] = np.bincount(classes, minlength=num_classes)
+    return counts
+
+
+def class_count_matrix(
+    label_paths: Sequence[Optional[Path]],
+    num_classes: int = NUM_CLASSES,
+    workers: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Parse all label files once into a compact class-count matrix, in a process pool.
+    :param label_paths: Label files
+    :param num_classes: Number of classes
+    :param workers: Worker processes, None uses all cores, 1 parses in-process
+    :return: int32 array of shape (len(label_paths), num_classes)
+    """
+    if workers == 1 or len(label_paths) <= LABEL_CHUNK:
+        return count_classes(label_paths, num_classes)
+    chunks = [
+        label_paths[start : start + LABEL_CHUNK]
+        for start in range(0, len(label_paths), LABEL_CHUNK)
+    ]
+    with ProcessPoolExecutor(workers) as pool:
+        parts = pool.map(partial(count_classes, num_classes=num_classes), chunks)
+        return np.concatenate(list(parts))
+
+
+def yolo_to_xyxy(labels: np.ndarray, width: int, height: int) -> np.ndarray:
+    """
+    Convert normalized YOLO boxes to absolute xyxy pixel boxes.
+    :param labels: Array (k, 5) of class, x_center, y_center, width, height
+    :param width: Image width in pixels
+    :param height: Image height in pixels
+    :return: float32 array of shape (k, 4)
+    """
+    scale = np.array([width, height, width, height], dtype=np.float32)
+    centers, sizes = labels[:, 1:3], labels[:, 3:5]
+    return np.concatenate([centers - sizes / 2, centers + sizes / 2], axis=1) * scale
@@ -0,0 +1,89 @@
+import argparse
+from pathlib import Path
+from typing import List, Optional
+
+from loguru import logger
+
+from src.application.batch_detection import BatchDetectionService, discover_images
+from src.config import (
+    DETECTION_BATCH_SIZE,
+    DETECTION_CACHE_ENABLED,
+    DETECTION_CACHE_PATH,
+    DETECTION_DECODE_WORKERS,
+    INFERENCE_BACKEND,
+    INFERENCE_CONF,
+    INFERENCE_DEVICE,
+    INFERENCE_IMGSZ,
+    OUTPUT_DIR,
+)
+from src.infrastructure.detection_cache import DetectionCache
+from src.infrastructure.detection_sinks import open_detection_sink
+from src.infrastructure.detector_factory import DETECTOR_BACKENDS, build_detector
+from src.infrastructure.tiled_detector import TiledDetector
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Detect CCTV cameras and signs in a folder or glob of images. "
+        "Re-running with the same output resumes an interrupted run."
+    )
+    parser.add_argument(
+        "source",
+        nargs="?",
+        default=str(OUTPUT_DIR),
+        help="Folder (searched recursively) or quoted glob, defaults to the scraper output",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=OUTPUT_DIR.parent / "detections.jsonl",
+        help="A .jsonl file or a .parquet dataset folder",
+    )
+    parser.add_argument(
+        "--backend", choices=DETECTOR_BACKENDS, default=INFERENCE_BACKEND
+    )
+    parser.add_argument(
+        "--weights", type=Path, default=None, help="Defaults to the backend's artifact"
+    )
+    parser.add_argument("--device", default=INFERENCE_DEVICE)
+    parser.add_argument("--conf", type=float, default=INFERENCE_CONF)
+    parser.add_argument("--imgsz", type=int, default=INFERENCE_IMGSZ)
+    parser.add_argument("--batch-size", type=int, default=DETECTION_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=DETECTION_DECODE_WORKERS)
+    parser.add_argument(
+        "--tiled", action="store_true", help="Sliced inference for small objects"
+    )
+    parser.add_argument(
+        "--cache",
+        action=argparse.BooleanOptionalAction,
+        default=DETECTION_CACHE_ENABLED,
+        help="Reuse detections of images seen before, e.g. unchanged screenshots",
+    )
+    args = parser.parse_args(argv)
+
+    cache = DetectionCache(DETECTION_CACHE_PATH) if args.cache else None
+    detector = build_detector(args.backend, args.weights, args.device, cache)
+    if args.tiled:
+        detector = TiledDetector(detector)
+
+    with open_detection_sink(args.output) as sink:
+        service = BatchDetectionService(
+            detector,
+            sink,
+            batch_size=args.batch_size,
+            decode_workers=args.workers,
+            conf=args.conf,
+            imgsz=args.imgsz,
+        )
+        service.run(discover_images(args.source))
+    if cache is not None:
+        stats = cache.stats()
+        logger.info(
+            f"Detection cache: {stats.hit_rate:.1%} hit rate "
+            f"({stats.memory_hits} memory, {stats.disk_hits} disk, {stats.misses} misses), "
+            f"{stats.disk_entries} entries, {stats.disk_mb:.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import argparse
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from loguru import logger
+from PIL import Image
+
+from src.config import (
+    INFERENCE_CONF,
+    INFERENCE_IMGSZ,
+    INFERENCE_MAX_BATCH,
+    MODEL_WEIGHTS,
+    PROJECT_ROOT,
+)
+from src.domain.detection import Detections
+from src.domain.services.box_ops import box_iou
+from src.domain.services.detector import Detector
+from src.domain.services.iou_tracker import greedy_match
+from src.infrastructure.detector_factory import build_detector
+
+DRIFT_IOU = 0.5  # Boxes of two backends overlapping this much are the same detection
+
+
+def drift(reference: Detections, candidate: Detections) -> Dict[str, float]:
+    """
+    Compare the detections of a backend with those of the reference model on one image.
+    :return: Matched, missed and extra detections, summed IoU and score error of the matches
+    """
+    ious = box_iou(reference.boxes, candidate.boxes)
+    ious[reference.classes[:, None] != candidate.classes[None, :]] = 0
+    pairs, _, _ = greedy_match(ious, DRIFT_IOU)
+    rows = np.array([row for row, _ in pairs], dtype=np.int64)
+    cols = np.array([col for _, col in pairs], dtype=np.int64)
+    return {
+        "matched": len(pairs),
+        "missed": len(reference) - len(pairs),
+        "extra": len(candidate) - len(pairs),
+        "iou_sum": float(ious[rows, cols].sum()),
+        "score_error_sum": float(
+            np.abs(reference.scores[rows] - candidate.scores[cols]).sum()
+        ),
+    }
+
+
+def measure(
+    detector: Detector, images: List[np.ndarray], imgsz: int, batch_size: int
+) -> Dict:
+    """
+    Latency of single-image calls and throughput of batched calls.
+    :return: Detections per image and the timings
+    """
+    detector.predict(images[:1], INFERENCE_CONF, imgsz)  # Warm up
+    detections, latencies = [], []
+    for image in images:
+        start = time.perf_counter()
+        detections.extend(detector.predict([image], INFERENCE_CONF, imgsz))
+        latencies.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    for index in range(0, len(images), batch_size):
+        detector.predict(images[index : index + batch_size], INFERENCE_CONF, imgsz)
+    batched_s = time.perf_counter() - start
+    latencies = np.array(latencies) * 1000
+    return {
+        "detections": detections,
+        "latency_mean_ms": latencies.mean(),
+        "latency_p95_ms": np.percentile(latencies, 95),
+        "batched_images_per_s": len(images) / batched_s,
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Latency and accuracy drift of exported models against the .pt model."
+    )
+    parser.add_argument(
+        "--images",
+        type=Path,
+        default=PROJECT_ROOT / "datasets" / "ultralytics" / "images" / "val",
+    )
+    parser.add_argument("--weights", type=Path, default=MODEL_WEIGHTS)
+    parser.add_argument(
+        "--backends", nargs="+", default=["onnx"], choices=["onnx", "openvino"]
+    )
+    parser.add_argument("--imgsz", type=int, default=INFERENCE_IMGSZ)
+    parser.add_argument("--batch-size", type=int, default=INFERENCE_MAX_BATCH)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    paths = sorted(
+        p for p in args.images.iterdir() if p.suffix.lower() in (".jpg", ".png")
+    )[: args.limit]
+    images = [np.array(Image.open(p).convert("RGB")) for p in paths]
+
+    reference = measure(
+        build_detector("ultralytics", args.weights), images, args.imgsz, args.batch_size
+    )
+    logger.info(
+        f"ultralytics: {reference['latency_mean_ms']:.1f} ms mean, "
+        f"{reference['latency_p95_ms']:.1f} ms p95, "
+        f"{reference['batched_images_per_s']:.1f} img/s batched"
+    )
+    for backend in args.backends:
+        result = measure(build_detector(backend), images, args.imgsz, args.batch_size)
+        totals: Dict[str, float] = {}
+        for expected, found in zip(reference["detections"], result["detections"]):
+            for key, value in drift(expected, found).items():
+                totals[key] = totals.get(key, 0) + value
+        matched = max(totals["matched"], 1)
+        logger.info(
+            f"{backend}: {result['latency_mean_ms']:.1f} ms mean "
+            f"({reference['latency_mean_ms'] / result['latency_mean_ms']:.2f}x), "
+            f"{result['latency_p95_ms']:.1f} ms p95, "
+            f"{result['batched_images_per_s']:.1f} img/s batched"
+        )
+        logger.info(
+            f"{backend} drift over {len(images)} images: {totals['matched']:.0f} matched, "
+            f"{totals['missed']:.0f} missed, {totals['extra']:.0f} extra, "
+            f"mean IoU {totals['iou_sum'] / matched:.3f}, "
+            f"mean |score diff| {totals['score_error_sum'] / matched:.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
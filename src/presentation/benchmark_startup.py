@@ -0,0 +1,154 @@
+import argparse
+import re
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+from src.cli import COMMANDS
+from src.config import PROJECT_ROOT, STARTUP_BUDGETS_MS
+
+# Packages that cost seconds to import; a command reaching one of them at startup
+# instead of where it is used is a regression even when it stays within its budget
+HEAVY_PACKAGES = {
+    "torch",
+    "torchvision",
+    "ultralytics",
+    "gradio",
+    "cv2",
+    "openvino",
+    "onnxruntime",
+    "playwright",
+}
+ALLOWED_HEAVY: Dict[str, Set[str]] = {"serve": {"gradio"}}  # The UI is built on import
+# import time:       self [us] |   cumulative | imported package
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+@dataclass
+class StartupResult:
+    command: str
+    module: str
+    import_ms: float = 0.0
+    budget_ms: float = 0.0
+    heavy: List[str] = field(default_factory=list)
+    slowest: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return (
+            self.error is None and not self.heavy and self.import_ms <= self.budget_ms
+        )
+
+
+def import_times(statement: str) -> Dict[str, int]:
+    """
+    Run a statement in a fresh interpreter with -X importtime.
+    :param statement: Python code, e.g. "import src.cli"
+    :return: Self import time in microseconds per imported module
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=PROJECT_ROOT.parent,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+    times = {}
+    for line in completed.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            times[match.group(4)] = int(match.group(1))
+    return times
+
+
+def measure(
+    command: str, module: str, repeat: int, interpreter: Set[str]
+) -> StartupResult:
+    """
+    Import time of a command module: the self time of every module it imports that a
+    bare interpreter does not, best of several fresh processes.
+    :param command: CLI command name, or "cli" for the dispatcher itself
+    :param module: The module the command imports
+    :param repeat: Number of fresh processes
+    :param interpreter: Modules imported by a bare interpreter
+    :return: StartupResult
+    """
+    result = StartupResult(command, module, budget_ms=STARTUP_BUDGETS_MS[command])
+    best: Optional[Dict[str, int]] = None
+    try:
+        for _ in range(repeat):
+            times = {
+                name: us
+                for name, us in import_times(f"import {module}").items()
+                if name not in interpreter
+            }
+            if best is None or sum(times.values()) < sum(best.values()):
+                best = times
+    except RuntimeError as e:
+        result.error = str(e)
+        return result
+
+    result.import_ms = sum(best.values()) / 1000
+    packages = {name.split(".")[0] for name in best}
+    result.heavy = sorted(
+        packages & (HEAVY_PACKAGES - ALLOWED_HEAVY.get(command, set()))
+    )
+    per_package: Dict[str, int] = {}
+    for name, us in best.items():
+        package = name.split(".")[0]
+        per_package[package] = per_package.get(package, 0) + us
+    result.slowest = [
+        f"{package} {us / 1000:.0f}ms"
+        for package, us in sorted(per_package.items(), key=lambda item: -item[1])[:3]
+    ]
+    return result
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Measure the import time of every CLI command against its budget; "
+        "exits with 1 when a command is over budget or imports a heavy package early."
+    )
+    parser.add_argument(
+        "commands",
+        nargs="*",
+        help=f"Commands to measure, defaults to all of: cli {' '.join(COMMANDS)}",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh processes each")
+    args = parser.parse_args(argv)
+
+    modules = {"cli": "src.cli", **{n: c.module for n, c in COMMANDS.items()}}
+    # argparse checks a list default of nargs="*" against choices, so names are
+    # validated here instead
+    unknown = [command for command in args.commands if command not in modules]
+    if unknown:
+        parser.error(f"unknown commands: {', '.join(unknown)}")
+    args.commands = args.commands or list(modules)
+    interpreter = set(import_times("pass"))
+    results = [
+        measure(command, modules[command], args.repeat, interpreter)
+        for command in args.commands
+    ]
+
+    print(
+        f"{'command':<10}{'import ms':>12}{'budget ms':>12}  status  slowest packages"
+    )
+    for r in results:
+        if r.error:
+            status = f"error: {r.error}"
+        elif r.heavy:
+            status = f"imports {', '.join(r.heavy)}"
+        else:
+            status = "ok" if r.ok else "over budget"
+        print(
+            f"{r.command:<10}{r.import_ms:>12.0f}{r.budget_ms:>12.0f}  {status:<6}  "
+            f"{', '.join(r.slowest)}"
+        )
+    sys.exit(0 if all(r.ok for r in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import argparse
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from loguru import logger
+from PIL import Image
+
+from src.config import (
+    INFERENCE_CONF,
+    INFERENCE_DEVICE,
+    INFERENCE_IMGSZ,
+    MODEL_WEIGHTS,
+    NUM_CLASSES,
+    PROJECT_ROOT,
+    TILE_OVERLAP,
+    TILE_SIZE,
+)
+from src.domain.services.box_ops import box_iou
+from src.domain.services.detector import Detector
+from src.infrastructure.detectors import UltralyticsDetector
+from src.infrastructure.tiled_detector import TiledDetector
+from src.infrastructure.yolo_labels import read_yolo_labels, yolo_to_xyxy
+
+SMALL_OBJECT_PX = 32  # COCO's definition of a small object (sqrt of the area)
+
+
+def matched(ground_truth: np.ndarray, gt_classes, detections, iou: float) -> np.ndarray:
+    """
+    Greedy one-to-one matching of ground truth boxes to same-class detections.
+    :return: Boolean array, True for every ground truth box that was found
+    """
+    found = np.zeros(len(ground_truth), dtype=bool)
+    if len(ground_truth) == 0 or len(detections) == 0:
+        return found
+    ious = box_iou(ground_truth, detections.boxes)
+    ious[gt_classes[:, None] != detections.classes[None, :]] = 0
+    for det in np.argsort(-detections.scores):
+        candidates = np.where(~found & (ious[:, det] >= iou))[0]
+        if candidates.size:
+            found[candidates[np.argmax(ious[candidates, det])]] = True
+    return found
+
+
+def evaluate(
+    detector: Detector, images: List[Path], labels_dir: Path, imgsz: int
+) -> Dict[str, float]:
+    """
+    Run a detector image by image and measure recall and latency.
+    :return: Recall overall, per class and on small objects, and mean/p95 latency
+    """
+    latencies, found, classes, small = [], [], [], []
+    for image_path in images:
+        image = np.array(Image.open(image_path).convert("RGB"))
+        height, width = image.shape[:2]
+        labels = read_yolo_labels(labels_dir / f"{image_path.stem}.txt")
+        ground_truth = yolo_to_xyxy(labels, width, height)
+
+        start = time.perf_counter()
+        detections = detector.predict([image], INFERENCE_CONF, imgsz)[0]
+        latencies.append(time.perf_counter() - start)
+
+        gt_classes = labels[:, 0].astype(np.int64)
+        found.append(matched(ground_truth, gt_classes, detections, 0.5))
+        classes.append(gt_classes)
+        sides = np.sqrt(
+            (ground_truth[:, 2] - ground_truth[:, 0])
+            * (ground_truth[:, 3] - ground_truth[:, 1])
+        )
+        small.append(sides < SMALL_OBJECT_PX)
+
+    found, classes, small = map(np.concatenate, (found, classes, small))
+    latencies = np.array(latencies) * 1000
+    report = {
+        "recall": found.mean() if found.size else 0.0,
+        "recall_small": found[small].mean() if small.any() else 0.0,
+        "latency_mean_ms": latencies.mean(),
+        "latency_p95_ms": np.percentile(latencies, 95),
+    }
+    for cls in range(NUM_CLASSES):
+        mask = classes == cls
+        report[f"recall_class_{cls}"] = found[mask].mean() if mask.any() else 0.0
+    return report
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Compare recall and latency of tiled vs full-frame inference."
+    )
+    parser.add_argument("--weights", type=Path, default=MODEL_WEIGHTS)
+    parser.add_argument(
+        "--images",
+        type=Path,
+        default=PROJECT_ROOT / "datasets" / "ultralytics" / "images" / "val",
+    )
+    parser.add_argument(
+        "--labels",
+        type=Path,
+        default=PROJECT_ROOT / "datasets" / "ultralytics" / "labels" / "val",
+    )
+    parser.add_argument("--imgsz", type=int, default=INFERENCE_IMGSZ)
+    parser.add_argument("--tile-size", type=int, default=TILE_SIZE)
+    parser.add_argument("--overlap", type=float, default=TILE_OVERLAP)
+    parser.add_argument("--merge", choices=["nms", "wbf"], default="nms")
+    parser.add_argument("--limit", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    images = sorted(
+        p for p in args.images.iterdir() if p.suffix.lower() in (".jpg", ".png")
+    )[: args.limit]
+    detector = UltralyticsDetector(args.weights, device=INFERENCE_DEVICE)
+    tiled = TiledDetector(
+        detector, tile_size=args.tile_size, overlap=args.overlap, merge=args.merge
+    )
+    # Warm up so the first measured image does not pay model initialisation
+    detector.predict([np.zeros((64, 64, 3), np.uint8)], INFERENCE_CONF, args.imgsz)
+
+    results = {
+        "full-frame": evaluate(detector, images, args.labels, args.imgsz),
+        "tiled": evaluate(tiled, images, args.labels, args.imgsz),
+    }
+    logger.info(f"Benchmark over {len(images)} images:")
+    for metric in results["full-frame"]:
+        logger.info(
+            f"{metric:>18}: full-frame {results['full-frame'][metric]:8.3f} | "
+            f"tiled {results['tiled'][metric]:8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import argparse
+from pathlib import Path
+from typing import List, Optional
+
+from loguru import logger
+
+from src.application.dataset_preparation import DatasetPreparation
+from src.config import (
+    CONVERT_WORKERS,
+    IMAGES_DIR,
+    JPEG_QUALITY,
+    TRAINING_MAX_SIDE,
+)
+from src.infrastructure.image_converter_impl import PillowImageConverter
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Convert raw photos (HEIC, PNG, WebP, ...) into training JPGs."
+    )
+    parser.add_argument("input", type=Path, help="Folder of the original photos")
+    parser.add_argument("output", type=Path, nargs="?", default=IMAGES_DIR)
+    parser.add_argument(
+        "--heic-only",
+        action="store_true",
+        help="Only convert HEIC files, without orientation, colour or size normalization",
+    )
+    parser.add_argument("--workers", type=int, default=CONVERT_WORKERS)
+    parser.add_argument(
+        "--max-side",
+        type=int,
+        help=f"Longest side to downscale to, normalization defaults to {TRAINING_MAX_SIDE}",
+    )
+    parser.add_argument("--quality", type=int, default=JPEG_QUALITY)
+    args = parser.parse_args(argv)
+
+    preparation = DatasetPreparation(
+        PillowImageConverter(
+            workers=args.workers, max_side=args.max_side, quality=args.quality
+        )
+    )
+    if args.heic_only:
+        report = preparation.prepare_dateset(args.input, args.output)
+    else:
+        report = preparation.normalize_dataset(args.input, args.output)
+    logger.info(
+        f"Converted {len(report.converted)}, skipped {len(report.skipped)} up to date, "
+        f"{len(report.failed)} failed"
+    )
+    for path, error in report.failed:
+        logger.error(f"{path}: {error}")
+
+
+if __name__ == "__main__":
+    main()
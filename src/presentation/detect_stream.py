@@ -0,0 +1,104 @@
+import argparse
+import csv
+from pathlib import Path
+from typing import List, Optional
+
+from loguru import logger
+
+from src.application.stream_detection import (
+    AdaptiveFrameSkipper,
+    StreamDetectionService,
+)
+from src.config import (
+    CLASS_NAMES,
+    INFERENCE_BACKEND,
+    INFERENCE_CONF,
+    INFERENCE_DEVICE,
+    INFERENCE_IMGSZ,
+    STREAM_LOW_CONF,
+    STREAM_MAX_STRIDE,
+    STREAM_QUEUE_SIZE,
+    TRACK_IOU,
+    TRACK_MAX_MISSED,
+    TRACK_MIN_HITS,
+)
+from src.domain.services.iou_tracker import IouTracker
+from src.infrastructure.detector_factory import DETECTOR_BACKENDS, build_detector
+from src.infrastructure.video_reader import ThreadedVideoReader
+
+
+def class_name(cls: int) -> str:
+    # Models trained on other classes can emit ids beyond the configured names
+    return class_name(cls) if 0 <= cls < len(CLASS_NAMES) else str(cls)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Detect and track CCTV cameras and signs in a video file, "
+        "RTSP/HTTP stream or webcam."
+    )
+    parser.add_argument("source", help="Video path, stream URL or webcam index")
+    parser.add_argument(
+        "--backend", choices=DETECTOR_BACKENDS, default=INFERENCE_BACKEND
+    )
+    parser.add_argument(
+        "--weights", type=Path, default=None, help="Defaults to the backend's artifact"
+    )
+    parser.add_argument("--device", default=INFERENCE_DEVICE)
+    parser.add_argument("--imgsz", type=int, default=INFERENCE_IMGSZ)
+    parser.add_argument(
+        "--target-fps", type=float, default=None, help="Cap on detections per second"
+    )
+    parser.add_argument("--max-stride", type=int, default=STREAM_MAX_STRIDE)
+    parser.add_argument("--max-frames", type=int, default=None)
+    parser.add_argument(
+        "--output", type=Path, default=None, help="Optional csv of the found objects"
+    )
+    args = parser.parse_args(argv)
+
+    detector = build_detector(args.backend, args.weights, args.device)
+    tracker = IouTracker(
+        iou_threshold=TRACK_IOU,
+        high_score=INFERENCE_CONF,
+        max_missed=TRACK_MAX_MISSED,
+        min_hits=TRACK_MIN_HITS,
+    )
+    service = StreamDetectionService(
+        detector, tracker, conf=STREAM_LOW_CONF, imgsz=args.imgsz
+    )
+
+    def on_object(track, frame):
+        logger.info(
+            f"New {class_name(track.cls)} #{track.track_id} at frame {frame.index} "
+            f"box {track.box.round().astype(int).tolist()}"
+        )
+
+    with ThreadedVideoReader(args.source, queue_size=STREAM_QUEUE_SIZE) as reader:
+        skipper = AdaptiveFrameSkipper(
+            reader.fps, target_fps=args.target_fps, max_stride=args.max_stride
+        )
+        report = service.run(reader, skipper, on_object, args.max_frames)
+        logger.info(
+            f"Read {reader.frames_read} frames, dropped {reader.frames_dropped} "
+            f"under backpressure, processed {report.processed_fps:.1f} FPS sustained"
+        )
+
+    for cls, count in sorted(report.objects_per_class().items()):
+        logger.info(f"{class_name(cls)}: {count}")
+    if args.output is not None:
+        with open(args.output, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(
+                ["track_id", "class", "score", "first_frame", "x0", "y0", "x1", "y1"]
+            )
+            for track in report.objects:
+                writer.writerow(
+                    [track.track_id, class_name(track.cls), round(track.score, 3)]
+                    + [track.first_frame]
+                    + track.box.round(1).tolist()
+                )
+        logger.info(f"Objects written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,74 @@
-from ultralytics import YOLO
-from PIL import Image
+import argparse
+from dataclasses import asdict
+from typing import List, Optional
+
+from PIL import Image, ImageDraw
 import numpy as np
 import gradio as gr
 
-model = YOLO("../../samples/best.pt")
+from src.application.inference_service import BatchingInferenceService
+from src.application.model_server import ModelServer
+from src.config import (
+    CLASS_NAMES,
+    DETECTION_CACHE_ENABLED,
+    DETECTION_CACHE_PATH,
+    INFERENCE_BACKEND,
+    INFERENCE_MAX_BATCH,
+    MODEL_NAME,
+    MODEL_REGISTRY,
+)
+from src.domain.detection import Detections
+from src.infrastructure.detection_cache import DetectionCache
+from src.infrastructure.detector_factory import DEFAULT_WEIGHTS
+from src.infrastructure.model_registry import ModelRegistry
+
+BOX_COLOURS = ["#ff3838", "#2c99a8"]
+
+_service: Optional[BatchingInferenceService] = None
+_cache: Optional[DetectionCache] = None
+_server: Optional[ModelServer] = None
+
+
+def get_service() -> BatchingInferenceService:
+    """
+    Create the batching inference service on first use, so importing this module does
+    not load the model. The model itself loads and warms up in the background and is
+    swapped whenever another version becomes active in the registry.
+    :return: The running inference service
+    """
+    global _service, _cache, _server
+    if _service is None:
+        if DETECTION_CACHE_ENABLED:
+            _cache = DetectionCache(DETECTION_CACHE_PATH)
+        registry = ModelRegistry(MODEL_REGISTRY)
+        # First start: the configured weights become version 1
+        registry.ensure(
+            MODEL_NAME, DEFAULT_WEIGHTS[INFERENCE_BACKEND], INFERENCE_BACKEND
+        )
+        _server = ModelServer(registry, MODEL_NAME, cache=_cache)
+        _server.warm_up_async()
+        _server.watch()
+        _service = BatchingInferenceService(_server).start()
+    return _service
+
+
+def draw_detections(image: Image.Image, detections: Detections) -> Image.Image:
+    """
+    Draw bounding boxes and labels on a copy of the image.
+    :param image: The original image
+    :param detections: Detections of the image
+    :return: Annotated image
+    """
+    annotated = image.convert("RGB")
+    draw = ImageDraw.Draw(annotated)
+    for box, score, cls in zip(
+        detections.boxes.tolist(), detections.scores.tolist(), detections.classes
+    ):
+        colour = BOX_COLOURS[int(cls) % len(BOX_COLOURS)]
+        name = CLASS_NAMES[cls] if cls < len(CLASS_NAMES) else str(cls)
+        draw.rectangle(box, outline=colour, width=3)
+        draw.text((box[0] + 3, box[1] + 2), f"{name} {score:.2f}", fill=colour)
+    return annotated
 
 
 def detect_objects(image: Image.Image) -> Image.Image:
@@ -12,20 +77,80 @@ def detect_objects(image: Image.Image) -> Image.Image:
     :param image: Input image uploaded by the user
     :return: Image with detected bounding boxes and labels drawn.
     """
-    img_array = np.array(image)
-    results = model.predict(source=img_array, conf=0.25, imgsz=640)
-    annotated_img = results[0].plot()
+    img_array = np.array(image.convert("RGB"))
+    detections = get_service().detect(img_array)
+    return draw_detections(image, detections)
+
+
+def inference_stats() -> dict:
+    """
+    :return: Latency percentiles, batch sizes and throughput of the inference service,
+        and the hit rate of the detection cache.
+    """
+    stats = asdict(get_service().stats())
+    if _cache is not None:
+        cache_stats = _cache.stats()
+        stats["cache"] = {**asdict(cache_stats), "hit_rate": cache_stats.hit_rate}
+    stats["model"] = asdict(_server.status())
+    return stats
 
-    return Image.fromarray(annotated_img)
+
+def switch_model(version: Optional[float]) -> dict:
+    """
+    Activate a registered version and hot-swap to it; requests keep being served by the
+    current model until the new one is loaded and warmed up.
+    :param version: Version to serve, empty re-reads the active version of the registry
+    :return: Status of the served model and all registered versions
+    """
+    get_service()
+    if version:
+        _server.registry.activate(MODEL_NAME, int(version))
+    _server.swap()
+    return {
+        "serving": asdict(_server.status()),
+        "versions": [asdict(v) for v in _server.registry.versions(MODEL_NAME)],
+    }
 
 
-demo = gr.Interface(
+detector_ui = gr.Interface(
     fn=detect_objects,
     inputs=gr.Image(type="pil", label="Upload image"),
     outputs=gr.Image(type="pil", label="Detected image"),
     title="Custom YoloV8 CCTV detector",
     description="Upload an image for CCTV detection.",
 )
+stats_ui = gr.Interface(
+    fn=inference_stats,
+    inputs=None,
+    outputs=gr.JSON(label="Inference stats"),
+    title="Inference stats",
+    description="Latency, throughput and cache hit rate of the inference service.",
+)
+models_ui = gr.Interface(
+    fn=switch_model,
+    inputs=gr.Number(
+        label="Version (empty for the registry's active one)", precision=0
+    ),
+    outputs=gr.JSON(label="Models"),
+    title="Models",
+    description="Hot-swap the served model to another registered version.",
+)
+demo = gr.TabbedInterface(
+    [detector_ui, stats_ui, models_ui], ["Detect", "Stats", "Models"]
+)
+# Let up to a full batch of uploads reach the batching service at the same time
+demo.queue(default_concurrency_limit=INFERENCE_MAX_BATCH)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Serve the CCTV detector web UI.")
+    parser.add_argument("--host", default=None, help="Defaults to 127.0.0.1")
+    parser.add_argument("--port", type=int, default=None, help="Defaults to 7860")
+    args = parser.parse_args(argv)
+
+    get_service()  # Start loading and warming up the model before the first request
+    demo.launch(server_name=args.host, server_port=args.port)
+
 
 if __name__ == "__main__":
-    demo.launch()
+    main()
@@ -0,0 +1,134 @@
+import argparse
+from pathlib import Path
+from typing import List, Optional
+
+from loguru import logger
+
+from src.config import (
+    CLASS_NAMES,
+    DATASET_INDEX,
+    DATASETS,
+    IMAGES_DIR,
+    LABELS_DIR,
+    NUM_CLASSES,
+)
+from src.domain.services.dataset_preparer import TransferMode
+from src.infrastructure.dataset_index import DatasetIndex
+from src.infrastructure.dataset_preparer_impl import SklearnDatasetPreparer
+from src.infrastructure.splitters import StratifiedGroupSplitter
+
+
+def prepare_dataset(
+    source_images: Path = IMAGES_DIR,
+    source_labels: Path = LABELS_DIR,
+    output_dir: Path = DATASETS / "ultralytics",
+    train_ratio: float = 0.8,
+    val_ratio: float = 0.1,
+    transfer_mode: TransferMode = TransferMode.LINK,
+    index_path: Optional[Path] = None,
+) -> None:
+    """
+    Split the labelled images into the train/val/test layout Ultralytics trains on.
+    :param source_images: Folder of the labelled images
+    :param source_labels: Folder of the YOLO label files
+    :param output_dir: Folder receiving images/{split} and labels/{split}
+    :param train_ratio: Fraction of the images used for training
+    :param val_ratio: Fraction of the images used for validation, the rest is test
+    :param transfer_mode: How files reach the split folders
+    :param index_path: Optional dataset index making re-runs incremental
+    :return:
+    """
+    # Keep class balance and keep screenshots of one camera location in one split
+    dataset_preparer = SklearnDatasetPreparer(
+        StratifiedGroupSplitter(), index_path=index_path
+    )
+    dataset_preparer.prepare_ultralytics_dataset(
+        source_images=source_images,
+        source_labels=source_labels,
+        output_images=output_dir / "images",
+        output_labels=output_dir / "labels",
+        train_ratio=train_ratio,
+        val_ratio=val_ratio,
+        transfer_mode=transfer_mode,
+    )
+    logger.info("Dataset is prepared and ready for training.")
+
+
+def log_dataset_stats(
+    source_images: Path = IMAGES_DIR,
+    source_labels: Path = LABELS_DIR,
+    index_path: Path = DATASET_INDEX,
+) -> None:
+    """
+    Update the dataset index and log what it knows about the tree: boxes per class,
+    images without labels or boxes and the distribution of box sizes.
+    :param source_images: Folder of the labelled images
+    :param source_labels: Folder of the YOLO label files
+    :param index_path: The dataset index
+    :return:
+    """
+    index = DatasetIndex.load(index_path).update(source_images, source_labels)
+    index.save(index_path)
+    counts = index.class_counts(NUM_CLASSES)
+    per_image = index.class_count_matrix(NUM_CLASSES)
+    logger.info(f"{len(index)} images, {len(index.boxes)} boxes")
+    for cls, name in enumerate(CLASS_NAMES):
+        logger.info(
+            f"{name}: {counts[cls]} boxes in {(per_image[:, cls] > 0).sum()} images"
+        )
+    logger.info(
+        f"{len(index.missing_labels())} images without a label file, "
+        f"{len(index.empty_labels())} with an empty one"
+    )
+    histogram, edges = index.box_size_histogram()
+    for count, low, high in zip(histogram, edges[:-1], edges[1:]):
+        if count:
+            logger.info(f"Box size {low:6.1f}-{high:6.1f} px: {count}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Split the labelled dataset into train/val/test for Ultralytics."
+    )
+    parser.add_argument("--images", type=Path, default=IMAGES_DIR)
+    parser.add_argument("--labels", type=Path, default=LABELS_DIR)
+    parser.add_argument("--output", type=Path, default=DATASETS / "ultralytics")
+    parser.add_argument("--train-ratio", type=float, default=0.8)
+    parser.add_argument("--val-ratio", type=float, default=0.1)
+    parser.add_argument(
+        "--mode",
+        choices=[mode.value for mode in TransferMode],
+        default=TransferMode.LINK.value,
+        help="link keeps the source layout and needs no extra disk",
+    )
+    parser.add_argument(
+        "--index",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help=f"Reuse the dataset index at {DATASET_INDEX} to skip unchanged files",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Log class counts, unlabelled images and box sizes from the dataset "
+        "index instead of splitting",
+    )
+    args = parser.parse_args(argv)
+
+    if args.stats:
+        log_dataset_stats(args.images, args.labels)
+        return
+
+    prepare_dataset(
+        source_images=args.images,
+        source_labels=args.labels,
+        output_dir=args.output,
+        train_ratio=args.train_ratio,
+        val_ratio=args.val_ratio,
+        transfer_mode=TransferMode(args.mode),
+        index_path=DATASET_INDEX if args.index else None,
+    )
+
+
+if __name__ == "__main__":
+    main()
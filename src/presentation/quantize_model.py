@@ -0,0 +1,89 @@
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from loguru import logger
+
+from src.application.model_evaluation import evaluate_detector, split_images
+from src.config import (
+    CALIBRATION_IMAGES,
+    INFERENCE_IMGSZ,
+    MODEL_WEIGHTS,
+    ONNX_INT8_WEIGHTS,
+    ONNX_WEIGHTS,
+    PROJECT_ROOT,
+    QUANT_MAX_MAP50_DROP,
+)
+from src.infrastructure.exported_detectors import OnnxRuntimeDetector
+from src.infrastructure.model_export import export_yolo
+from src.infrastructure.quantization import quantize_onnx_int8
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Quantize the trained model to static INT8, calibrated on the val "
+        "split, and compare its mAP with the FP32 model."
+    )
+    parser.add_argument("--weights", type=Path, default=MODEL_WEIGHTS)
+    parser.add_argument("--fp32", type=Path, default=ONNX_WEIGHTS)
+    parser.add_argument("--int8", type=Path, default=ONNX_INT8_WEIGHTS)
+    parser.add_argument(
+        "--images",
+        type=Path,
+        default=PROJECT_ROOT / "datasets" / "ultralytics" / "images" / "val",
+    )
+    parser.add_argument(
+        "--labels",
+        type=Path,
+        default=PROJECT_ROOT / "datasets" / "ultralytics" / "labels" / "val",
+    )
+    parser.add_argument("--calibration-images", type=int, default=CALIBRATION_IMAGES)
+    parser.add_argument(
+        "--method", choices=["minmax", "entropy", "percentile"], default="minmax"
+    )
+    parser.add_argument("--imgsz", type=int, default=INFERENCE_IMGSZ)
+    parser.add_argument("--max-drop", type=float, default=QUANT_MAX_MAP50_DROP)
+    args = parser.parse_args(argv)
+
+    if not args.fp32.exists():
+        args.fp32 = export_yolo(args.weights, ["onnx"], imgsz=args.imgsz)["onnx"]
+
+    images = split_images(args.images)
+    # Spread the calibration set over the whole split instead of its first files
+    step = max(1, len(images) // args.calibration_images)
+    calibration = images[::step][: args.calibration_images]
+    quantize_onnx_int8(
+        args.fp32, args.int8, calibration, imgsz=args.imgsz, method=args.method
+    )
+
+    results = {
+        name: evaluate_detector(
+            OnnxRuntimeDetector(path), images, args.labels, args.imgsz
+        )
+        for name, path in (("fp32", args.fp32), ("int8", args.int8))
+    }
+    for name, result in results.items():
+        logger.info(
+            f"{name}: mAP50 {result.metrics.map50:.4f}, "
+            f"mAP50-95 {result.metrics.map50_95:.4f}, "
+            f"{result.latency_mean_ms:.1f} ms mean, {result.latency_p95_ms:.1f} ms p95"
+        )
+    drop = results["fp32"].metrics.map50 - results["int8"].metrics.map50
+    speedup = results["fp32"].latency_mean_ms / max(
+        results["int8"].latency_mean_ms, 1e-9
+    )
+    logger.info(
+        f"INT8 vs FP32 over {len(images)} images: mAP50 drop {drop:.4f}, "
+        f"{speedup:.2f}x faster"
+    )
+    if drop > args.max_drop:
+        logger.error(
+            f"mAP50 drop {drop:.4f} exceeds {args.max_drop}, keep serving the FP32 model "
+            f"or retry with another calibration method"
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import argparse
+from pathlib import Path
+from typing import List, Optional
+
+from src.application.camera_image_downloader import CameraImageDownloader
+from src.config import (
+    CAPTURE_MANIFEST,
+    CSV_FILE,
+    OUTPUT_DIR,
+    SCRAPER_CONCURRENCY,
+)
+from src.infrastructure.capture_manifest import CaptureManifest
+from src.infrastructure.data_loaders import CameraDataLoader
+from src.infrastructure.image_deduplicator import ImageDeduplicator
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Take screenshots of the cameras listed in a camera registry csv."
+    )
+    parser.add_argument("csv", type=Path, nargs="?", default=CSV_FILE)
+    parser.add_argument("--output", type=Path, default=OUTPUT_DIR)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=SCRAPER_CONCURRENCY,
+        help="Pages capturing in parallel, 1 uses the sequential scraper",
+    )
+    parser.add_argument("--headless", action=argparse.BooleanOptionalAction)
+    parser.add_argument(
+        "--manifest",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help=f"Only scrape new, stale or failed cameras, tracked in {CAPTURE_MANIFEST}",
+    )
+    parser.add_argument(
+        "--dedup",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Filter near-duplicate screenshots after scraping",
+    )
+    args = parser.parse_args(argv)
+
+    # The browser driver is only imported by the scraper that is used
+    if args.concurrency > 1:
+        from src.infrastructure.concurrent_image_scraper import ConcurrentImageScraper
+
+        image_scraper = ConcurrentImageScraper(
+            output_dir=args.output,
+            headless=True if args.headless is None else args.headless,
+            concurrency=args.concurrency,
+        )
+    else:
+        from src.infrastructure.image_scraper import ImageScraper
+
+        image_scraper = ImageScraper(
+            output_dir=args.output, headless=bool(args.headless)
+        )
+
+    downloader = CameraImageDownloader(
+        CameraDataLoader(),
+        image_scraper,
+        manifest=CaptureManifest(CAPTURE_MANIFEST) if args.manifest else None,
+        deduplicator=ImageDeduplicator() if args.dedup else None,
+    )
+    downloader.download_images(csv_path=args.csv)
+
+
+if __name__ == "__main__":
+    main()
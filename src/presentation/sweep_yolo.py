@@ -0,0 +1,91 @@
+import argparse
+from pathlib import Path
+from typing import List, Optional
+
+from loguru import logger
+
+from src.application.hyperparameter_sweep import HyperparameterSweep, SweepConfig
+from src.config import (
+    PROJECT_ROOT,
+    SWEEP_DB,
+    SWEEP_DEVICE,
+    SWEEP_ETA,
+    SWEEP_EVAL_IMAGES,
+    SWEEP_MAX_EPOCHS,
+    SWEEP_MIN_EPOCHS,
+    SWEEP_SPACE,
+    SWEEP_THREADS_PER_TRIAL,
+    SWEEP_TRIALS,
+)
+from src.infrastructure.sweep_store import SweepStore
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Search the YOLO hyperparameters of SWEEP_SPACE with successive "
+        "halving, then report the Pareto front of val mAP versus CPU latency."
+    )
+    parser.add_argument("--trials", type=int, default=SWEEP_TRIALS)
+    parser.add_argument("--min-epochs", type=int, default=SWEEP_MIN_EPOCHS)
+    parser.add_argument("--max-epochs", type=int, default=SWEEP_MAX_EPOCHS)
+    parser.add_argument("--eta", type=int, default=SWEEP_ETA)
+    parser.add_argument(
+        "--threads", type=int, default=SWEEP_THREADS_PER_TRIAL, help="Per trial"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Trials in parallel, cores // threads"
+    )
+    parser.add_argument("--device", default=SWEEP_DEVICE)
+    parser.add_argument("--db", type=Path, default=SWEEP_DB, help="Results table")
+    parser.add_argument("--data", type=Path, default=PROJECT_ROOT / "data.yaml")
+    parser.add_argument(
+        "--images",
+        type=Path,
+        default=PROJECT_ROOT / "datasets" / "ultralytics" / "images" / "val",
+    )
+    parser.add_argument(
+        "--labels",
+        type=Path,
+        default=PROJECT_ROOT / "datasets" / "ultralytics" / "labels" / "val",
+    )
+    parser.add_argument("--eval-images", type=int, default=SWEEP_EVAL_IMAGES)
+    parser.add_argument(
+        "--report-only",
+        action="store_true",
+        help="Measure and report the trials in the table without training new ones",
+    )
+    args = parser.parse_args(argv)
+
+    config = SweepConfig(
+        trials=args.trials,
+        min_epochs=args.min_epochs,
+        max_epochs=args.max_epochs,
+        eta=args.eta,
+        threads_per_trial=args.threads,
+        workers=args.workers,
+        device=args.device,
+        output_dir=args.db.parent,
+        eval_images=args.eval_images,
+    )
+    store = SweepStore(args.db)
+    sweep = HyperparameterSweep(store, SWEEP_SPACE, args.data, config)
+    if not args.report_only:
+        sweep.run()
+    sweep.measure(args.images, args.labels)
+
+    trials = store.trials()
+    counts = {}
+    for trial in trials:
+        counts[trial.status] = counts.get(trial.status, 0) + 1
+    logger.info(f"{len(trials)} trials in {args.db}: {counts}")
+    for trial in sweep.pareto_front():
+        logger.info(
+            f"Pareto trial {trial.trial_id}: mAP50-95 {trial.map50_95:.4f}, "
+            f"mAP50 {trial.map50:.4f}, {trial.latency_ms:.1f} ms, {trial.params}, "
+            f"{trial.weights}"
+        )
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,42 +1,94 @@
+import argparse
 from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional
 
-import torch.optim
 from loguru import logger
 
-from src.config import PROJECT_ROOT
-from src.infrastructure.dataset_preparer_impl import SklearnDatasetPreparer
-from src.infrastructure.trainers import YoloUltralyticsTrainer
-
-
-def main():
-    base_dataset_dir = Path(PROJECT_ROOT) / "datasets"
-    source_images = base_dataset_dir / "images"
-    source_labels = base_dataset_dir / "labels"
-
-    output_images = Path(PROJECT_ROOT) / "datasets" / "ultralytics" / "images"
-    output_labels = Path(PROJECT_ROOT) / "datasets" / "ultralytics" / "labels"
-
-    dataset_preparer = SklearnDatasetPreparer()
-    dataset_preparer.prepare_ultralytics_dataset(
-        source_images=source_images,
-        source_labels=source_labels,
-        output_images=output_images,
-        output_labels=output_labels,
-        train_ratio=0.8,
-        val_ratio=0.1,
-        move_files=True,
+from src.config import (
+    CHECKPOINT_DIR,
+    DATASET_CACHE_DIR,
+    IMAGES_DIR,
+    INFERENCE_BACKEND,
+    LABELS_DIR,
+    MODEL_NAME,
+    MODEL_REGISTRY,
+    NUM_CLASSES,
+    PROJECT_ROOT,
+    TELEMETRY_OUTPUTS,
+    TRAIN_ACCUMULATE_STEPS,
+    TRAIN_AMP,
+)
+from src.infrastructure.model_registry import ModelRegistry
+from src.infrastructure.splitters import StratifiedGroupSplitter
+from src.infrastructure.telemetry_sinks import open_telemetry_sink
+from src.infrastructure.trainers import FasterRCNNTrainer, YoloUltralyticsTrainer
+from src.infrastructure.training_telemetry import TrainingProfiler, TrainingTelemetry
+from src.presentation.prepare_dataset import prepare_dataset
+
+if TYPE_CHECKING:
+    from src.infrastructure.training_engine import EngineConfig
+
+
+def train_faster_rcnn(
+    epochs: int,
+    cache: bool = True,
+    engine_config: Optional["EngineConfig"] = None,
+    telemetry: Optional[TrainingTelemetry] = None,
+) -> None:
+    """
+    Train Faster R-CNN straight on the labelled source folders.
+    :param epochs: Number of training epochs
+    :param cache: Keep decoded images in a memmap shard after the first epoch
+    :param engine_config: Mixed precision, gradient accumulation and checkpointing
+    :param telemetry: Receives the timing, throughput and memory of every epoch
+    :return:
+    """
+    from src.application.training_service import TrainingService
+    from src.infrastructure.detection_dataset import CCTVDetectionDatasetLoader
+
+    dataset = CCTVDetectionDatasetLoader(
+        IMAGES_DIR, LABELS_DIR, cache_dir=DATASET_CACHE_DIR if cache else None
+    )
+    # Class 0 of Faster R-CNN is the background
+    model_trainer = FasterRCNNTrainer(
+        num_classes=NUM_CLASSES + 1,
+        epochs=epochs,
+        engine_config=engine_config,
+        telemetry=telemetry,
+    )
+    training_service = TrainingService(
+        dataset, model_trainer, StratifiedGroupSplitter()
     )
-    logger.info("Dataset is prepared and ready for training.")
+    training_service.run_training(train_ratio=0.8, val_ratio=0.1)
+
+
+def train_yolo(
+    weights: str,
+    epochs: int,
+    imgsz: int,
+    prepare: bool = True,
+    telemetry: Optional[TrainingTelemetry] = None,
+) -> None:
+    """
+    Train YOLO with Ultralytics, export it and register the new model.
+    :param weights: Initial weights
+    :param epochs: Number of training epochs
+    :param imgsz: Training image size
+    :param prepare: Split the dataset before training
+    :param telemetry: Receives the duration, throughput and mAP of every epoch
+    :return:
+    """
+    if prepare:
+        prepare_dataset()
 
     # Get data.yaml from project root
     data_config = Path(PROJECT_ROOT / "data.yaml")
 
-    model_weights = "yolov8n.pt"
-
-    epochs = 20
-    img_size = 640
+    model_trainer = YoloUltralyticsTrainer(
+        weights, data_config, epochs, imgsz, telemetry=telemetry
+    )
 
-    model_trainer = YoloUltralyticsTrainer(model_weights, data_config, epochs, img_size)
+    import torch
 
     # For Apple M2, choose a device (this is optional since Ultralytics does its own device handling).
     if torch.backends.mps.is_available():
@@ -49,6 +101,87 @@ def main():
     logger.info(f"Starting training on device: {device}")
     # The train() method’s DataLoader parameters are not used by the Ultralytics trainer.
     model_trainer.train(None, None, device)
+    # CPU inference hosts serve the exported model, see INFERENCE_BACKEND
+    artifacts = model_trainer.export()
+    logger.info(f"Exported artifacts: {artifacts}")
+    # Running UIs watch the registry and hot-swap to the new version
+    registry = ModelRegistry(MODEL_REGISTRY)
+    if INFERENCE_BACKEND in artifacts:
+        registry.register(MODEL_NAME, artifacts[INFERENCE_BACKEND], INFERENCE_BACKEND)
+    else:
+        registry.register(MODEL_NAME, model_trainer.best_weights, "ultralytics")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Prepare the dataset, train YOLO, export it and register the new model."
+    )
+    parser.add_argument("--arch", choices=["yolo", "faster-rcnn"], default="yolo")
+    parser.add_argument("--weights", default="yolov8n.pt", help="Initial weights")
+    parser.add_argument("--epochs", type=int, default=20)
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument(
+        "--prepare",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Split the dataset before training",
+    )
+    parser.add_argument(
+        "--cache",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help=f"Faster R-CNN: cache decoded images in {DATASET_CACHE_DIR}",
+    )
+    parser.add_argument(
+        "--amp",
+        action=argparse.BooleanOptionalAction,
+        default=TRAIN_AMP,
+        help="Faster R-CNN: mixed precision, bfloat16 on CPU",
+    )
+    parser.add_argument(
+        "--accumulate",
+        type=int,
+        default=TRAIN_ACCUMULATE_STEPS,
+        help="Faster R-CNN: batches per optimizer step",
+    )
+    parser.add_argument(
+        "--resume",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help=f"Faster R-CNN: continue from the checkpoint in {CHECKPOINT_DIR}",
+    )
+    parser.add_argument(
+        "--telemetry",
+        type=Path,
+        nargs="*",
+        default=TELEMETRY_OUTPUTS,
+        help="Per-epoch telemetry files: .jsonl, .csv or .prom (Prometheus textfile)",
+    )
+    parser.add_argument(
+        "--profile-steps",
+        type=int,
+        nargs=2,
+        metavar=("START", "STOP"),
+        help="Faster R-CNN: capture training steps START to STOP with torch.profiler",
+    )
+    args = parser.parse_args(argv)
+
+    profiler = TrainingProfiler(*args.profile_steps) if args.profile_steps else None
+    telemetry = TrainingTelemetry(
+        [open_telemetry_sink(path) for path in args.telemetry], profiler=profiler
+    )
+    try:
+        if args.arch == "faster-rcnn":
+            from src.infrastructure.training_engine import EngineConfig
+
+            engine_config = EngineConfig(
+                amp=args.amp, accumulate_steps=args.accumulate, resume=args.resume
+            )
+            train_faster_rcnn(args.epochs, args.cache, engine_config, telemetry)
+        else:
+            train_yolo(args.weights, args.epochs, args.imgsz, args.prepare, telemetry)
+    finally:
+        telemetry.close()
 
 
 if __name__ == "__main__":
@@ -1,13 +1,28 @@
-import shutil
-
+import argparse
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple
 
 import yaml
 from loguru import logger
 from sklearn.model_selection import train_test_split
 
-from src.config import IMAGES_DIR, PROJECT_ROOT, LABELS_DIR, TRAIN_RATIO
+from src.config import (
+    CLASS_NAMES,
+    DATASETS,
+    IMAGES_DIR,
+    LABELS_DIR,
+    NUM_CLASSES,
+    PROJECT_ROOT,
+    SPLIT_SEED,
+    TRAIN_RATIO,
+)
+from src.domain.services.dataset_preparer import TransferMode
+from src.infrastructure.split_materializer import (
+    Sample,
+    materialize_split,
+    write_list_file,
+    write_split_manifest,
+)
 
 
 def split_dataset(
@@ -15,14 +30,16 @@ def split_dataset(
     source_labels_dir: Path,
     train_ratio: float,
     output_dir: Path,
-) -> (Path, Path):
+    transfer_mode: TransferMode = TransferMode.COPY,
+) -> Tuple[Path, Path]:
     """
     Splits the dataset images into training and validation subsets.
     :param source_images_dir: Directory containing all original images.
     :param source_labels_dir: Directory containing all original label files.
     :param train_ratio: Fraction of images to use for training.
     :param output_dir: The base directory where the new train/val folders will be created.
-    :return: The directories for training images and validation images.
+    :param transfer_mode: COPY/MOVE/LINK files into folders, or LIST them in train.txt/val.txt.
+    :return: The directories (or list files) for training images and validation images.
     """
     # List all image files in the source directory with particular image extensions
     image_files = sorted(
@@ -33,48 +50,39 @@ def split_dataset(
         ]
     )
     train_files, val_files = train_test_split(
-        image_files, train_size=train_ratio, random_state=42
+        image_files, train_size=train_ratio, random_state=SPLIT_SEED
     )
 
+    def with_label(filename: str) -> Sample:
+        # Images without a label are kept as background samples
+        label = source_labels_dir / Path(filename).with_suffix(".txt")
+        return source_images_dir / filename, label if label.exists() else None
+
+    splits = {
+        "train": [with_label(f) for f in train_files],
+        "val": [with_label(f) for f in val_files],
+    }
+    write_split_manifest(output_dir / "split_manifest.csv", splits)
+
+    if transfer_mode == TransferMode.LIST:
+        train_list, val_list = output_dir / "train.txt", output_dir / "val.txt"
+        write_list_file(train_list, splits["train"])
+        write_list_file(val_list, splits["val"])
+        logger.info(
+            f"Split complete: {len(train_files)} train images, {len(val_files)} val images."
+        )
+        return train_list, val_list
+
     # Create the new directory structure:
     images_train_dir = output_dir / "images" / "train"
     images_val_dir = output_dir / "images" / "val"
     labels_train_dir = output_dir / "labels" / "train"
     labels_val_dir = output_dir / "labels" / "val"
 
-    for directory in [
-        images_train_dir,
-        images_val_dir,
-        labels_train_dir,
-        labels_val_dir,
-    ]:
-        directory.mkdir(parents=True, exist_ok=True)
-
-    # Copy training files
-    for filename in train_files:
-        # Copy image
-        src_img = source_images_dir / filename
-        dst_img = images_train_dir / filename
-        shutil.copy(src_img, dst_img)
-
-        # Copy corresponding label and change extension to .txt
-        label_filename = Path(filename).with_suffix(".txt")
-        src_label = source_labels_dir / label_filename
-        if src_label.exists():
-            dst_label = labels_train_dir / label_filename
-            shutil.copy(src_label, dst_label)
-
-    # Copy validation files
-    for filename in val_files:
-        src_img = source_images_dir / filename
-        dst_img = images_val_dir / filename
-        shutil.copy(src_img, dst_img)
-
-        label_filename = Path(filename).with_suffix(".txt")
-        src_label = source_labels_dir / label_filename
-        if src_label.exists():
-            dst_label = labels_val_dir / label_filename
-            shutil.copy(src_label, dst_label)
+    materialize_split(
+        splits["train"], images_train_dir, labels_train_dir, transfer_mode
+    )
+    materialize_split(splits["val"], images_val_dir, labels_val_dir, transfer_mode)
 
     logger.info(
         f"Split complete: {len(train_files)} train images, {len(val_files)} val images."
@@ -87,8 +95,8 @@ def create_data_yaml(
 ) -> None:
     """
     Creates a YAML file for Ultralytics YOLO that specifies the training and validation directories.
-    :param train_img_dir: Directory of training images.
-    :param val_img_dir: Directory of validation images.
+    :param train_img_dir: Directory (or txt list file) of training images.
+    :param val_img_dir: Directory (or txt list file) of validation images.
     :param nc: Number of classes.
     :param names: List of class names.
     :param output_yaml_path: Path where the YAML file will be written.
@@ -107,29 +115,37 @@ def create_data_yaml(
     logger.info(f"data.yaml created at: {output_yaml_path.resolve()}")
 
 
-if __name__ == "__main__":
-    # Determine the project root based on this script's location.
-    project_root = PROJECT_ROOT
-
-    # Define source directories (adjust these if your structure is different)
-    source_images_dir = IMAGES_DIR
-    source_labels_dir = LABELS_DIR
-
-    # Output directory is the same "datasets" directory (subdirectories will be created inside it)
-    output_dir = project_root / "datasets" / "ultralytics"
-
-    # Set the desired train ratio
-    train_ratio = TRAIN_RATIO
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Split the labelled images into train/val and write data.yaml."
+    )
+    parser.add_argument("--images", type=Path, default=IMAGES_DIR)
+    parser.add_argument("--labels", type=Path, default=LABELS_DIR)
+    # Output directory is the "datasets" directory (subdirectories are created inside it)
+    parser.add_argument("--output", type=Path, default=DATASETS / "ultralytics")
+    parser.add_argument("--train-ratio", type=float, default=TRAIN_RATIO)
+    parser.add_argument(
+        "--mode",
+        choices=[mode.value for mode in TransferMode],
+        default=TransferMode.COPY.value,
+    )
+    args = parser.parse_args(argv)
 
     # Split the dataset
     train_images_dir, val_images_dir = split_dataset(
-        source_images_dir, source_labels_dir, train_ratio, output_dir
+        args.images,
+        args.labels,
+        args.train_ratio,
+        args.output,
+        TransferMode(args.mode),
     )
 
-    # Define dataset metadata: number of classes and class names.
-    nc = 2
-    names = ["CCTV", "CCTV-SIGNS"]
-
     # Create the data.yaml file in the project root.
-    output_yaml_path = project_root / "data.yaml"
-    create_data_yaml(train_images_dir, val_images_dir, nc, names, output_yaml_path)
+    output_yaml_path = PROJECT_ROOT / "data.yaml"
+    create_data_yaml(
+        train_images_dir, val_images_dir, NUM_CLASSES, CLASS_NAMES, output_yaml_path
+    )
+
+
+if __name__ == "__main__":
+    main()
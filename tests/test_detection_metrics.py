@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from src.domain.detection import Detections
+from src.domain.services.detection_metrics import DetectionEvaluator
+
+GT_BOXES = np.array([[0, 0, 10, 10], [20, 20, 30, 30]], dtype=np.float32)
+GT_CLASSES = np.array([0, 0])
+
+
+def detections(boxes, scores, classes) -> Detections:
+    return Detections(
+        boxes=np.asarray(boxes, dtype=np.float32).reshape(-1, 4),
+        scores=np.asarray(scores, dtype=np.float32),
+        classes=np.asarray(classes, dtype=np.int64),
+    )
+
+
+def test_no_detections_score_zero():
+    evaluator = DetectionEvaluator()
+    evaluator.add(GT_BOXES, GT_CLASSES, Detections())
+    metrics = evaluator.compute()
+    assert metrics.map50 == 0.0
+    assert metrics.map50_95 == 0.0
+    assert metrics.instances == 2
+
+
+def test_missed_class_scores_zero():
+    evaluator = DetectionEvaluator()
+    evaluator.add(GT_BOXES, np.array([0, 1]), detections(GT_BOXES[:1], [0.9], [0]))
+    metrics = evaluator.compute()
+    assert metrics.ap50_per_class == {0: pytest.approx(0.995), 1: 0.0}
+    assert metrics.map50 == pytest.approx(0.4975)
+
+
+def test_perfect_detections():
+    evaluator = DetectionEvaluator()
+    evaluator.add(GT_BOXES, GT_CLASSES, detections(GT_BOXES, [0.9, 0.8], [0, 0]))
+    metrics = evaluator.compute()
+    # The recall 1 sentinel of precision 0 costs the last of the 101 points, as in
+    # Ultralytics' compute_ap
+    assert metrics.map50 == pytest.approx(0.995)
+    assert metrics.map50_95 == pytest.approx(0.995)
+
+
+def test_partial_recall():
+    evaluator = DetectionEvaluator()
+    evaluator.add(GT_BOXES, GT_CLASSES, detections(GT_BOXES[:1], [0.9], [0]))
+    metrics = evaluator.compute()
+    # Precision 1 up to recall 0.5, then interpolated down to 0 at recall 1
+    assert metrics.map50 == pytest.approx(0.75)
+    assert metrics.map50_95 == pytest.approx(0.75)
+
+
+def test_background_only_images():
+    evaluator = DetectionEvaluator()
+    evaluator.add(np.zeros((0, 4)), np.zeros(0), detections(GT_BOXES[:1], [0.9], [0]))
+    evaluator.add(np.zeros((0, 4)), np.zeros(0), Detections())
+    metrics = evaluator.compute()
+    assert (metrics.map50, metrics.map50_95) == (0.0, 0.0)
+    assert (metrics.images, metrics.instances) == (2, 0)
+
+
+def test_no_images():
+    metrics = DetectionEvaluator().compute()
+    assert (metrics.map50, metrics.map50_95, metrics.images) == (0.0, 0.0, 0)